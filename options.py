@@ -15,6 +15,20 @@ from src.pcr import get_put_call_ratio_60_days
 from src.get_google import fetch_google_news
 from src.openai import get_ai_analysis, analyze_sentiment_google_results
 from src.sentiment_analysis import sentiment_analysis
+from src.local_sentiment import analyze_sentiment_tiered
+from src.summary import build_summary_data
+from src.watch import watch_options
+from src.chain_ranking import get_chain_ranking
+from src.snapshots import (
+    compact_articles,
+    compact_options,
+    diff_snapshots,
+    format_snapshot,
+    format_snapshot_diff,
+    load_latest_snapshot,
+    load_snapshot,
+    save_snapshot,
+)
  
 selected_options = []
 symbol = ""
@@ -27,6 +41,24 @@ profit_loss_result = None  # Default if no profit/loss is calculated
 
 
 
+def select_expiration_date(expiration_dates):
+    """
+    Lets the user pick one of the expiration dates by letter.
+    """
+    if not expiration_dates:
+        return None
+    if len(expiration_dates) == 1:
+        return expiration_dates[0]
+
+    print("Available expiration dates:")
+    for i, date in enumerate(expiration_dates):
+        print(f"  {chr(97 + i)}) {date}")
+    choice = input("Select an expiration date by letter: ").strip().lower()
+    index = ord(choice[0]) - 97 if choice else -1
+    if 0 <= index < len(expiration_dates):
+        return expiration_dates[index]
+    print("Invalid selection.")
+    return None
 
 
 def main():
@@ -51,14 +83,34 @@ def main():
             year_month = input("Enter the expiration month (YYYY-MM, e.g., 2025-01): ").strip()
 
         # Fetch expiration dates for the selected month
-        expiration_date = get_expiration_date_for_month(symbol, year_month)
+        expiration_dates = get_expiration_date_for_month(symbol, year_month)
+        expiration_date = select_expiration_date(expiration_dates)
         if not expiration_date:
             print("No valid expiration date selected. Exiting.")
             return
 
         print(f"Using expiration date: {expiration_date}")
+
+        # Offer to reload the last snapshot instead of recomputing everything
+        previous_snapshot = load_latest_snapshot(symbol, option_type, expiration_date)
+        if previous_snapshot:
+            reload_choice = input(
+                f"A snapshot from {previous_snapshot['created_at']} exists. Reload it instead of recomputing? (y/n): "
+            ).strip().lower()
+            if reload_choice == "y":
+                print()
+                for line in format_snapshot(previous_snapshot):
+                    print(line)
+                return
+
         selected_options = fetch_and_evaluate_greeks(symbol, expiration_date, option_type)
 
+        # Rank every contract of the expiration by probability of profit
+        ranking = get_chain_ranking(symbol, expiration_date, option_type)
+        if ranking is not None and not ranking.empty:
+            print(f"\nTop {len(ranking)} {option_type} contracts by probability of profit:")
+            print(ranking.to_string(index=False))
+
         # Fetch last 90 days of historical data (3 months)
         historical_data = fetch_historical_closing_prices(symbol, span="3month")
         if historical_data:
@@ -88,7 +140,7 @@ def main():
 
         if articles:
             print("\nAnalyzing news sentiment...")
-            analyzed_articles = analyze_sentiment_google_results(articles)
+            analyzed_articles = analyze_sentiment_tiered(articles)
             print("\nNews Sentiment Analysis:")
             for article in analyzed_articles:
                 print(f"Title: {article['title']}")
@@ -115,78 +167,38 @@ def main():
         else:
             print(f"VIX Value: {vix_value}")
 
-        # Prepare summary data for AI analysis
-        summary_data = f"""
-Stock Symbol: {symbol}
-Option Type: {option_type}
-Expiration Date: {expiration_date}
-
-Selected Options and Greeks:
-"""
-
-        # Include Greeks for each selected option
+        # Collect the results into an analysis record
+        record = {
+            "symbol": symbol,
+            "option_type": option_type,
+            "expiration_date": expiration_date,
+            "selected_options": compact_options(selected_options),
+            "daily_change": analysis if "error" not in analysis else None,
+            "put_call_ratio": put_call_ratio,
+            "vix_value": vix_value,
+            "articles": compact_articles(analyzed_articles) if articles else [],
+            "profit_loss": profit_loss_result,
+        }
+
+        # Prepare summary data and call the AI analysis function
+        summary_data = build_summary_data(record)
+        record["ai_analysis"] = get_ai_analysis(summary_data)
+
+        # Save the snapshot and show what changed since the previous one
+        snapshot_path = save_snapshot(record)
+        if snapshot_path:
+            print(f"\nSnapshot saved to {snapshot_path}")
+            if previous_snapshot:
+                print(f"\nChanges since the snapshot from {previous_snapshot['created_at']}:")
+                for line in format_snapshot_diff(diff_snapshots(previous_snapshot, load_snapshot(snapshot_path))):
+                    print(line)
+
+        # Optionally keep the Greeks and P/L scenarios updated live
         if selected_options:
-            for option in selected_options:
-                strike_price = option.get('strike_price', 'N/A')
-                delta = option.get('delta', 'N/A')
-                gamma = option.get('gamma', 'N/A')
-                theta = option.get('theta', 'N/A')
-                vega = option.get('vega', 'N/A')
-                summary_data += f"""
-Strike Price: {strike_price}
-  Delta: {delta}
-  Gamma: {gamma}
-  Theta: {theta}
-  Vega: {vega}
-"""
-
-        # Add historical analysis
-        if analysis and "error" not in analysis:
-            summary_data += f"""
-Historical Price Analysis (Last 90 Days):
-  Trading Days Analyzed: {analysis['trading_days_analyzed']}
-  Positive Days: {analysis['positive_days']}
-  Average Positive Change: {analysis['average_positive_change']}%
-  Negative Days: {analysis['negative_days']}
-  Average Negative Change: {analysis['average_negative_change']}%
-"""
-
-        # Add sentiment analysis
-        summary_data += f"""
-        Sentiment Indicators:
-        Put/Call Ratio: {put_call_ratio if put_call_ratio is not None else 'N/A'}
-        VIX Value: {vix_value if vix_value is not None else 'N/A'}
-        """
-
-
-        # Include news sentiment analysis
-        if articles:
-            analyzed_articles = analyze_sentiment_google_results(articles)
-            news_summary = "\nNews Sentiment Analysis:\n"
-            for article in analyzed_articles:
-                news_summary += f"Title: {article['title']}\n"
-                news_summary += f"Sentiment: {article['sentiment']}\n"
-                news_summary += f"URL: {article['link']}\n\n"
-            summary_data += news_summary
-        else:
-            summary_data += "\nNews Sentiment Analysis:\nNo recent news articles found.\n"
-
-
-
-        # Include profit or loss estimation
-        if profit_loss_result:
-            summary_data += f"""
-Option Profit or Loss Analysis:
-  Ask Price (Contract Cost): ${profit_loss_result['ask_price']}
-  Percentage Change: {profit_loss_result['percent_change']}%
-  Stock Price Change: ${profit_loss_result['stock_price_change']}
-  Option Price Change per Share: ${profit_loss_result['option_price_change_per_share']}
-  Option Price Change per Contract: ${profit_loss_result['option_price_change_per_contract']}
-  Profit or Loss for the Contract: ${profit_loss_result['profit_or_loss']}
-"""
-
-        # Call the AI analysis function
-        get_ai_analysis(summary_data)
+            watch_choice = input("\nStart live watch mode? (y/n): ").strip().lower()
+            if watch_choice == "y":
+                print("Watching quotes and option marks. Press Ctrl+C to stop.")
+                watch_options(symbol, selected_options, option_type)
 
 
 
@@ -1,6 +1,9 @@
 # streamlit run options1.py [ARGUMENTS]
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
 import streamlit as st
 import robin_stocks.robinhood as r
 import yfinance as yf
@@ -10,15 +13,59 @@ from src.robinhood_login import login_to_robinhood
 from src.fetch_price import fetch_current_price
 from src.fetch_greeks import fetch_and_evaluate_greeks
 from src.check_expiration import get_expiration_date_for_month  # We'll wrap its return in a list
-from src.historical_prices import fetch_historical_closing_prices
+from src.historical_prices import load_historical_closing_prices
 from src.daily_change import analyze_daily_percentage_changes_90_days
 from src.calculate_profit import calculate_option_profit_or_loss
 from src.display_profit import display_option_profit_or_loss
 from src.get_vix import get_vix_value
-from src.pcr import get_put_call_ratio_60_days
+from src.pcr import calculate_put_call_ratio_60_days
 from src.get_google import fetch_google_news
 from src.openai import get_ai_analysis, analyze_sentiment_google_results
 from src.sentiment_analysis import sentiment_analysis
+from src.local_sentiment import analyze_sentiment_tiered
+from src.ai_cache import get_cached_analysis
+from src.summary import build_summary_data
+from src.watch import WATCH_INTERVAL_SECONDS, format_watch_update, new_watch_state, watch_tick
+from src.portfolio import new_portfolio_state, refresh_portfolio
+from src.chain_ranking import get_chain_ranking
+from src.correlation import get_correlation_context
+from src.snapshots import (
+    compact_articles,
+    compact_options,
+    diff_snapshots,
+    format_snapshot,
+    format_snapshot_diff,
+    load_latest_snapshot,
+    load_snapshot,
+    save_snapshot,
+)
+
+# Sections of the analysis page, in display order
+ANALYSIS_SECTIONS = [
+    ("greeks", "Greeks"),
+    ("profit", "Estimated Profit or Loss for Various % Changes"),
+    ("history", "Daily Percentage Change Analysis (Last 90 Days)"),
+    ("ranking", "Chain Ranking"),
+    ("pcr", "Put/Call Ratio"),
+    ("vix", "VIX"),
+    ("correlation", "Correlation & Beta"),
+    ("news", "News Sentiment Analysis"),
+    ("ai", "AI Analysis"),
+]
+# Background stages running at once (ranking, history, news, PCR, VIX, correlation)
+ANALYSIS_MAX_WORKERS = 6
+
+
+def _fetch_news_sentiment(symbol, api_key, cx):
+    articles = fetch_google_news(symbol, api_key, cx)
+    return analyze_sentiment_tiered(articles) if articles else []
+
+
+def _render_watch_tick(symbol, option_type, watched_options):
+    watch_state = st.session_state.setdefault("watch_state", new_watch_state())
+    updated = watch_tick(symbol, watched_options, option_type, watch_state)
+    st.text("\n".join(format_watch_update(symbol, watch_state, watched_options, updated)))
+
 
 # Globals (optional)
 put_call_ratio = "N/A"
@@ -77,6 +124,24 @@ def main():
             st.error("Failed to log in to Robinhood. Please check your credentials.")
             st.stop()
 
+    # Portfolio view: net Greeks of the open option positions
+    with st.expander("Portfolio Greeks (open positions)"):
+        if "portfolio" not in st.session_state:
+            st.session_state["portfolio"] = new_portfolio_state()
+        portfolio = st.session_state["portfolio"]
+        reload_positions = st.checkbox("Reload positions", value=False)
+        if st.button("Refresh Portfolio Greeks"):
+            changed = refresh_portfolio(portfolio, reload_positions=reload_positions)
+            st.caption(f"{changed} position(s) updated.")
+        if portfolio["by_underlying"] is not None:
+            if portfolio["by_underlying"].empty:
+                st.write("No open option positions.")
+            else:
+                st.dataframe(portfolio["by_underlying"].round(2))
+                st.write("**Total:** " + ", ".join(
+                    f"{greek.capitalize()} {value:.2f}" for greek, value in portfolio["total"].items()
+                ))
+
     # 2. User inputs for symbol, option type, and year-month
     st.subheader("Enter your option parameters:")
     symbol_input = st.text_input("Stock Ticker Symbol (e.g. AAPL, TSLA):", "")
@@ -131,6 +196,16 @@ def main():
             st.session_state["expiration_dates"]
         )
 
+        # Reload the last saved snapshot instantly instead of recomputing
+        if st.button("Load Last Snapshot"):
+            snapshot = load_latest_snapshot(
+                st.session_state["symbol"], st.session_state["option_type"], chosen_expiration
+            )
+            if snapshot:
+                st.text("\n".join(format_snapshot(snapshot)))
+            else:
+                st.info("No snapshot saved yet for this symbol, option type and expiration.")
+
         # 5. Button to run the rest of the analysis
         if st.button("Run Analysis with Selected Expiration"):
             symbol = st.session_state["symbol"]
@@ -139,137 +214,195 @@ def main():
 
             st.write(f"### Running Analysis for {symbol} ({option_type}) expiring {expiration_date}")
 
-            # =========== REPLACE PRINTS WITH st.write() ===========
-
-            # 5a) Fetch & Evaluate Greeks
-            selected_options = fetch_and_evaluate_greeks(symbol, expiration_date, option_type)
-            st.write("Fetched Greeks for the selected option(s).")
-
-            # 5b) Fetch last 90 days of historical data
-            historical_data = fetch_historical_closing_prices(symbol, span="3month")
-            if historical_data:
-                st.write(f"Fetched 3-month historical data for {symbol}.")
+            # One placeholder per section, shown right away and filled as each stage finishes
+            sections = {}
+            for name, title in ANALYSIS_SECTIONS:
+                st.write(f"#### {title}")
+                sections[name] = st.empty()
+                sections[name].info("Loading...")
 
-            # 5c) Analyze daily % changes
-            analysis = analyze_daily_percentage_changes_90_days(historical_data)
-            if "error" in analysis:
-                st.write(f"Error: {analysis['error']}")
-            else:
-                st.write("#### Daily Percentage Change Analysis (Last 90 Days):")
-                st.write(f"- Trading Days Analyzed: {analysis['trading_days_analyzed']}")
-                st.write(f"- Positive Days: {analysis['positive_days']}")
-                st.write(f"- Average Positive Change: {analysis['average_positive_change']}%")
-                st.write(f"- Negative Days: {analysis['negative_days']}")
-                st.write(f"- Average Negative Change: {analysis['average_negative_change']}%")
-
-            # 5d) Fetch News & Analyze
+            # Network-bound stages run in the background; their results are
+            # rendered here in the script thread, which owns the Streamlit context
             api_key = os.getenv("GOOGLE_API_KEY")
             cx = os.getenv("GOOGLE_CX")
-            st.write(f"\nFetching recent news for {symbol}...")
-            articles = fetch_google_news(symbol, api_key, cx)
-
-            if articles:
-                st.write("Analyzing news sentiment...")
-                analyzed_articles = analyze_sentiment_google_results(articles)
-                st.write("#### News Sentiment Analysis:")
-                for article in analyzed_articles:
-                    st.write(f"**Title**: {article['title']}")
-                    st.write(f"**Sentiment**: {article['sentiment']}")
-                    st.write(f"**URL**: {article['link']}\n")
-            else:
-                st.write("No news articles found.")
-
-            # 5e) Display Option Profit or Loss
-            st.write("#### Estimated Profit or Loss for Various % Changes:")
-            percent_change = [1, 10, 20]
-            display_option_profit_or_loss(selected_options, percent_change, symbol)
-
-            # 5f) Put/Call Ratio
-            global put_call_ratio
-            put_call_ratio = get_put_call_ratio_60_days(symbol)
-            if put_call_ratio is None:
-                st.write("Failed to fetch Put/Call Ratio.")
-            else:
-                st.write(f"Put/Call Ratio: {put_call_ratio}")
-
-            # 5g) VIX Value
-            global vix_value
-            vix_value = get_vix_value()
-            if vix_value is None:
-                st.write("Failed to fetch VIX Value.")
-            else:
-                st.write(f"VIX Value: {vix_value}")
-
-            # 5h) Prepare summary data for AI
-            summary_data = f"""
-Stock Symbol: {symbol}
-Option Type: {option_type}
-Expiration Date: {expiration_date}
-
-Selected Options and Greeks:
-"""
-            if selected_options:
-                for option in selected_options:
-                    strike_price = option.get('strike_price', 'N/A')
-                    delta = option.get('delta', 'N/A')
-                    gamma = option.get('gamma', 'N/A')
-                    theta = option.get('theta', 'N/A')
-                    vega = option.get('vega', 'N/A')
-                    summary_data += f"""
-Strike Price: {strike_price}
-  Delta: {delta}
-  Gamma: {gamma}
-  Theta: {theta}
-  Vega: {vega}
-"""
-
-            if analysis and "error" not in analysis:
-                summary_data += f"""
-Historical Price Analysis (Last 90 Days):
-  Trading Days Analyzed: {analysis['trading_days_analyzed']}
-  Positive Days: {analysis['positive_days']}
-  Average Positive Change: {analysis['average_positive_change']}%
-  Negative Days: {analysis['negative_days']}
-  Average Negative Change: {analysis['average_negative_change']}%
-"""
-
-            summary_data += f"""
-Sentiment Indicators:
-  Put/Call Ratio: {put_call_ratio if put_call_ratio else 'N/A'}
-  VIX Value: {vix_value if vix_value else 'N/A'}
-"""
-
-            if articles:
-                # Summarize the news
-                analyzed_articles = analyze_sentiment_google_results(articles)
-                news_summary = "\nNews Sentiment Analysis:\n"
-                for article in analyzed_articles:
-                    news_summary += f"Title: {article['title']}\n"
-                    news_summary += f"Sentiment: {article['sentiment']}\n"
-                    news_summary += f"URL: {article['link']}\n\n"
-                summary_data += news_summary
-            else:
-                summary_data += "\nNews Sentiment Analysis:\nNo recent news articles found.\n"
-
+            executor = ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS)
+            futures = {
+                executor.submit(get_chain_ranking, symbol, expiration_date, option_type): "ranking",
+                executor.submit(load_historical_closing_prices, symbol, "3month"): "history",
+                executor.submit(_fetch_news_sentiment, symbol, api_key, cx): "news",
+                executor.submit(calculate_put_call_ratio_60_days, symbol): "pcr",
+                executor.submit(get_vix_value): "vix",
+                executor.submit(get_correlation_context, symbol): "correlation",
+            }
+
+            # 5a) Fetch & Evaluate Greeks (fastest path to something useful, in the script thread)
+            with sections["greeks"].container():
+                selected_options = fetch_and_evaluate_greeks(symbol, expiration_date, option_type)
+            st.session_state["watch_target"] = (symbol, option_type, selected_options)
+            st.session_state["watch_state"] = new_watch_state()
+
+            # 5b) Display Option Profit or Loss
+            with sections["profit"].container():
+                percent_change = [1, 10, 20]
+                display_option_profit_or_loss(selected_options, percent_change, symbol)
+
+            global put_call_ratio, vix_value
+            results = {}
+            # Set by the history stage; kept for the AI summary below
+            analysis = {"error": "Historical prices unavailable."}
+            for future in as_completed(futures):
+                stage = futures[future]
+                try:
+                    results[stage] = future.result()
+                except Exception as e:
+                    results[stage] = None
+                    sections[stage].error(f"Error in {stage} stage: {e}")
+                    continue
+
+                # 5c) Rank every contract of the expiration
+                if stage == "ranking":
+                    ranking = results[stage]
+                    if ranking is not None and not ranking.empty:
+                        with sections["ranking"].container():
+                            st.write(f"Top {len(ranking)} {option_type.capitalize()} Contracts by Probability of Profit")
+                            st.dataframe(ranking)
+                    else:
+                        sections["ranking"].write("No ranking available.")
+
+                # 5d) Price chart and daily % changes over the last 90 days
+                elif stage == "history":
+                    history = results[stage]
+                    historical_data = history.get("data") or []
+                    analysis = analyze_daily_percentage_changes_90_days(historical_data)
+                    with sections["history"].container():
+                        if historical_data:
+                            closes = pd.DataFrame(historical_data)
+                            closes["date"] = pd.to_datetime(closes["date"])
+                            closes["close_price"] = pd.to_numeric(closes["close_price"], errors="coerce")
+                            st.line_chart(closes.set_index("date")["close_price"])
+                        if "error" in history:
+                            st.write(f"Error: {history['error']}")
+                        elif "error" in analysis:
+                            st.write(f"Error: {analysis['error']}")
+                        else:
+                            st.write(f"- Trading Days Analyzed: {analysis['trading_days_analyzed']}")
+                            st.write(f"- Positive Days: {analysis['positive_days']}")
+                            st.write(f"- Average Positive Change: {analysis['average_positive_change']}%")
+                            st.write(f"- Negative Days: {analysis['negative_days']}")
+                            st.write(f"- Average Negative Change: {analysis['average_negative_change']}%")
+
+                # 5e) News sentiment
+                elif stage == "news":
+                    analyzed_articles = results[stage] or []
+                    if analyzed_articles:
+                        with sections["news"].container():
+                            for article in analyzed_articles:
+                                st.write(f"**Title**: {article['title']}")
+                                st.write(f"**Sentiment**: {article['sentiment']}")
+                                st.write(f"**URL**: {article['link']}\n")
+                    else:
+                        sections["news"].write("No news articles found.")
+
+                # 5f) Put/Call Ratio
+                elif stage == "pcr":
+                    pcr = results[stage]
+                    if "error" in pcr:
+                        sections["pcr"].write(f"Failed to fetch Put/Call Ratio: {pcr['error']}")
+                    else:
+                        with sections["pcr"].container():
+                            st.write(f"Total Call Volume (60 days): {pcr['total_call_volume']}")
+                            st.write(f"Total Put Volume (60 days): {pcr['total_put_volume']}")
+                            if pcr["skipped_expirations"]:
+                                st.write(f"Skipped expirations (fetch failed): {', '.join(pcr['skipped_expirations'])}")
+                            st.write(f"Put/Call Ratio: {pcr['put_call_ratio']}")
+
+                # 5g) VIX Value
+                elif stage == "vix":
+                    vix_value = results[stage]
+                    if vix_value is None:
+                        sections["vix"].write("Failed to fetch VIX Value.")
+                    else:
+                        sections["vix"].write(f"VIX Value: {vix_value}")
+
+                # 5h) Beta, correlation and relative strength vs the benchmark and watchlist
+                elif stage == "correlation":
+                    correlation = results[stage]
+                    if correlation is None:
+                        sections["correlation"].write("No correlation data available.")
+                    else:
+                        with sections["correlation"].container():
+                            st.write(f"- Beta vs {correlation['benchmark']}: {correlation['beta']}")
+                            st.write(f"- Correlation ({correlation['window']}d): {correlation['correlation']}")
+                            for label, value in correlation["relative_strength"].items():
+                                st.write(f"- Relative Strength ({label}): {value}%")
+                            for label, key in (("Most Correlated", "most_correlated"), ("Least Correlated", "least_correlated")):
+                                peers = ", ".join(f"{s} ({c})" for s, c in correlation[key].items())
+                                st.write(f"- {label}: {peers or 'N/A'}")
+            executor.shutdown(wait=False)
+            put_call_ratio = (results.get("pcr") or {}).get("put_call_ratio")
+            vix_value = results.get("vix")
+            analyzed_articles = results.get("news") or []
+
+            # 5i) Collect the results and prepare summary data for AI
             global profit_loss_result
-            if profit_loss_result:
-                summary_data += f"""
-Option Profit or Loss Analysis:
-  Ask Price (Contract Cost): ${profit_loss_result['ask_price']}
-  Percentage Change: {profit_loss_result['percent_change']}%
-  Stock Price Change: ${profit_loss_result['stock_price_change']}
-  Option Price Change per Share: ${profit_loss_result['option_price_change_per_share']}
-  Option Price Change per Contract: ${profit_loss_result['option_price_change_per_contract']}
-  Profit or Loss for the Contract: ${profit_loss_result['profit_or_loss']}
-"""
-
-            # 5i) Call AI analysis function
-            st.subheader("AI Analysis:")
-            ai_answer = get_ai_analysis(summary_data)
-            if ai_answer:
-                st.write(ai_answer)
+            record = {
+                "symbol": symbol,
+                "option_type": option_type,
+                "expiration_date": expiration_date,
+                "selected_options": compact_options(selected_options),
+                "daily_change": analysis if "error" not in analysis else None,
+                "put_call_ratio": put_call_ratio,
+                "vix_value": vix_value,
+                "articles": compact_articles(analyzed_articles),
+                "profit_loss": profit_loss_result,
+                "correlation": results.get("correlation"),
+            }
+            summary_data = build_summary_data(record)
+
+            # 5j) Call AI analysis function (streams into its placeholder, last)
+            ai_placeholder = sections["ai"]
+            cached_answer = get_cached_analysis(summary_data)
+            if cached_answer:
+                ai_answer = cached_answer["text"]
+                with ai_placeholder.container():
+                    st.caption(f"Served from cache (generated at {cached_answer['created_at']:%H:%M:%S}).")
+                    st.markdown(ai_answer)
+            else:
+                ai_answer = get_ai_analysis(summary_data, on_token=ai_placeholder.markdown)
+                if ai_answer:
+                    ai_placeholder.markdown(ai_answer)
+                else:
+                    ai_placeholder.write("No AI response returned.")
+
+            # 5k) Save a snapshot and show what changed since the previous one
+            record["ai_analysis"] = ai_answer
+            previous_snapshot = load_latest_snapshot(symbol, option_type, expiration_date)
+            snapshot_path = save_snapshot(record)
+            if snapshot_path:
+                st.caption(f"Snapshot saved to {snapshot_path}")
+                if previous_snapshot:
+                    with st.expander(f"Changes since the snapshot from {previous_snapshot['created_at']}"):
+                        diff = diff_snapshots(previous_snapshot, load_snapshot(snapshot_path))
+                        for line in format_snapshot_diff(diff):
+                            st.text(line)
+
+    # 6. Live watch mode: poll quotes/marks and update Greeks-derived values in place
+    if st.session_state.get("watch_target"):
+        watch_symbol, watch_type, watch_selected = st.session_state["watch_target"]
+        if st.checkbox(f"Live watch {watch_symbol} (updates every {WATCH_INTERVAL_SECONDS:.0f}s)"):
+            watched_options = [option for option in watch_selected or [] if option.get("id")]
+            if not watched_options:
+                st.write("No options to watch.")
+            elif hasattr(st, "fragment"):
+                # Only the fragment reruns on the interval: nothing sleeps in the
+                # script thread and the analysis sections above stay on the page
+                st.fragment(run_every=WATCH_INTERVAL_SECONDS)(_render_watch_tick)(
+                    watch_symbol, watch_type, watched_options
+                )
             else:
-                st.write("No AI response returned.")
+                # Streamlit without fragments: poll once per run, on demand
+                _render_watch_tick(watch_symbol, watch_type, watched_options)
+                st.button("Refresh watch")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# Configurable through environment variables (.env)
+AI_CACHE_TTL_SECONDS = float(os.getenv("AI_CACHE_TTL_SECONDS", 900))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", 128))
+AI_CACHE_PRICE_PRECISION = int(os.getenv("AI_CACHE_PRICE_PRECISION", 1))
+AI_CACHE_GREEK_PRECISION = int(os.getenv("AI_CACHE_GREEK_PRECISION", 2))
+
+GREEK_LABELS = {"delta", "gamma", "theta", "vega", "rho", "implied volatility"}
+DECIMAL_PATTERN = re.compile(r"-?\d+\.\d+")
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _round_decimals(text, precision):
+    return DECIMAL_PATTERN.sub(lambda m: f"{round(float(m.group()), precision):.{precision}f}", text)
+
+
+def normalize_summary(summary_data, price_precision=None, greek_precision=None):
+    """
+    Normalizes the AI summary text so that near-identical inputs map to the same key.
+    Greeks and prices are rounded to the configured precision, whitespace is
+    collapsed and news articles are sorted so their order does not matter.
+    Article sentiment lines are dropped since they are derived from the article itself.
+
+    Parameters:
+        summary_data (str): The summary text built for get_ai_analysis.
+        price_precision (int): Decimal places kept for prices and other values.
+        greek_precision (int): Decimal places kept for Greeks.
+
+    Returns:
+        str: The normalized summary.
+    """
+    price_precision = AI_CACHE_PRICE_PRECISION if price_precision is None else price_precision
+    greek_precision = AI_CACHE_GREEK_PRECISION if greek_precision is None else greek_precision
+
+    lines = []
+    articles = []
+    current_article = None
+
+    for raw_line in summary_data.splitlines():
+        line = " ".join(raw_line.split())
+        if not line:
+            continue
+
+        label, _, value = line.partition(":")
+        label = label.strip().lower()
+
+        if label == "title":
+            current_article = [line]
+            articles.append(current_article)
+            continue
+        if current_article is not None and label in ("sentiment", "url"):
+            if label == "url":
+                current_article.append(line)
+            continue
+        current_article = None
+
+        precision = greek_precision if label in GREEK_LABELS else price_precision
+        lines.append(f"{label}:{_round_decimals(value, precision)}" if value else _round_decimals(line, precision))
+
+    lines.extend(sorted(" | ".join(article) for article in articles))
+    return "\n".join(lines)
+
+
+def make_cache_key(summary_data):
+    return hashlib.sha256(normalize_summary(summary_data).encode("utf-8")).hexdigest()
+
+
+def get_cached_analysis(summary_data):
+    """
+    Looks up a cached AI analysis for the summary data.
+
+    Returns:
+        dict: {"text": str, "created_at": datetime} if a fresh entry exists, otherwise None.
+    """
+    key = make_cache_key(summary_data)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["stored_at"] > AI_CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return {"text": entry["text"], "created_at": datetime.fromtimestamp(entry["stored_at"])}
+
+
+def store_analysis(summary_data, text):
+    """
+    Stores an AI analysis, evicting the least recently used entries beyond AI_CACHE_MAX_ENTRIES.
+    """
+    if not text:
+        return
+    key = make_cache_key(summary_data)
+    with _lock:
+        _cache[key] = {"text": text, "stored_at": time.time()}
+        _cache.move_to_end(key)
+        while len(_cache) > AI_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
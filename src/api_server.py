@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import json
+import os
+from functools import partial
+
+import numpy as np
+from aiohttp import web
+from cachetools import TTLCache
+
+from src.chain_ranking import chain_to_frame
+from src.daily_change import analyze_daily_percentage_changes_90_days
+from src.expiration_index import get_all_expirations
+from src.fetch_greeks import fetch_option_chain, select_and_evaluate_options
+from src.get_google import fetch_google_news
+from src.get_vix import get_vix_value
+from src.historical_prices import fetch_historical_closing_prices
+from src.local_sentiment import analyze_sentiment_tiered
+from src.openai import get_ai_analysis
+from src.pcr import get_put_call_ratio_60_days
+from src.robinhood_login import login_to_robinhood
+from src.snapshots import compact_articles, compact_options
+from src.summary import build_summary_data
+
+# Seconds each kind of response stays warm in this process
+CACHE_TTLS = {
+    "expirations": 3600,
+    "chain": 60,
+    "greeks": 60,
+    "historicals": 900,
+    "pcr": 900,
+    "vix": 300,
+    "sentiment": 1800,
+    "analysis": 300,
+}
+CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", 512))
+
+_caches = {name: TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=ttl) for name, ttl in CACHE_TTLS.items()}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+json_response = partial(web.json_response, dumps=partial(json.dumps, default=_json_default))
+
+
+async def cached_call(cache_name, key, func, *args):
+    """
+    Runs a blocking provider call in the default executor, caching the result
+    under (cache_name, key) so every client of this process shares it.
+    None and {"error": ...} results are not cached, so the next request retries.
+    """
+    cache = _caches[cache_name]
+    if key in cache:
+        return cache[key]
+    result = await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    if result is not None and not (isinstance(result, dict) and "error" in result):
+        cache[key] = result
+    return result
+
+
+def _symbol(request):
+    symbol = request.match_info["symbol"].strip().upper()
+    if not symbol.isalpha():
+        raise web.HTTPBadRequest(text="Invalid symbol.")
+    return symbol
+
+
+def _option_type(request):
+    option_type = request.query.get("type", "call").lower()
+    if option_type not in ("call", "put"):
+        raise web.HTTPBadRequest(text="type must be 'call' or 'put'.")
+    return option_type
+
+
+def _expiration(request):
+    expiration_date = request.query.get("expiration")
+    if not expiration_date:
+        raise web.HTTPBadRequest(text="expiration (YYYY-MM-DD) is required.")
+    return expiration_date
+
+
+def _news_sentiment(symbol):
+    articles = fetch_google_news(symbol, os.getenv("GOOGLE_API_KEY"), os.getenv("GOOGLE_CX"))
+    return compact_articles(analyze_sentiment_tiered(articles)) if articles else []
+
+
+async def handle_chains(request):
+    symbol = _symbol(request)
+    expiration_date = request.query.get("expiration")
+    if not expiration_date:
+        expirations = await cached_call("expirations", symbol, get_all_expirations, symbol)
+        return json_response({"symbol": symbol, "expirations": expirations or []})
+
+    option_type = request.query.get("type")
+    chain = await cached_call(
+        "chain", (symbol, expiration_date, option_type), fetch_option_chain, symbol, expiration_date, option_type
+    )
+    records = []
+    if chain:
+        # NaN is not valid JSON; missing market data goes out as null
+        frame = chain_to_frame(chain)
+        records = frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+    return json_response({"symbol": symbol, "expiration_date": expiration_date, "options": records})
+
+
+async def handle_greeks(request):
+    symbol = _symbol(request)
+    expiration_date = _expiration(request)
+    option_type = _option_type(request)
+    result = await cached_call(
+        "greeks", (symbol, expiration_date, option_type),
+        select_and_evaluate_options, symbol, expiration_date, option_type
+    )
+    return json_response({
+        "symbol": symbol,
+        "current_price": result.get("current_price"),
+        "selected_options": compact_options(result.get("selected_options")),
+        "error": result.get("error"),
+    })
+
+
+async def handle_historicals(request):
+    symbol = _symbol(request)
+    span = request.query.get("span", "3month")
+    data = await cached_call("historicals", (symbol, span), fetch_historical_closing_prices, symbol, span)
+    return json_response({
+        "symbol": symbol,
+        "span": span,
+        "historicals": data or [],
+        "daily_change": analyze_daily_percentage_changes_90_days(data or []),
+    })
+
+
+async def handle_pcr(request):
+    symbol = _symbol(request)
+    ratio = await cached_call("pcr", symbol, get_put_call_ratio_60_days, symbol)
+    return json_response({"symbol": symbol, "put_call_ratio": ratio})
+
+
+async def handle_vix(request):
+    value = await cached_call("vix", "VIX", get_vix_value)
+    return json_response({"vix_value": value})
+
+
+async def handle_sentiment(request):
+    symbol = _symbol(request)
+    articles = await cached_call("sentiment", symbol, _news_sentiment, symbol)
+    return json_response({"symbol": symbol, "articles": articles or []})
+
+
+async def handle_analysis(request):
+    """
+    Full analysis: Greeks, historical stats, PCR, VIX and news sentiment are
+    gathered concurrently from the shared caches; add ?ai=1 for the AI text.
+    """
+    symbol = _symbol(request)
+    expiration_date = _expiration(request)
+    option_type = _option_type(request)
+    include_ai = request.query.get("ai", "0") in ("1", "true", "yes")
+
+    cache_key = (symbol, expiration_date, option_type, include_ai)
+    if cache_key in _caches["analysis"]:
+        return json_response(_caches["analysis"][cache_key])
+
+    greeks, historicals, ratio, vix_value, articles = await asyncio.gather(
+        cached_call("greeks", (symbol, expiration_date, option_type),
+                    select_and_evaluate_options, symbol, expiration_date, option_type),
+        cached_call("historicals", (symbol, "3month"), fetch_historical_closing_prices, symbol, "3month"),
+        cached_call("pcr", symbol, get_put_call_ratio_60_days, symbol),
+        cached_call("vix", "VIX", get_vix_value),
+        cached_call("sentiment", symbol, _news_sentiment, symbol),
+    )
+    daily_change = analyze_daily_percentage_changes_90_days(historicals or [])
+
+    record = {
+        "symbol": symbol,
+        "option_type": option_type,
+        "expiration_date": expiration_date,
+        "selected_options": compact_options(greeks.get("selected_options")),
+        "daily_change": daily_change if "error" not in daily_change else None,
+        "put_call_ratio": ratio,
+        "vix_value": vix_value,
+        "articles": articles or [],
+        "profit_loss": None,
+    }
+    if include_ai:
+        summary_data = build_summary_data(record)
+        record["ai_analysis"] = await asyncio.get_running_loop().run_in_executor(None, get_ai_analysis, summary_data)
+
+    _caches["analysis"][cache_key] = record
+    return json_response(record)
+
+
+async def _login(app):
+    if not await asyncio.get_running_loop().run_in_executor(None, login_to_robinhood):
+        print("Warning: Robinhood login failed; Robinhood-backed endpoints will return errors.")
+
+
+def create_app():
+    app = web.Application()
+    app.on_startup.append(_login)
+    app.add_routes([
+        web.get("/chains/{symbol}", handle_chains),
+        web.get("/greeks/{symbol}", handle_greeks),
+        web.get("/historicals/{symbol}", handle_historicals),
+        web.get("/pcr/{symbol}", handle_pcr),
+        web.get("/vix", handle_vix),
+        web.get("/sentiment/{symbol}", handle_sentiment),
+        web.get("/analysis/{symbol}", handle_analysis),
+    ])
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API for the options analysis engine.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    web.run_app(create_app(), host=args.host, port=args.port)
@@ -0,0 +1,268 @@
+import os
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.snapshots import SNAPSHOT_DIR
+
+ARROW_DIR = os.getenv("ARROW_DIR", os.path.join(SNAPSHOT_DIR, "arrow"))
+
+# Robinhood option fields stored in chain snapshots (numeric, float64)
+CHAIN_NUMERIC_FIELDS = {
+    "strike_price": "strike",
+    "bid_price": "bid",
+    "ask_price": "ask",
+    "adjusted_mark_price": "mark",
+    "last_trade_price": "last",
+    "implied_volatility": "iv",
+    "delta": "delta",
+    "gamma": "gamma",
+    "theta": "theta",
+    "vega": "vega",
+    "rho": "rho",
+    "open_interest": "open_interest",
+    "volume": "volume",
+}
+CHAIN_TEXT_FIELDS = {"expiration_date": "expiration_date", "type": "type", "id": "id"}
+
+# Robinhood historical bar fields (fetch_historical_closing_prices only keeps close_price)
+BAR_FIELDS = {
+    "open_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "close_price": "close",
+    "volume": "volume",
+}
+
+
+def _numeric(frame, field):
+    # Plain NumPy arrays keep NaN as NaN (no validity bitmap), which is what
+    # lets the reload hand the buffers to NumPy without copying
+    if field not in frame:
+        return pa.array(np.full(len(frame), np.nan))
+    return pa.array(pd.to_numeric(frame[field], errors="coerce").to_numpy(dtype=float))
+
+
+def chain_to_table(chain_rows, captured_at=None):
+    """
+    Converts option dicts (instrument + market data, e.g. from fetch_option_chain)
+    into an Arrow table with one row per contract.
+
+    Parameters:
+        chain_rows (list): Robinhood option dicts, any number of expirations.
+        captured_at (datetime): Snapshot time stored in the schema metadata.
+
+    Returns:
+        pyarrow.Table
+    """
+    frame = pd.DataFrame(chain_rows)
+    columns = {}
+    for field, column in CHAIN_TEXT_FIELDS.items():
+        values = frame[field].astype(str) if field in frame else pd.Series([""] * len(frame))
+        columns[column] = pa.array(values.tolist(), type=pa.string())
+    for field, column in CHAIN_NUMERIC_FIELDS.items():
+        columns[column] = _numeric(frame, field)
+
+    captured_at = captured_at or datetime.now()
+    return pa.table(columns).replace_schema_metadata({"captured_at": captured_at.isoformat()})
+
+
+def bars_to_table(bars):
+    """
+    Converts historical bars into an Arrow table with a UTC timestamp column.
+
+    Parameters:
+        bars (list): Dicts with 'begins_at' or 'date' and any of BAR_FIELDS
+                     (the output of fetch_historical_closing_prices works).
+
+    Returns:
+        pyarrow.Table
+    """
+    frame = pd.DataFrame(bars)
+    time_field = "begins_at" if "begins_at" in frame else "date"
+    timestamps = pd.to_datetime(frame[time_field], utc=True).to_numpy(dtype="datetime64[ns]")
+    columns = {"timestamp": pa.array(timestamps, type=pa.timestamp("ns", tz="UTC"))}
+    for field, column in BAR_FIELDS.items():
+        if field in frame:
+            columns[column] = _numeric(frame, field)
+    return pa.table(columns)
+
+
+def write_table(table, path, fmt="arrow"):
+    """
+    Writes a table as an uncompressed Arrow IPC file (fmt="arrow", memory-mappable
+    with zero-copy reads) or as a compressed Parquet file (fmt="parquet", smaller
+    and readable by other tools, but decoded on load).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if fmt == "parquet":
+        pq.write_table(table, tmp_path, compression="zstd")
+    else:
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    # Readers never see a half-written file
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_table(path, columns=None):
+    """
+    Reads an Arrow IPC file through a memory map (buffers point into the page
+    cache, nothing is copied) or a Parquet file (memory-mapped, then decoded).
+    """
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns, memory_map=True)
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def table_to_frame(table):
+    """
+    Converts a table to pandas, keeping each column in its own block so
+    single-chunk numeric columns without nulls are zero-copy views.
+    """
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+def table_to_arrays(table, columns=None):
+    """
+    Returns columns as NumPy arrays (zero-copy for numeric columns without nulls).
+    """
+    return {
+        name: table.column(name).combine_chunks().to_numpy(zero_copy_only=False)
+        for name in (columns or table.column_names)
+    }
+
+
+def _chain_dir(symbol, trading_day):
+    return os.path.join(ARROW_DIR, symbol.upper(), "chains", str(trading_day))
+
+
+def save_chain_snapshot(symbol, chain_rows, fmt="arrow", captured_at=None):
+    """
+    Saves a chain snapshot under ARROW_DIR/<SYMBOL>/chains/<YYYY-MM-DD>/<HHMMSS>.<fmt>.
+
+    Returns:
+        str: The file path, or None if there was nothing to save.
+    """
+    if not chain_rows:
+        return None
+    captured_at = captured_at or datetime.now()
+    path = os.path.join(
+        _chain_dir(symbol, captured_at.date()), f"{captured_at:%H%M%S}.{'parquet' if fmt == 'parquet' else 'arrow'}"
+    )
+    return write_table(chain_to_table(chain_rows, captured_at), path, fmt)
+
+
+def list_chain_snapshots(symbol, trading_day=None):
+    """
+    Returns the chain snapshot paths for a day (default today), oldest first.
+    """
+    directory = _chain_dir(symbol, trading_day or date.today())
+    if not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, name) for name in sorted(os.listdir(directory))
+        if name.endswith((".arrow", ".parquet"))
+    ]
+
+
+def latest_chain_snapshot(symbol):
+    """
+    Returns the path of the most recent chain snapshot on any day, or None.
+    """
+    directory = os.path.join(ARROW_DIR, symbol.upper(), "chains")
+    if not os.path.isdir(directory):
+        return None
+    for trading_day in sorted(os.listdir(directory), reverse=True):
+        paths = list_chain_snapshots(symbol, trading_day)
+        if paths:
+            return paths[-1]
+    return None
+
+
+def load_chain_snapshot(path, columns=None):
+    """
+    Loads a chain snapshot as a DataFrame (see CHAIN_NUMERIC_FIELDS for the columns).
+    """
+    return table_to_frame(read_table(path, columns))
+
+
+def load_chain_day(symbol, trading_day=None):
+    """
+    Loads every chain snapshot of a day, with a 'captured_at' column per snapshot.
+
+    Returns:
+        pandas.DataFrame: All snapshots stacked, or an empty DataFrame.
+    """
+    frames = []
+    for path in list_chain_snapshots(symbol, trading_day):
+        table = read_table(path)
+        frame = table_to_frame(table)
+        frame["captured_at"] = pd.Timestamp((table.schema.metadata or {}).get(b"captured_at", b"").decode() or None)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _historicals_path(symbol, span, fmt="arrow"):
+    return os.path.join(ARROW_DIR, symbol.upper(), "historicals", f"{span}.{'parquet' if fmt == 'parquet' else 'arrow'}")
+
+
+def save_historicals(symbol, bars, span="3month", fmt="arrow"):
+    """
+    Saves historical bars for a symbol/span, replacing the previous file.
+
+    Returns:
+        str: The file path, or None if there was nothing to save.
+    """
+    if not bars:
+        return None
+    return write_table(bars_to_table(bars), _historicals_path(symbol, span, fmt), fmt)
+
+
+def load_historicals(symbol, span="3month", fmt="arrow"):
+    """
+    Loads saved historical bars for a symbol/span.
+
+    Returns:
+        pandas.DataFrame: Bars indexed by timestamp, or None if nothing is saved.
+    """
+    path = _historicals_path(symbol, span, fmt)
+    if not os.path.exists(path):
+        return None
+    return table_to_frame(read_table(path)).set_index("timestamp")
+
+
+if __name__ == "__main__":
+    import sys
+
+    import robin_stocks.robinhood as r
+
+    from src.expiration_index import get_all_expirations
+    from src.fetch_greeks import fetch_option_chain
+    from src.provider_gateway import call_provider
+    from src.robinhood_login import login_to_robinhood
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.arrow_store SYMBOL [EXPIRATIONS]")
+    elif login_to_robinhood():
+        symbol = sys.argv[1].upper()
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+        rows = [row for expiration in get_all_expirations(symbol)[:count] for row in fetch_option_chain(symbol, expiration)]
+        chain_path = save_chain_snapshot(symbol, rows)
+        bars = call_provider("robinhood", r.stocks.get_stock_historicals, symbol, interval="day", span="5year")
+        bars_path = save_historicals(symbol, bars, span="5year")
+
+        for path, loader in ((chain_path, lambda: load_chain_snapshot(chain_path)),
+                             (bars_path, lambda: load_historicals(symbol, "5year"))):
+            if path:
+                started = time.perf_counter()
+                frame = loader()
+                print(f"{path}: {len(frame)} rows reloaded in {(time.perf_counter() - started) * 1000:.1f} ms")
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import robin_stocks.robinhood as r
+
+from src.black_scholes import bs_price
+from src.provider_gateway import call_provider
+
+TRADING_DAYS = 252
+HISTORICALS_BATCH_SIZE = 50  # symbols per historicals request
+
+
+def load_daily_closes(symbols, span="5year"):
+    """
+    Loads daily closing prices for many symbols with batched historicals requests.
+
+    Parameters:
+        symbols (list): Stock ticker symbols.
+        span (str): 'year' or '5year' (Robinhood's daily-bar spans).
+
+    Returns:
+        pandas.DataFrame: Closing prices indexed by date, one column per symbol.
+    """
+    symbols = [s.upper() for s in symbols]
+    records = []
+    for start in range(0, len(symbols), HISTORICALS_BATCH_SIZE):
+        batch = symbols[start:start + HISTORICALS_BATCH_SIZE]
+        try:
+            historicals = call_provider(
+                "robinhood", r.stocks.get_stock_historicals, batch, interval="day", span=span, bounds="regular"
+            )
+        except Exception as e:
+            print(f"Error fetching historicals for {', '.join(batch)}: {e}")
+            continue
+        records.extend(item for item in historicals or [] if item)
+
+    if not records:
+        return pd.DataFrame()
+
+    frame = pd.DataFrame(records)
+    frame["date"] = pd.to_datetime(frame["begins_at"]).dt.tz_localize(None).dt.normalize()
+    frame["close_price"] = pd.to_numeric(frame["close_price"], errors="coerce")
+    return frame.pivot_table(index="date", columns="symbol", values="close_price", aggfunc="last").sort_index()
+
+
+def strike_increment(prices):
+    """
+    Approximates listed strike spacing from the underlying price, vectorized.
+    """
+    prices = np.asarray(prices, dtype=float)
+    return np.select(
+        [prices < 25, prices < 100, prices < 250, prices < 1000],
+        [0.5, 1.0, 2.5, 5.0],
+        default=10.0,
+    )
+
+
+def realized_volatility(closes, window=20):
+    """
+    Annualized rolling realized volatility of daily log returns.
+    """
+    returns = np.log(closes / closes.shift(1))
+    return returns.rolling(window).std() * np.sqrt(TRADING_DAYS)
+
+
+def backtest_strike_selection(closes, option_type="call", dte_days=30, holding_days=20,
+                              vol_window=20, entry_every=5):
+    """
+    Backtests the strike selection used by fetch_and_evaluate_greeks: at each
+    entry date take the highest strike at or below the price ("itm") and the
+    lowest strike above it ("otm") on a synthetic chain, priced with
+    Black-Scholes at the realized volatility. Every symbol and entry date is
+    evaluated at once with array operations.
+
+    Parameters:
+        closes (pandas.DataFrame): Daily closes indexed by date, one column per symbol.
+        option_type (str): 'call' or 'put'.
+        dte_days (int): Trading days to expiration at entry.
+        holding_days (int): Trading days the contract is held (at most dte_days).
+        vol_window (int): Window for realized volatility.
+        entry_every (int): Trading days between entries.
+
+    Returns:
+        pandas.DataFrame: One row per trade with date, symbol, leg, strike, spot and
+        option prices at entry/exit, pnl (per contract) and return_pct.
+    """
+    holding_days = min(holding_days, dte_days)
+    closes = closes.sort_index()
+    prices = closes.to_numpy(dtype=float)
+    vols = realized_volatility(closes, vol_window).to_numpy()
+
+    entries = np.arange(vol_window, len(closes) - holding_days, entry_every)
+    if len(entries) == 0:
+        return pd.DataFrame()
+    exits = entries + holding_days
+
+    spot_entry = prices[entries]              # (entries, symbols)
+    spot_exit = prices[exits]
+    vol_entry = vols[entries]
+    vol_exit = np.where(np.isnan(vols[exits]), vol_entry, vols[exits])
+
+    step = strike_increment(spot_entry)
+    itm_strike = np.floor(spot_entry / step) * step
+    otm_strike = itm_strike + step
+
+    time_entry = dte_days / TRADING_DAYS
+    time_exit = (dte_days - holding_days) / TRADING_DAYS
+
+    frames = []
+    for leg, strike in (("itm", itm_strike), ("otm", otm_strike)):
+        entry_price = bs_price(spot_entry, strike, time_entry, vol_entry, option_type)
+        exit_price = bs_price(spot_exit, strike, time_exit, vol_exit, option_type)
+        pnl = (exit_price - entry_price) * 100
+        frames.append(pd.DataFrame({
+            "date": np.repeat(closes.index[entries], prices.shape[1]),
+            "symbol": np.tile(closes.columns.to_numpy(), len(entries)),
+            "leg": leg,
+            "strike": strike.ravel(),
+            "spot_entry": spot_entry.ravel(),
+            "spot_exit": spot_exit.ravel(),
+            "entry_price": entry_price.ravel(),
+            "exit_price": exit_price.ravel(),
+            "pnl": pnl.ravel(),
+            "return_pct": np.where(entry_price > 0, pnl / (entry_price * 100) * 100, np.nan).ravel(),
+        }))
+
+    trades = pd.concat(frames, ignore_index=True)
+    return trades.dropna(subset=["entry_price", "exit_price", "pnl"]).reset_index(drop=True)
+
+
+def summarize_backtest(trades):
+    """
+    Summarizes the P/L distribution of backtest trades per leg.
+
+    Returns:
+        pandas.DataFrame: trades, win_rate, mean/median/p5/p95 P/L and mean return % per leg.
+    """
+    if trades.empty:
+        return pd.DataFrame()
+
+    grouped = trades.groupby("leg")
+    return pd.DataFrame({
+        "trades": grouped.size(),
+        "win_rate": grouped["pnl"].apply(lambda pnl: (pnl > 0).mean() * 100),
+        "mean_pnl": grouped["pnl"].mean(),
+        "median_pnl": grouped["pnl"].median(),
+        "p5_pnl": grouped["pnl"].quantile(0.05),
+        "p95_pnl": grouped["pnl"].quantile(0.95),
+        "mean_return_pct": grouped["return_pct"].mean(),
+    }).round(2)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from src.robinhood_login import login_to_robinhood
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.backtest SYMBOL [SYMBOL ...]")
+    elif login_to_robinhood():
+        daily_closes = load_daily_closes(sys.argv[1:])
+        if daily_closes.empty:
+            print("No historical data available.")
+        else:
+            print(summarize_backtest(backtest_strike_selection(daily_closes)))
@@ -0,0 +1,260 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within this process
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from src.historical_prices import fetch_historical_bars
+from src.snapshots import SNAPSHOT_DIR
+
+BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", os.path.join(SNAPSHOT_DIR, "bars"))
+
+# One raw little-endian file per column; timestamps are UTC epoch nanoseconds
+BAR_COLUMNS = {
+    "timestamp": "<i8",
+    "open": "<f8",
+    "high": "<f8",
+    "low": "<f8",
+    "close": "<f8",
+    "volume": "<f8",
+}
+PRICE_FIELDS = {
+    "open_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "close_price": "close",
+    "volume": "volume",
+}
+
+INTERVAL_SECONDS = {
+    "5minute": 300,
+    "10minute": 600,
+    "15minute": 900,
+    "30minute": 1800,
+    "hour": 3600,
+    "day": 86400,
+}
+
+_lock = threading.Lock()
+
+
+def _series_dir(symbol, interval):
+    return os.path.join(BAR_STORE_DIR, symbol.upper(), interval)
+
+
+def _column_path(symbol, interval, column):
+    return os.path.join(_series_dir(symbol, interval), f"{column}.bin")
+
+
+@contextmanager
+def _series_lock(symbol, interval):
+    # The prefetch scheduler and manual runs of this module may append to the
+    # same series from separate processes, so the thread lock is paired with an
+    # flock on a lock file
+    with _lock:
+        os.makedirs(_series_dir(symbol, interval), exist_ok=True)
+        with open(os.path.join(_series_dir(symbol, interval), "append.lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _truncate_columns(symbol, interval, rows):
+    # Drops values past the last complete row (left by an append that failed partway)
+    for column, dtype in BAR_COLUMNS.items():
+        path = _column_path(symbol, interval, column)
+        size = rows * np.dtype(dtype).itemsize
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            with open(path, "ab") as f:
+                f.truncate(size)
+
+
+def _row_count(symbol, interval):
+    # A reader racing an append may see some columns one write ahead, so the
+    # shortest column defines how many complete rows exist
+    sizes = []
+    for column, dtype in BAR_COLUMNS.items():
+        path = _column_path(symbol, interval, column)
+        if not os.path.exists(path):
+            return 0
+        sizes.append(os.path.getsize(path) // np.dtype(dtype).itemsize)
+    return min(sizes)
+
+
+def bars_to_columns(bars):
+    """
+    Converts Robinhood bars (fetch_historical_bars output) into sorted column arrays.
+
+    Returns:
+        dict: column -> NumPy array, as in BAR_COLUMNS.
+    """
+    frame = pd.DataFrame(bars)
+    if frame.empty:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in BAR_COLUMNS.items()}
+
+    timestamps = pd.to_datetime(frame["begins_at"], utc=True).to_numpy(dtype="datetime64[ns]").view("i8")
+    order = np.argsort(timestamps, kind="stable")
+    columns = {"timestamp": timestamps[order]}
+    for field, column in PRICE_FIELDS.items():
+        values = pd.to_numeric(frame[field], errors="coerce").to_numpy(dtype=float) if field in frame else np.full(len(frame), np.nan)
+        columns[column] = values[order]
+    return columns
+
+
+def append_bars(symbol, interval, bars):
+    """
+    Appends bars to the store. Bars at or before the last stored timestamp are
+    dropped, so overlapping fetches can be appended safely. Column files are
+    first cut back to the last complete row, and a failed append is rolled
+    back, so prices always stay aligned with their timestamps.
+
+    Parameters:
+        symbol (str): Stock ticker symbol.
+        interval (str): Bar interval, e.g. '5minute'.
+        bars (list or dict): Robinhood bar dicts, or column arrays from bars_to_columns().
+
+    Returns:
+        int: Number of bars appended.
+    """
+    columns = bars if isinstance(bars, dict) else bars_to_columns(bars)
+    with _series_lock(symbol, interval):
+        rows = _row_count(symbol, interval)
+        _truncate_columns(symbol, interval, rows)
+        stored = open_bars(symbol, interval)
+        last = stored["timestamp"][-1] if len(stored["timestamp"]) else np.iinfo(np.int64).min
+
+        timestamps = columns["timestamp"]
+        keep = timestamps > last
+        # Duplicate timestamps within one batch keep their last bar
+        keep[:-1] &= timestamps[:-1] != timestamps[1:]
+        if not keep.any():
+            return 0
+
+        # Timestamps are written last so readers never see a row without prices
+        try:
+            for column in list(PRICE_FIELDS.values()) + ["timestamp"]:
+                values = np.ascontiguousarray(columns[column][keep], dtype=BAR_COLUMNS[column])
+                with open(_column_path(symbol, interval, column), "ab") as f:
+                    f.write(values.tobytes())
+        except Exception:
+            _truncate_columns(symbol, interval, rows)
+            raise
+        return int(keep.sum())
+
+
+def open_bars(symbol, interval):
+    """
+    Memory-maps the stored columns of a symbol/interval (read-only).
+
+    Returns:
+        dict: column -> numpy.memmap (empty arrays if nothing is stored).
+    """
+    rows = _row_count(symbol, interval)
+    if rows == 0:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in BAR_COLUMNS.items()}
+    return {
+        column: np.memmap(_column_path(symbol, interval, column), dtype=dtype, mode="r", shape=(rows,))
+        for column, dtype in BAR_COLUMNS.items()
+    }
+
+
+def _to_ns(value):
+    timestamp = pd.Timestamp(value)
+    return (timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp).value
+
+
+def read_range(symbol, interval, start=None, end=None):
+    """
+    Returns the bars with start <= timestamp < end as views into the memory map
+    (binary search on the sorted timestamp column, nothing is copied).
+
+    Parameters:
+        start, end: Anything pd.Timestamp accepts (naive values are taken as UTC), or None.
+
+    Returns:
+        dict: column -> array slice.
+    """
+    columns = open_bars(symbol, interval)
+    timestamps = columns["timestamp"]
+    lo = 0 if start is None else int(np.searchsorted(timestamps, _to_ns(start), side="left"))
+    hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, _to_ns(end), side="left"))
+    return {column: values[lo:hi] for column, values in columns.items()}
+
+
+def resample_bars(columns, interval):
+    """
+    Aggregates sorted bars into a coarser interval (open=first, high=max,
+    low=min, close=last, volume=sum) with reduceat over bucket boundaries.
+    Buckets are aligned to UTC, so 'day' buckets match US trading sessions.
+
+    Parameters:
+        columns (dict): Column arrays (e.g. from read_range()).
+        interval (str): Target interval, a key of INTERVAL_SECONDS.
+
+    Returns:
+        dict: Resampled column arrays.
+    """
+    timestamps = np.asarray(columns["timestamp"])
+    if len(timestamps) == 0:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in BAR_COLUMNS.items()}
+
+    width = INTERVAL_SECONDS[interval] * 1_000_000_000
+    buckets = timestamps // width * width
+    starts = np.concatenate(([0], np.flatnonzero(buckets[1:] != buckets[:-1]) + 1))
+    ends = np.concatenate((starts[1:], [len(timestamps)])) - 1
+
+    return {
+        "timestamp": buckets[starts],
+        "open": np.asarray(columns["open"])[starts],
+        "high": np.maximum.reduceat(np.asarray(columns["high"]), starts),
+        "low": np.minimum.reduceat(np.asarray(columns["low"]), starts),
+        "close": np.asarray(columns["close"])[ends],
+        "volume": np.add.reduceat(np.asarray(columns["volume"]), starts),
+    }
+
+
+def columns_to_frame(columns):
+    """
+    Builds a DataFrame indexed by UTC timestamp (copies; use for small results only).
+    """
+    index = pd.to_datetime(np.asarray(columns["timestamp"]), utc=True)
+    return pd.DataFrame({c: np.asarray(v) for c, v in columns.items() if c != "timestamp"}, index=index)
+
+
+def update_bar_store(symbol, interval="5minute", span="week"):
+    """
+    Fetches the latest bars from Robinhood and appends the new ones. The
+    prefetch scheduler runs this for every watchlist symbol on each pass.
+
+    Returns:
+        int: Number of bars appended, or None when no bars could be fetched.
+    """
+    bars = fetch_historical_bars(symbol, interval=interval, span=span)
+    if not bars:
+        return None
+    return append_bars(symbol, interval, bars)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from src.robinhood_login import login_to_robinhood
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.bar_store SYMBOL [SYMBOL ...]")
+    elif login_to_robinhood():
+        for symbol in sys.argv[1:]:
+            added = update_bar_store(symbol)
+            hourly = resample_bars(read_range(symbol, "5minute"), "hour")
+            print(f"{symbol.upper()}: {added or 0} new 5-minute bars, {_row_count(symbol, '5minute')} stored, "
+                  f"{len(hourly['timestamp'])} hourly bars")
@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", 0.04))
+MIN_TIME = 1 / 365.0  # Floor for time to expiration, in years
+
+
+def norm_cdf(x):
+    """
+    Standard normal CDF using the Abramowitz-Stegun erf approximation
+    (absolute error below 1.5e-7), vectorized over numpy arrays.
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def norm_pdf(x):
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def _is_call(option_type):
+    return np.char.lower(np.asarray(option_type, dtype=str)) == "call"
+
+
+def _d1_d2(spot, strike, time, sigma, rate):
+    spot = np.asarray(spot, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    time = np.maximum(np.asarray(time, dtype=float), MIN_TIME)
+    sigma = np.maximum(np.asarray(sigma, dtype=float), 1e-6)
+    sqrt_t = np.sqrt(time)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * sigma * sigma) * time) / (sigma * sqrt_t)
+    return d1, d1 - sigma * sqrt_t, time, sigma, sqrt_t
+
+
+def bs_price(spot, strike, time, sigma, option_type="call", rate=None):
+    """
+    Black-Scholes price per share, vectorized over all arguments.
+
+    Parameters:
+        spot (float or array): Underlying price.
+        strike (float or array): Strike price.
+        time (float or array): Time to expiration in years (0 gives intrinsic value).
+        sigma (float or array): Annualized implied volatility, e.g. 0.3.
+        option_type (str or array): 'call' or 'put'.
+        rate (float): Risk-free rate (defaults to RISK_FREE_RATE).
+
+    Returns:
+        numpy.ndarray: Option prices.
+    """
+    rate = RISK_FREE_RATE if rate is None else rate
+    is_call = _is_call(option_type)
+    raw_time = np.asarray(time, dtype=float)
+    d1, d2, time, sigma, _ = _d1_d2(spot, strike, time, sigma, rate)
+    spot = np.asarray(spot, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    discount = np.exp(-rate * time)
+
+    call = spot * norm_cdf(d1) - strike * discount * norm_cdf(d2)
+    put = strike * discount * norm_cdf(-d2) - spot * norm_cdf(-d1)
+    price = np.where(is_call, call, put)
+
+    intrinsic = np.where(is_call, np.maximum(spot - strike, 0.0), np.maximum(strike - spot, 0.0))
+    return np.where(raw_time <= 0, intrinsic, price)
+
+
+def bs_greeks(spot, strike, time, sigma, option_type="call", rate=None):
+    """
+    Black-Scholes Greeks, vectorized. Theta is per calendar day and vega per
+    one volatility point, matching the Robinhood market data convention.
+
+    Returns:
+        dict: numpy arrays for 'delta', 'gamma', 'theta', 'vega' and 'rho'.
+    """
+    rate = RISK_FREE_RATE if rate is None else rate
+    is_call = _is_call(option_type)
+    d1, d2, time, sigma, sqrt_t = _d1_d2(spot, strike, time, sigma, rate)
+    spot = np.asarray(spot, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    discount = np.exp(-rate * time)
+    pdf_d1 = norm_pdf(d1)
+
+    delta = np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.0)
+    gamma = pdf_d1 / (spot * sigma * sqrt_t)
+    decay = -spot * pdf_d1 * sigma / (2.0 * sqrt_t)
+    theta = np.where(
+        is_call,
+        decay - rate * strike * discount * norm_cdf(d2),
+        decay + rate * strike * discount * norm_cdf(-d2),
+    ) / 365.0
+    vega = spot * pdf_d1 * sqrt_t / 100.0
+    rho = np.where(
+        is_call,
+        strike * time * discount * norm_cdf(d2),
+        -strike * time * discount * norm_cdf(-d2),
+    ) / 100.0
+
+    return {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega, "rho": rho}
+
+
+def implied_volatility(price, spot, strike, time, option_type="call", rate=None,
+                       low=1e-4, high=5.0, iterations=60):
+    """
+    Solves for implied volatility by vectorized bisection.
+
+    Returns:
+        numpy.ndarray: Implied volatilities (NaN where the price is below intrinsic value).
+    """
+    price = np.asarray(price, dtype=float)
+    shape = np.broadcast(price, np.asarray(spot), np.asarray(strike), np.asarray(time)).shape
+    lo = np.full(shape, low)
+    hi = np.full(shape, high)
+
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        too_high = bs_price(spot, strike, time, mid, option_type, rate) > price
+        hi = np.where(too_high, mid, hi)
+        lo = np.where(too_high, lo, mid)
+
+    iv = 0.5 * (lo + hi)
+    floor = bs_price(spot, strike, time, low, option_type, rate)
+    return np.where(price < floor, np.nan, iv)
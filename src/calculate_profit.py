@@ -1,11 +1,16 @@
+from src.vol_surface import price_from_surface
 
-def calculate_option_profit_or_loss(option_contract, percent_change):
+
+def calculate_option_profit_or_loss(option_contract, percent_change, surface=None):
     """
     Calculates the profit or loss for an options contract based on a given percentage change in the underlying stock price.
     
     Parameters:
         option_contract (dict): The options contract data (must include 'strike_price', 'ask_price', 'delta').
         percent_change (float): The percentage change in the underlying stock price.
+        surface (dict): Optional volatility surface from get_vol_surface(). When given, the option is
+                        repriced off the surface at the new stock price instead of using the delta
+                        approximation (the contract also needs 'expiration_date' and 'type').
 
     Returns:
         dict: A dictionary with the calculated profit or loss and relevant information.
@@ -22,8 +27,19 @@ def calculate_option_profit_or_loss(option_contract, percent_change):
         # Simulate stock price change
         stock_price_change = current_price * (percent_change / 100)
         
-        # Calculate expected option price change per share using delta
-        option_price_change_per_share = delta * stock_price_change
+        if surface is not None:
+            # Reprice off the volatility surface, no extra market data calls
+            strike_price = float(option_contract['strike_price'])
+            expiration_date = option_contract['expiration_date']
+            option_type = option_contract.get('type', 'call')
+            price_now = price_from_surface(surface, strike_price, expiration_date, option_type, spot=current_price)
+            price_after = price_from_surface(
+                surface, strike_price, expiration_date, option_type, spot=current_price + stock_price_change
+            )
+            option_price_change_per_share = float(price_after - price_now)
+        else:
+            # Calculate expected option price change per share using delta
+            option_price_change_per_share = delta * stock_price_change
         
         # Calculate option price change per contract (100 shares)
         option_price_change_per_contract = option_price_change_per_share * 100
@@ -0,0 +1,124 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from src.black_scholes import RISK_FREE_RATE, norm_cdf
+from src.fetch_greeks import fetch_option_chain
+from src.fetch_price import fetch_current_price
+
+RANKING_COLUMNS = [
+    "type", "strike", "ask", "iv", "delta", "expected_move", "prob_itm",
+    "prob_touch", "prob_profit", "reward_risk",
+]
+
+NUMERIC_FIELDS = {
+    "strike_price": "strike",
+    "bid_price": "bid",
+    "ask_price": "ask",
+    "adjusted_mark_price": "mark",
+    "implied_volatility": "iv",
+    "delta": "delta",
+    "theta": "theta",
+    "open_interest": "open_interest",
+    "volume": "volume",
+}
+
+
+def chain_to_frame(chain_rows):
+    """
+    Converts Robinhood option dicts (instrument + market data) into a numeric DataFrame.
+
+    Returns:
+        pandas.DataFrame: Columns 'expiration_date', 'type' and the renamed NUMERIC_FIELDS.
+    """
+    frame = pd.DataFrame(chain_rows)
+    result = pd.DataFrame(index=frame.index)
+    result["expiration_date"] = frame.get("expiration_date")
+    result["type"] = frame.get("type")
+    for field, column in NUMERIC_FIELDS.items():
+        result[column] = pd.to_numeric(frame[field], errors="coerce") if field in frame else np.nan
+    return result
+
+
+def _d2(spot, strike, time, iv):
+    return (np.log(spot / strike) + (RISK_FREE_RATE - 0.5 * iv * iv) * time) / (iv * np.sqrt(time))
+
+
+def rank_chain(chain, spot, expiration_date, top_n=10, sort_by="prob_profit", today=None):
+    """
+    Ranks every contract of one expiration by probability and reward/risk
+    metrics computed on whole columns at once.
+
+    Metrics per contract:
+        expected_move: one-standard-deviation move to expiration from the contract's IV.
+        prob_itm: risk-neutral probability of finishing in the money.
+        prob_touch: probability of touching the strike before expiration (about 2 x prob_itm).
+        prob_profit: probability of finishing beyond the breakeven when buying at the ask.
+        reward_risk: payoff after a one-expected-move favourable move, per dollar of premium.
+
+    Parameters:
+        chain (list or DataFrame): Option dicts or the output of chain_to_frame().
+        spot (float): Current underlying price.
+        expiration_date (str): Expiration date 'YYYY-MM-DD'.
+        top_n (int): Number of rows to return.
+        sort_by (str): Column to sort by (descending).
+        today (date): Valuation date (defaults to today).
+
+    Returns:
+        pandas.DataFrame: Top-N contracts with RANKING_COLUMNS.
+    """
+    frame = chain if isinstance(chain, pd.DataFrame) else chain_to_frame(chain)
+    frame = frame[(frame["ask"] > 0) & (frame["iv"] > 0) & (frame["strike"] > 0)].copy()
+    if frame.empty:
+        return pd.DataFrame(columns=RANKING_COLUMNS)
+
+    today = today or date.today()
+    days = (datetime.strptime(expiration_date, "%Y-%m-%d").date() - today).days
+    time = max(days, 1) / 365.0
+
+    strike = frame["strike"].to_numpy()
+    ask = frame["ask"].to_numpy()
+    iv = frame["iv"].to_numpy()
+    is_call = (frame["type"] == "call").to_numpy()
+
+    expected_move = spot * iv * np.sqrt(time)
+    d2_strike = _d2(spot, strike, time, iv)
+    prob_itm = np.where(is_call, norm_cdf(d2_strike), norm_cdf(-d2_strike))
+
+    breakeven = np.where(is_call, strike + ask, np.maximum(strike - ask, 1e-9))
+    d2_breakeven = _d2(spot, breakeven, time, iv)
+    prob_profit = np.where(is_call, norm_cdf(d2_breakeven), norm_cdf(-d2_breakeven))
+
+    favourable_price = np.where(is_call, spot + expected_move, spot - expected_move)
+    payoff = np.where(is_call, favourable_price - strike, strike - favourable_price)
+    reward_risk = (np.maximum(payoff, 0.0) - ask) / ask
+
+    frame["expected_move"] = expected_move.round(2)
+    frame["prob_itm"] = (prob_itm * 100).round(1)
+    frame["prob_touch"] = (np.minimum(2 * prob_itm, 1.0) * 100).round(1)
+    frame["prob_profit"] = (prob_profit * 100).round(1)
+    frame["reward_risk"] = reward_risk.round(2)
+
+    return frame.sort_values(sort_by, ascending=False).head(top_n)[RANKING_COLUMNS].reset_index(drop=True)
+
+
+def get_chain_ranking(symbol, expiration_date, option_type=None, top_n=10, sort_by="prob_profit"):
+    """
+    Fetches the whole chain for an expiration (batched market data) and ranks it.
+
+    Returns:
+        pandas.DataFrame: The ranking, or None on error.
+    """
+    try:
+        spot = fetch_current_price(symbol)
+        if spot is None:
+            return None
+        chain = fetch_option_chain(symbol, expiration_date, option_type)
+        if not chain:
+            print(f"No options found for {symbol} expiring {expiration_date}.")
+            return None
+        return rank_chain(chain, spot, expiration_date, top_n=top_n, sort_by=sort_by)
+    except Exception as e:
+        print(f"Error ranking option chain for {symbol}: {e}")
+        return None
@@ -1,4 +1,4 @@
-import robin_stocks.robinhood as r
+from src.providers import get_expirations
 
 def get_expiration_date_for_month(symbol, month):
     """ 
@@ -11,12 +11,9 @@ def get_expiration_date_for_month(symbol, month):
              or an empty list if none are found or on error.
     """
     try:
-        # Fetch all expiration dates for the symbol
-        chains = r.options.get_chains(symbol)
-        expiration_dates = chains.get('expiration_dates', [])
-        
-        # Filter dates for the specified month (e.g., "2025-01")
-        month_dates = [date for date in expiration_dates if date.startswith(month)]
+        # Expirations come from the provider router (Robinhood's day-cached
+        # chain metadata first, failing over to yfinance or saved snapshots)
+        month_dates = [date for date in get_expirations(symbol, prefer="robinhood") if date.startswith(month)]
         if not month_dates:
             # Return an empty list if none match
             return []
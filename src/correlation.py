@@ -0,0 +1,239 @@
+import os
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import yfinance as yf
+
+from src import arrow_store
+from src.prefetch import PREFETCH_WATCHLIST
+from src.provider_gateway import call_provider
+
+# Configurable through environment variables (.env)
+CORRELATION_BENCHMARK = os.getenv("CORRELATION_BENCHMARK", "SPY").upper()
+CORRELATION_WATCHLIST = [
+    s.strip().upper() for s in os.getenv("CORRELATION_WATCHLIST", ",".join(PREFETCH_WATCHLIST)).split(",") if s.strip()
+]
+CORRELATION_WINDOW = int(os.getenv("CORRELATION_WINDOW", 60))  # trading days
+CORRELATION_PERIOD = os.getenv("CORRELATION_PERIOD", "1y")
+
+# Lookbacks (trading days) for relative strength against the benchmark
+RELATIVE_STRENGTH_LOOKBACKS = {"1m": 21, "3m": 63, "6m": 126}
+# A symbol needs this share of the window's returns to be part of the matrix
+MIN_COVERAGE = 0.8
+
+_matrix_cache = {}
+_lock = threading.Lock()
+
+
+def _closes_path(period):
+    return os.path.join(arrow_store.ARROW_DIR, "correlation", f"closes_{period}.arrow")
+
+
+def _download_closes(symbols, period):
+    data = call_provider(
+        "yfinance", yf.download, symbols, period=period, interval="1d",
+        auto_adjust=True, progress=False, threads=True, group_by="column",
+    )
+    if data is None or data.empty:
+        return pd.DataFrame()
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(symbols[0])
+    closes.index = pd.to_datetime(closes.index).tz_localize(None).normalize()
+    closes.index.name = "date"
+    return closes
+
+
+def load_closes(symbols, period=None, refresh=False):
+    """
+    Returns daily closes for many symbols. Closes are kept in an Arrow file
+    refreshed once a day; only symbols missing from it are downloaded, all in
+    one batched yfinance request.
+
+    Parameters:
+        symbols (list): Ticker symbols.
+        period (str): yfinance period, e.g. '1y' or '2y'.
+        refresh (bool): Ignore the saved closes.
+
+    Returns:
+        pandas.DataFrame: Closes indexed by date, one column per symbol.
+    """
+    period = period or CORRELATION_PERIOD
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    path = _closes_path(period)
+
+    stored = pd.DataFrame()
+    if not refresh and os.path.exists(path) and date.fromtimestamp(os.path.getmtime(path)) == date.today():
+        stored = arrow_store.table_to_frame(arrow_store.read_table(path)).set_index("date")
+
+    missing = [s for s in symbols if s not in stored.columns]
+    if missing:
+        try:
+            downloaded = _download_closes(missing, period)
+        except Exception as e:
+            print(f"Error downloading closes for {len(missing)} symbols: {e}")
+            downloaded = pd.DataFrame()
+        if not downloaded.empty:
+            stored = downloaded if stored.empty else stored.join(downloaded, how="outer")
+            frame = stored.reset_index()
+            arrow_store.write_table(pa.Table.from_pandas(frame, preserve_index=False), path)
+
+    available = [s for s in symbols if s in stored.columns]
+    return stored[available].sort_index()
+
+
+def log_returns(closes):
+    return np.log(closes).diff().iloc[1:]
+
+
+def correlation_matrix(returns):
+    """
+    Pearson correlation of all columns at once: standardize, then one matrix
+    product. Missing returns count as the mean (zero after standardizing).
+    """
+    values = returns.to_numpy(dtype=float)
+    standardized = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0, ddof=1)
+    standardized = np.nan_to_num(standardized)
+    matrix = standardized.T @ standardized / (len(values) - 1)
+    np.fill_diagonal(matrix, 1.0)
+    return pd.DataFrame(np.clip(matrix, -1.0, 1.0), index=returns.columns, columns=returns.columns)
+
+
+def beta_matrix(returns):
+    """
+    beta[i, j] = cov(r_i, r_j) / var(r_j): the beta of row symbol i against column symbol j.
+    """
+    values = returns.to_numpy(dtype=float)
+    centered = np.nan_to_num(values - np.nanmean(values, axis=0))
+    covariance = centered.T @ centered / (len(values) - 1)
+    return pd.DataFrame(covariance / np.diag(covariance)[None, :], index=returns.columns, columns=returns.columns)
+
+
+def relative_strength(closes, benchmark, lookbacks=None):
+    """
+    Return over each lookback relative to the benchmark: (1 + r) / (1 + r_benchmark) - 1, in %.
+    """
+    lookbacks = lookbacks or RELATIVE_STRENGTH_LOOKBACKS
+    last = closes.ffill().iloc[-1]
+    result = {}
+    for label, days in lookbacks.items():
+        if len(closes) <= days:
+            continue
+        growth = last / closes.ffill().iloc[-days - 1]
+        result[label] = ((growth / growth[benchmark] - 1) * 100).round(2)
+    return pd.DataFrame(result)
+
+
+def rolling_correlation(returns, benchmark, window=None):
+    """
+    Rolling correlation of every column with the benchmark (vectorized by pandas).
+    """
+    window = window or CORRELATION_WINDOW
+    return returns.rolling(window, min_periods=int(window * MIN_COVERAGE)).corr(returns[benchmark])
+
+
+def get_correlation_matrices(symbols=None, benchmark=None, window=None, period=None, refresh=False):
+    """
+    Builds correlation, beta and relative-strength matrices for a watchlist
+    over the last window trading days, cached per (symbols, benchmark, window, day).
+
+    Returns:
+        dict: {"correlation", "beta", "relative_strength", "rolling_correlation",
+               "benchmark", "window", "as_of"}, or None if no data is available.
+    """
+    benchmark = (benchmark or CORRELATION_BENCHMARK).upper()
+    window = window or CORRELATION_WINDOW
+    symbols = list(dict.fromkeys([benchmark] + [s.upper() for s in symbols or CORRELATION_WATCHLIST]))
+    key = (tuple(sorted(symbols)), benchmark, window, period or CORRELATION_PERIOD, date.today())
+
+    with _lock:
+        if not refresh and key in _matrix_cache:
+            return _matrix_cache[key]
+
+    closes = load_closes(symbols, period, refresh)
+    if closes.empty or benchmark not in closes:
+        print(f"No daily closes available for {benchmark}.")
+        return None
+
+    returns = log_returns(closes)
+    recent = returns.iloc[-window:]
+    recent = recent.loc[:, recent.notna().mean() >= MIN_COVERAGE]
+    if benchmark not in recent:
+        print(f"Not enough recent closes for {benchmark}.")
+        return None
+
+    result = {
+        "correlation": correlation_matrix(recent),
+        "beta": beta_matrix(recent),
+        "relative_strength": relative_strength(closes[recent.columns], benchmark),
+        "rolling_correlation": rolling_correlation(returns[recent.columns], benchmark, window),
+        "benchmark": benchmark,
+        "window": window,
+        "as_of": closes.index[-1].date().isoformat(),
+    }
+    with _lock:
+        _matrix_cache[key] = result
+    return result
+
+
+def correlation_summary(symbol, matrices, top_n=3):
+    """
+    Condenses the matrices into the values the AI summary needs for one symbol.
+
+    Returns:
+        dict: benchmark, window, beta, correlation, relative strength (lookbacks
+              without enough history are left out) and the most and least correlated
+              watchlist symbols (never overlapping), or None if the symbol is missing.
+    """
+    symbol = symbol.upper()
+    if not matrices or symbol not in matrices["correlation"]:
+        return None
+    benchmark = matrices["benchmark"]
+    peers = matrices["correlation"][symbol].drop([symbol, benchmark], errors="ignore").sort_values(ascending=False)
+    # With fewer than 2 * top_n peers the two lists split them instead of overlapping
+    most_count = min(top_n, (len(peers) + 1) // 2)
+    least_count = min(top_n, len(peers) - most_count)
+    relative_strength = matrices["relative_strength"].loc[symbol].dropna() if symbol in matrices["relative_strength"].index else {}
+    return {
+        "benchmark": benchmark,
+        "window": matrices["window"],
+        "as_of": matrices["as_of"],
+        "beta": round(float(matrices["beta"].loc[symbol, benchmark]), 2),
+        "correlation": round(float(matrices["correlation"].loc[symbol, benchmark]), 2),
+        "relative_strength": {label: float(value) for label, value in relative_strength.items()},
+        "most_correlated": {s: round(float(c), 2) for s, c in peers.iloc[:most_count].items()},
+        "least_correlated": {
+            s: round(float(c), 2) for s, c in peers.iloc[len(peers) - least_count:].iloc[::-1].items()
+        },
+    }
+
+
+def get_correlation_context(symbol, watchlist=None):
+    """
+    Correlation summary of symbol against the benchmark and the watchlist (symbol included).
+
+    Returns:
+        dict: See correlation_summary(), or None on error.
+    """
+    try:
+        return correlation_summary(symbol, get_correlation_matrices([symbol] + list(watchlist or CORRELATION_WATCHLIST)))
+    except Exception as e:
+        print(f"Error computing correlations for {symbol}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    symbols = [s.upper() for s in sys.argv[1:]] or CORRELATION_WATCHLIST
+    started = time.perf_counter()
+    matrices = get_correlation_matrices(symbols)
+    if matrices:
+        print(f"{len(matrices['correlation'])} x {len(matrices['correlation'])} matrices in "
+              f"{time.perf_counter() - started:.2f}s (as of {matrices['as_of']})")
+        print(matrices["correlation"].round(2))
+        print(matrices["relative_strength"])
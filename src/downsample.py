@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Points sent to the browser per chart, configurable through environment variables (.env)
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", 500))
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: picks threshold points that preserve the
+    visual shape of a line (peaks and troughs survive, flat stretches thin out).
+
+    Parameters:
+        x (array-like): Monotonic x values (numbers or datetimes).
+        y (array-like): y values.
+        threshold (int): Number of points to keep (the first and last are always kept).
+
+    Returns:
+        numpy.ndarray: Sorted indices of the kept points.
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype(np.int64)
+    x = x.astype(float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Buckets between the fixed first and last points; edges[-1] == n - 1
+    every = (n - 2) / (threshold - 2)
+    edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(np.int64)
+    counts = np.diff(edges)
+    bucket_x = np.add.reduceat(x, edges[:-1]) / counts
+    bucket_y = np.add.reduceat(y, edges[:-1]) / counts
+    # Each bucket is scored against the average of the next one (the last point for the final bucket)
+    next_x = np.append(bucket_x[1:], x[-1])
+    next_y = np.append(bucket_y[1:], y[-1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[selected], y[selected]
+        areas = np.abs((ax - next_x[bucket]) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y[bucket] - ay))
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def downsample_frame(frame, x_column, y_column, threshold=None):
+    """
+    Reduces a DataFrame to at most threshold rows with LTTB on (x_column, y_column).
+    Rows with a missing y value are dropped first.
+
+    Returns:
+        pandas.DataFrame: The kept rows, in order.
+    """
+    threshold = CHART_MAX_POINTS if threshold is None else threshold
+    frame = frame.dropna(subset=[y_column]).sort_values(x_column).reset_index(drop=True)
+    if len(frame) <= threshold:
+        return frame
+    return frame.iloc[lttb_indices(frame[x_column].to_numpy(), frame[y_column].to_numpy(), threshold)].reset_index(drop=True)
+
+
+def bars_to_series(bars):
+    """
+    Converts historical bars (fetch_historical_bars/fetch_historical_closing_prices
+    output) into a 'date'/'close_price' DataFrame.
+    """
+    frame = pd.DataFrame(bars)
+    if frame.empty:
+        return pd.DataFrame(columns=["date", "close_price"])
+    time_field = "begins_at" if "begins_at" in frame else "date"
+    return pd.DataFrame({
+        "date": pd.to_datetime(frame[time_field]),
+        "close_price": pd.to_numeric(frame["close_price"], errors="coerce"),
+    })
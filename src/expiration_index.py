@@ -0,0 +1,148 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+import robin_stocks.robinhood as r
+
+from src.provider_gateway import call_provider
+from src.shared_cache import shared_cached
+
+# symbol -> {"trading_day": date, "chain": dict, "index": dict}
+_chain_cache = {}
+_lock = threading.Lock()
+
+
+def build_expiration_index(expiration_dates, today=None):
+    """
+    Indexes expiration dates by month, ISO week and days to expiration.
+
+    Parameters:
+        expiration_dates (list): Expiration dates as 'YYYY-MM-DD' strings.
+        today (date): Reference date for days to expiration (defaults to today).
+
+    Returns:
+        dict: {"dates": sorted dates, "dte": days to expiration for each date,
+               "by_month": {"YYYY-MM": [...]}, "by_week": {"YYYY-Www": [...]}}
+    """
+    today = today or date.today()
+    dates = sorted(set(expiration_dates))
+    index = {"dates": dates, "dte": [], "by_month": {}, "by_week": {}}
+
+    for expiration in dates:
+        parsed = datetime.strptime(expiration, "%Y-%m-%d").date()
+        iso_year, iso_week, _ = parsed.isocalendar()
+        index["dte"].append((parsed - today).days)
+        index["by_month"].setdefault(expiration[:7], []).append(expiration)
+        index["by_week"].setdefault(f"{iso_year}-W{iso_week:02d}", []).append(expiration)
+
+    return index
+
+
+@shared_cached("expirations")
+def _fetch_chain(symbol, trading_day):
+    # trading_day is only part of the shared cache key, so other processes
+    # (e.g. the prefetch scheduler) share the raw chain for the day
+    return call_provider("robinhood", r.options.get_chains, symbol)
+
+
+def get_chain_metadata(symbol, refresh=False):
+    """
+    Returns the option chain metadata for a symbol, fetched at most once per trading day.
+
+    Parameters:
+        symbol (str): Stock ticker symbol.
+        refresh (bool): Force a new fetch.
+
+    Returns:
+        dict: {"chain": raw chain metadata, "index": build_expiration_index() result},
+              or None if the chain could not be fetched.
+    """
+    symbol = symbol.upper()
+    today = date.today()
+
+    with _lock:
+        cached = _chain_cache.get(symbol)
+        if cached and cached["trading_day"] == today and not refresh:
+            return cached
+
+    try:
+        fetch = _fetch_chain.uncached if refresh else _fetch_chain
+        chain = fetch(symbol, today.isoformat())
+    except Exception as e:
+        print(f"Error fetching option chain metadata for {symbol}: {e}")
+        return None
+    if not chain:
+        return None
+
+    entry = {
+        "trading_day": today,
+        "chain": chain,
+        "index": build_expiration_index(chain.get("expiration_dates", []), today),
+    }
+    with _lock:
+        _chain_cache[symbol] = entry
+    return entry
+
+
+def get_all_expirations(symbol):
+    """
+    Returns all listed expiration dates for a symbol, sorted.
+    """
+    metadata = get_chain_metadata(symbol)
+    return list(metadata["index"]["dates"]) if metadata else []
+
+
+def expirations_for_month(symbol, month):
+    """
+    Returns the expiration dates in a 'YYYY-MM' month.
+    """
+    metadata = get_chain_metadata(symbol)
+    return list(metadata["index"]["by_month"].get(month, [])) if metadata else []
+
+
+def expirations_for_months(symbol, months):
+    """
+    Returns the expiration dates in any of the given 'YYYY-MM' months, sorted.
+    """
+    metadata = get_chain_metadata(symbol)
+    if not metadata:
+        return []
+    by_month = metadata["index"]["by_month"]
+    return sorted(date for month in set(months) for date in by_month.get(month, []))
+
+
+def expirations_for_week(symbol, iso_week):
+    """
+    Returns the expiration dates in an ISO week, e.g. '2025-W03'.
+    """
+    metadata = get_chain_metadata(symbol)
+    return list(metadata["index"]["by_week"].get(iso_week, [])) if metadata else []
+
+
+def expirations_in_dte_range(symbol, min_dte=0, max_dte=None):
+    """
+    Returns the expiration dates between min_dte and max_dte days out (inclusive).
+
+    Parameters:
+        symbol (str): Stock ticker symbol.
+        min_dte (int): Minimum days to expiration.
+        max_dte (int): Maximum days to expiration, or None for no limit.
+
+    Returns:
+        list: Matching expiration dates, sorted.
+    """
+    metadata = get_chain_metadata(symbol)
+    if not metadata:
+        return []
+    index = metadata["index"]
+    start = bisect_left(index["dte"], min_dte)
+    end = len(index["dte"]) if max_dte is None else bisect_right(index["dte"], max_dte)
+    return index["dates"][start:end]
+
+
+def clear_chain_cache(symbol=None):
+    with _lock:
+        if symbol is None:
+            _chain_cache.clear()
+        else:
+            _chain_cache.pop(symbol.upper(), None)
@@ -1,34 +1,193 @@
 import robin_stocks.robinhood as r
 import streamlit as st
+from robin_stocks.robinhood.helper import request_get
+from robin_stocks.robinhood.urls import marketdata_options_url
 
 from src.fetch_price import fetch_current_price
+from src.liquidity import liquidity_warnings
+from src.providers import ProviderError, get_chain
+from src.shared_cache import shared_cached
+from src.single_flight import coalesced_call
 
-def fetch_and_evaluate_greeks(symbol, expiration_date, option_type="call"):
+# Instruments per market data request (keeps the query string a sane length)
+MARKET_DATA_BATCH_SIZE = 25
+
+
+def fetch_option_market_data_batch(instrument_urls):
     """
-    Fetches options data by symbol and expiration date, evaluates Greeks,
-    and calculates intrinsic and extrinsic values along with theta decay.
-    
-    Instead of printing, this function uses st.write() to display output
-    in the Streamlit UI.
+    Fetches market data (marks, Greeks, IV, OI, volume) for many option
+    instruments with one request per MARKET_DATA_BATCH_SIZE instruments,
+    instead of one request per option.
+
+    Parameters:
+        instrument_urls (list): Option instrument URLs (the 'url' of a tradable option).
+
+    Returns:
+        dict: instrument URL -> market data dict.
     """
-    try:
-        st.write(f"**Fetching {option_type} options for {symbol} expiring on {expiration_date}...**")
-        options = r.options.find_options_by_expiration(
-            inputSymbols=symbol,
-            expirationDate=expiration_date,
-            optionType=option_type
+    market_data = {}
+    urls = list(dict.fromkeys(url for url in instrument_urls if url))
+    for start in range(0, len(urls), MARKET_DATA_BATCH_SIZE):
+        batch = urls[start:start + MARKET_DATA_BATCH_SIZE]
+        results = coalesced_call(
+            "robinhood",
+            request_get,
+            marketdata_options_url(),
+            "results",
+            {"instruments": ",".join(batch)},
         )
+        for entry in results or []:
+            if entry and entry.get("instrument"):
+                market_data[entry["instrument"]] = entry
+    return market_data
+
+
+def _merge_market_data(options):
+    market_data = fetch_option_market_data_batch([opt.get('url') for opt in options])
+    for option in options:
+        option.update(market_data.get(option.get('url'), {}))
+    return options
+
+
+def _find_tradable_options(symbol, expiration_date, option_type):
+    options = coalesced_call(
+        "robinhood",
+        r.options.find_tradable_options,
+        symbol,
+        expirationDate=expiration_date,
+        optionType=option_type
+    )
+    return sorted(
+        (opt for opt in options or [] if opt and opt.get('strike_price')),
+        key=lambda x: float(x['strike_price'])
+    )
+
+
+def _near_strikes(options, near_price, strikes_each_side):
+    strikes = sorted({float(opt['strike_price']) for opt in options})
+    below = [s for s in strikes if s <= near_price][-strikes_each_side:]
+    above = [s for s in strikes if s > near_price][:strikes_each_side]
+    keep = set(below + above)
+    return [opt for opt in options if float(opt['strike_price']) in keep]
+
+
+@shared_cached("chain")
+def _fetch_chain_side(symbol, expiration_date, option_type):
+    # One shared cache entry per (symbol, expiration, 'call'/'put'); every
+    # variant of fetch_option_chain is assembled from these
+    return _merge_market_data(_find_tradable_options(symbol, expiration_date, option_type))
+
+
+def fetch_option_chain(symbol, expiration_date, option_type=None, near_price=None, strikes_each_side=None,
+                       refresh=False):
+    """
+    Fetches the tradable options for one expiration and merges in their market
+    data using batched requests.
+
+    Parameters:
+        symbol (str): The stock ticker symbol.
+        expiration_date (str): Expiration date 'YYYY-MM-DD'.
+        option_type (str): 'call', 'put' or None for both.
+        near_price (float): If given with strikes_each_side, only the strikes closest
+                            to this price are returned (and, unless the chain is
+                            already cached, only their market data is fetched).
+        strikes_each_side (int): Number of strikes to keep below and above near_price.
+        refresh (bool): Fetch and re-cache even if a cached chain exists.
+
+    Returns:
+        list: Option dicts (instrument fields plus market data) sorted by strike.
+    """
+    symbol = symbol.upper()
+    sides = [option_type] if option_type else ["call", "put"]
 
+    if near_price is not None and strikes_each_side:
+        cached = [_fetch_chain_side.peek(symbol, expiration_date, side) for side in sides]
+        if all(chain is not None for chain in cached):
+            options = sorted((opt for chain in cached for opt in chain), key=lambda x: float(x['strike_price']))
+            return _near_strikes(options, near_price, strikes_each_side)
+        options = _find_tradable_options(symbol, expiration_date, option_type)
+        return _merge_market_data(_near_strikes(options, near_price, strikes_each_side))
+
+    fetch = _fetch_chain_side.refresh if refresh else _fetch_chain_side
+    chains = [fetch(symbol, expiration_date, side) or [] for side in sides]
+    return sorted((opt for chain in chains for opt in chain), key=lambda x: float(x['strike_price']))
+
+
+def evaluate_option_values(option_type, current_price, strike_price, premium, theta):
+    """
+    Calculates intrinsic/extrinsic value and theta decay for one option.
+
+    Parameters:
+        option_type (str): 'call' or 'put'.
+        current_price (float): Price of the underlying.
+        strike_price (float): Strike of the option.
+        premium (float or 'N/A'): Option price per share.
+        theta (float): Theta per share per day.
+
+    Returns:
+        dict: intrinsic_value, extrinsic_value, theta_decay_percentage and the
+              per-contract dollar amounts ('N/A' when the premium is unknown).
+    """
+    if premium == 'N/A':
+        return {
+            "intrinsic_value": 'N/A',
+            "extrinsic_value": 'N/A',
+            "theta_decay_percentage": 'N/A',
+            "intrinsic_value_dollar": 'N/A',
+            "extrinsic_value_dollar": 'N/A',
+        }
+
+    # Calculate intrinsic/extrinsic
+    if option_type == "call":
+        intrinsic_value = max(0, (current_price - strike_price))
+    else:  # put
+        intrinsic_value = max(0, (strike_price - current_price))
+
+    extrinsic_value = premium - intrinsic_value
+    theta_decay_percentage = (abs(theta) / premium) * 100 if premium > 0 else 0
+    # Dollar amounts (per contract = 100 shares)
+    intrinsic_value_dollar = intrinsic_value * 100
+    extrinsic_value_dollar = (premium * 100) - intrinsic_value_dollar
+
+    return {
+        "intrinsic_value": intrinsic_value,
+        "extrinsic_value": extrinsic_value,
+        "theta_decay_percentage": theta_decay_percentage,
+        "intrinsic_value_dollar": intrinsic_value_dollar,
+        "extrinsic_value_dollar": extrinsic_value_dollar,
+    }
+
+
+def select_and_evaluate_options(symbol, expiration_date, option_type="call"):
+    """
+    Picks the closest in-the-money and out-of-the-money contracts and evaluates
+    them. Does no rendering, so it is safe to call from worker threads (e.g. the
+    API server); fetch_and_evaluate_greeks() renders its result in Streamlit.
+
+    Parameters:
+        symbol (str): The stock ticker symbol.
+        expiration_date (str): Expiration date 'YYYY-MM-DD'.
+        option_type (str): 'call' or 'put'.
+
+    Returns:
+        dict: {"current_price": float, "selected_options": [option dicts],
+               "evaluations": [{"strike_price", "delta", "gamma", "theta", "vega",
+               "premium", "values", "warnings"}, ...]}, or {"error": str}.
+    """
+    try:
+        # Chains come from the provider router; the Robinhood chain already
+        # carries each contract's market data (Greeks, mark, id), so no per-strike
+        # lookups. Only Robinhood has Greeks and ids, so it is asked first.
+        try:
+            options = get_chain(symbol, expiration_date, option_type, prefer="robinhood")
+        except ProviderError as e:
+            return {"error": f"**Error fetching options data**: {e}"}
         if not options:
-            st.write("No options data found for the given parameters.")
-            return
+            return {"error": "No options data found for the given parameters."}
 
         current_price = fetch_current_price(symbol)
         if current_price is None:
-            st.write("Unable to fetch the current price. Exiting.")
-            return
-
-        st.write(f"Current Price of {symbol}: **{current_price}**")
+            return {"error": "Unable to fetch the current price. Exiting."}
 
         # Sort options by strike price
         options = sorted(options, key=lambda x: float(x['strike_price']))
@@ -40,70 +199,86 @@ def fetch_and_evaluate_greeks(symbol, expiration_date, option_type="call"):
         # Select closest options
         first_itm_option = itm_options[-1] if itm_options else None
         first_otm_option = otm_options[0] if otm_options else None
-        
+
         selected_options = []
         if first_itm_option:
             selected_options.append(first_itm_option)
         if first_otm_option:
             selected_options.append(first_otm_option)
 
-        st.write(f"**Selected {option_type.capitalize()} Options for {symbol}** (Expiration: {expiration_date}):")
-        st.write("=" * 60)
-
         # Analyze Greeks and calculate intrinsic/extrinsic values
+        evaluations = []
         for option in selected_options:
             strike_price = float(option.get('strike_price', 'N/A'))
-            market_data = r.options.get_option_market_data(
-                inputSymbols=symbol,
-                expirationDate=expiration_date,
-                strikePrice=strike_price,
-                optionType=option_type
-            )
-
-            if isinstance(market_data, list) and market_data:
-                # Some versions of get_option_market_data return [[{}]], so check
-                first_entry = market_data[0][0] if isinstance(market_data[0], list) and market_data[0] else {}
-                delta = first_entry.get('delta', 'N/A')
-                gamma = first_entry.get('gamma', 'N/A')
-                theta = float(first_entry.get('theta', 0))
-                vega = first_entry.get('vega', 'N/A')
-                premium = float(first_entry.get('adjusted_mark_price', 0))
+            if option.get('adjusted_mark_price') is not None:
+                delta = option.get('delta') or 'N/A'
+                gamma = option.get('gamma') or 'N/A'
+                theta = float(option.get('theta') or 0)
+                vega = option.get('vega') or 'N/A'
+                premium = float(option['adjusted_mark_price'])
             else:
                 delta = gamma = theta = vega = premium = 'N/A'
 
-            if premium == 'N/A':
-                intrinsic_value = 'N/A'
-                extrinsic_value = 'N/A'
-                theta_decay_percentage = 'N/A'
-                intrinsic_value_dollar = 'N/A'
-                extrinsic_value_dollar = 'N/A'
-            else:
-                # Calculate intrinsic/extrinsic
-                if option_type == "call":
-                    intrinsic_value = max(0, (current_price - strike_price))
-                else:  # put
-                    intrinsic_value = max(0, (strike_price - current_price))
-                
-                extrinsic_value = premium - intrinsic_value
-                theta_decay_percentage = (abs(theta) / premium) * 100 if premium > 0 else 0
-                # Dollar amounts (per contract = 100 shares)
-                intrinsic_value_dollar = intrinsic_value * 100
-                extrinsic_value_dollar = (premium * 100) - intrinsic_value_dollar
-
-            st.write(f"**Strike Price**: {strike_price}")
-            st.write(f"  - Delta: {delta}")
-            st.write(f"  - Gamma: {gamma}")
-            st.write(f"  - Theta: {theta}")
-            st.write(f"  - Vega: {vega}")
-            st.write(f"  - Premium: {premium}")
+            evaluations.append({
+                "strike_price": strike_price,
+                "delta": delta,
+                "gamma": gamma,
+                "theta": theta,
+                "vega": vega,
+                "premium": premium,
+                "values": evaluate_option_values(option_type, current_price, strike_price, premium, theta),
+                "warnings": liquidity_warnings(option, current_price),
+            })
+
+        return {"current_price": current_price, "selected_options": selected_options, "evaluations": evaluations}
+    except Exception as e:
+        return {"error": f"**Error fetching options data**: {e}"}
+
+
+def fetch_and_evaluate_greeks(symbol, expiration_date, option_type="call"):
+    """
+    Fetches options data by symbol and expiration date, evaluates Greeks,
+    and calculates intrinsic and extrinsic values along with theta decay.
+    
+    Instead of printing, this function uses st.write() to display output
+    in the Streamlit UI.
+    """
+    try:
+        st.write(f"**Fetching {option_type} options for {symbol} expiring on {expiration_date}...**")
+        result = select_and_evaluate_options(symbol, expiration_date, option_type)
+        if "error" in result:
+            st.write(result["error"])
+            return
+
+        current_price = result["current_price"]
+        st.write(f"Current Price of {symbol}: **{current_price}**")
+        st.write(f"**Selected {option_type.capitalize()} Options for {symbol}** (Expiration: {expiration_date}):")
+        st.write("=" * 60)
+
+        for evaluation in result["evaluations"]:
+            values = evaluation["values"]
+            intrinsic_value = values["intrinsic_value"]
+            extrinsic_value = values["extrinsic_value"]
+            theta_decay_percentage = values["theta_decay_percentage"]
+            intrinsic_value_dollar = values["intrinsic_value_dollar"]
+            extrinsic_value_dollar = values["extrinsic_value_dollar"]
+
+            st.write(f"**Strike Price**: {evaluation['strike_price']}")
+            st.write(f"  - Delta: {evaluation['delta']}")
+            st.write(f"  - Gamma: {evaluation['gamma']}")
+            st.write(f"  - Theta: {evaluation['theta']}")
+            st.write(f"  - Vega: {evaluation['vega']}")
+            st.write(f"  - Premium: {evaluation['premium']}")
             st.write(f"  - Intrinsic Value: {round(intrinsic_value, 2) if intrinsic_value != 'N/A' else 'N/A'}")
             st.write(f"  - Intrinsic Value (Dollar): ${round(intrinsic_value_dollar, 2) if intrinsic_value_dollar != 'N/A' else 'N/A'}")
             st.write(f"  - Extrinsic Value: {round(extrinsic_value, 2) if extrinsic_value != 'N/A' else 'N/A'}")
             st.write(f"  - Extrinsic Value (Dollar): ${round(extrinsic_value_dollar, 2) if extrinsic_value_dollar != 'N/A' else 'N/A'}")
             st.write(f"  - Theta Decay (%): {round(theta_decay_percentage, 2) if theta_decay_percentage != 'N/A' else 'N/A'}%")
+            for warning in evaluation["warnings"]:
+                st.write(f"  - :warning: {warning}")
             st.write("")
 
-        return selected_options
+        return result["selected_options"]
 
     except Exception as e:
         st.write(f"**Error fetching options data**: {e}")
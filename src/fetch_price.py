@@ -1,13 +1,14 @@
-import robin_stocks.robinhood as r
+from src.providers import get_quote
+from src.shared_cache import shared_cached
 
+@shared_cached("quote")
 def fetch_current_price(symbol):
     """
-    Fetches the current stock price for the given symbol.
+    Fetches the current stock price for the given symbol from the fastest
+    healthy provider (see src.providers).
     """
     try:
-        quote = r.stocks.get_stock_quote_by_symbol(symbol)
-        #print(f"DEBUG: Stock quote for {symbol}: {quote}")
-        return float(quote['last_trade_price'])
+        return float(get_quote(symbol))
     except Exception as e:
         print(f"Error fetching current price for {symbol}: {e}")
         return None
\ No newline at end of file
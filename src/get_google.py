@@ -2,6 +2,8 @@ import requests
 import os
 from dotenv import load_dotenv
 
+from src.provider_gateway import call_provider
+
 load_dotenv()
 
 api_key = os.getenv("GOOGLE_API_KEY")
@@ -29,8 +31,12 @@ def fetch_google_news(ticker, api_key, cx):
     }
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
+        def _search():
+            response = requests.get(url, params=params)
+            response.raise_for_status()
+            return response
+
+        response = call_provider("google", _search)
         results = response.json().get("items", [])
         
         # Parse and return relevant information
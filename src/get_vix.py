@@ -1,6 +1,10 @@
 import requests
 import yfinance as yf
 
+from src.provider_gateway import call_provider
+from src.shared_cache import shared_cached
+
+@shared_cached("vix")
 def get_vix_value():
     """
     Fetches the current VIX index value using yfinance.
@@ -10,10 +14,10 @@ def get_vix_value():
     """
     try:
         vix = yf.Ticker("^VIX")
-        vix_data = vix.history(period="1d")
+        vix_data = call_provider("yfinance", vix.history, period="1d")
         current_vix = vix_data['Close'].iloc[-1]
         print(f"\nCurrent VIX Value: {current_vix:.2f}")
-        return current_vix
+        return float(current_vix)
     except Exception as e:
         print(f"Error fetching VIX value: {e}")
         return None
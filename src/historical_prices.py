@@ -1,9 +1,14 @@
 import robin_stocks.robinhood as r
-import streamlit as st
 
-def fetch_historical_closing_prices(symbol, span="3month"):
+from src.shared_cache import shared_cached
+from src.single_flight import coalesced_call
+
+@shared_cached("historicals")
+def load_historical_closing_prices(symbol, span="3month"):
     """
-    Fetches historical daily closing prices for the given stock ticker.
+    Fetches historical daily closing prices for the given stock ticker. Does
+    no rendering, so it is safe to call from worker threads; failures come back
+    as {"error": ...} (not cached) for the caller to display.
 
     Parameters:
         symbol (str): The stock ticker symbol (e.g., "AAPL").
@@ -11,19 +16,21 @@ def fetch_historical_closing_prices(symbol, span="3month"):
                     'day', 'week', 'month', '3month', 'year', '5year', 'all'.
 
     Returns:
-        list: A list of dictionaries with 'date' and 'close_price'.
+        dict: {"data": list of dictionaries with 'date' and 'close_price'},
+              or {"error": str}.
     """
     try:
         # Fetch historical data
-        historicals = r.stocks.get_stock_historicals(
+        historicals = coalesced_call(
+            "robinhood",
+            r.stocks.get_stock_historicals,
             symbol,
             span=span,            # Control the span (e.g., '3month')
             bounds='regular'      # Fetch regular trading session data
         )
 
         if not historicals:
-            st.write(f"No historical data found for {symbol}.")
-            return []
+            return {"error": f"No historical data found for {symbol}."}
 
         # Extract and format data
         data = [
@@ -31,13 +38,61 @@ def fetch_historical_closing_prices(symbol, span="3month"):
             for item in historicals
         ]
 
-        # Optionally, you could log the raw data in the UI:
-        # st.write(f"DEBUG: Historical closing prices for {symbol}: {data}")
+        return {"data": data}
 
-        return data
+    except Exception as e:
+        return {"error": f"Error fetching historical closing prices for {symbol}: {e}"}
+
+
+def fetch_historical_closing_prices(symbol, span="3month"):
+    """
+    Fetches historical daily closing prices for the given stock ticker.
+
+    Parameters:
+        symbol (str): The stock ticker symbol (e.g., "AAPL").
+        span (str): The time span for historical data. Options:
+                    'day', 'week', 'month', '3month', 'year', '5year', 'all'.
 
+    Returns:
+        list: A list of dictionaries with 'date' and 'close_price'.
+    """
+    result = load_historical_closing_prices(symbol, span)
+    if "error" in result:
+        print(result["error"])
+        return []
+    return result["data"]
+
+
+def fetch_historical_bars(symbol, interval="5minute", span="week", bounds="regular"):
+    """
+    Fetches full OHLCV bars for the given stock ticker.
+
+    Parameters:
+        symbol (str): The stock ticker symbol (e.g., "AAPL").
+        interval (str): '5minute', '10minute', 'hour', 'day' or 'week'.
+        span (str): 'day', 'week', 'month', '3month', 'year', '5year' or 'all'
+                    (Robinhood only serves 5/10-minute bars for 'day' and 'week').
+        bounds (str): 'regular', 'extended' or 'trading'.
+
+    Returns:
+        list: Dictionaries with 'begins_at', 'open_price', 'high_price',
+              'low_price', 'close_price' and 'volume'.
+    """
+    try:
+        historicals = coalesced_call(
+            "robinhood",
+            r.stocks.get_stock_historicals,
+            symbol,
+            interval=interval,
+            span=span,
+            bounds=bounds
+        )
+        return [
+            {field: item.get(field) for field in ("begins_at", "open_price", "high_price", "low_price", "close_price", "volume")}
+            for item in historicals or [] if item
+        ]
     except Exception as e:
-        st.write(f"Error fetching historical closing prices for {symbol}: {e}")
+        print(f"Error fetching {interval} bars for {symbol}: {e}")
         return []
 
 '''
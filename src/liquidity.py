@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Default screening thresholds, configurable through environment variables (.env)
+LIQUIDITY_THRESHOLDS = {
+    "max_spread_pct": float(os.getenv("SCREEN_MAX_SPREAD_PCT", 10)),
+    "min_open_interest": float(os.getenv("SCREEN_MIN_OPEN_INTEREST", 100)),
+    "min_volume": float(os.getenv("SCREEN_MIN_VOLUME", 10)),
+    "max_theta_decay_pct": float(os.getenv("SCREEN_MAX_THETA_DECAY_PCT", 5)),
+    "min_extrinsic": float(os.getenv("SCREEN_MIN_EXTRINSIC", 0.05)),
+}
+
+
+def add_liquidity_metrics(frame, spot):
+    """
+    Adds mid, spread_pct, intrinsic, extrinsic and theta_decay_pct columns.
+
+    Parameters:
+        frame (pandas.DataFrame): Columns 'type', 'strike', 'bid', 'ask', 'mark' and 'theta'.
+        spot (float): Current underlying price.
+
+    Returns:
+        pandas.DataFrame: A copy of frame with the metric columns.
+    """
+    frame = frame.copy()
+    bid = frame["bid"].to_numpy(dtype=float)
+    ask = frame["ask"].to_numpy(dtype=float)
+    mark = frame["mark"].to_numpy(dtype=float)
+    mark = np.where(np.isnan(mark), (bid + ask) / 2, mark)
+    strike = frame["strike"].to_numpy(dtype=float)
+    is_call = (frame["type"] == "call").to_numpy()
+
+    mid = (bid + ask) / 2
+    intrinsic = np.where(is_call, np.maximum(spot - strike, 0.0), np.maximum(strike - spot, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["spread_pct"] = np.where(mid > 0, (ask - bid) / mid * 100, np.inf).round(2)
+        frame["theta_decay_pct"] = np.where(
+            mark > 0, np.abs(frame["theta"].to_numpy(dtype=float)) / mark * 100, np.inf
+        ).round(2)
+    frame["mid"] = mid.round(4)
+    frame["intrinsic"] = intrinsic.round(4)
+    frame["extrinsic"] = (mark - intrinsic).round(4)
+    return frame
+
+
+def liquidity_mask(frame, thresholds=None):
+    """
+    Boolean mask of rows passing every threshold (rows need add_liquidity_metrics()).
+    Missing open interest or volume counts as zero.
+    """
+    limits = dict(LIQUIDITY_THRESHOLDS, **(thresholds or {}))
+    return (
+        (frame["spread_pct"] <= limits["max_spread_pct"])
+        & (frame["open_interest"].fillna(0) >= limits["min_open_interest"])
+        & (frame["volume"].fillna(0) >= limits["min_volume"])
+        & (frame["theta_decay_pct"] <= limits["max_theta_decay_pct"])
+        & (frame["extrinsic"] >= limits["min_extrinsic"])
+    )
+
+
+def liquidity_warnings(option, spot, thresholds=None):
+    """
+    Lists the liquidity problems of a single option dict (Robinhood fields).
+
+    Returns:
+        list: Human-readable warnings, empty if the contract passes every threshold.
+    """
+    limits = dict(LIQUIDITY_THRESHOLDS, **(thresholds or {}))
+
+    def number(field):
+        try:
+            return float(option.get(field))
+        except (TypeError, ValueError):
+            return np.nan
+
+    row = pd.DataFrame([{
+        "type": option.get("type"),
+        "strike": number("strike_price"),
+        "bid": number("bid_price"),
+        "ask": number("ask_price"),
+        "mark": number("adjusted_mark_price"),
+        "theta": number("theta"),
+        "open_interest": number("open_interest"),
+        "volume": number("volume"),
+    }])
+    metrics = add_liquidity_metrics(row, spot).iloc[0]
+
+    warnings = []
+    if not metrics["spread_pct"] <= limits["max_spread_pct"]:
+        warnings.append(f"Wide bid/ask spread ({metrics['spread_pct']}% of mid)")
+    if not np.nan_to_num(metrics["open_interest"]) >= limits["min_open_interest"]:
+        warnings.append(f"Low open interest ({np.nan_to_num(metrics['open_interest']):.0f})")
+    if not np.nan_to_num(metrics["volume"]) >= limits["min_volume"]:
+        warnings.append(f"Low volume ({np.nan_to_num(metrics['volume']):.0f})")
+    return warnings
@@ -0,0 +1,157 @@
+import os
+import re
+
+from src.shared_cache import shared_cached
+
+# Articles scored below this confidence are escalated to the LLM
+LOCAL_SENTIMENT_CONFIDENCE = float(os.getenv("LOCAL_SENTIMENT_CONFIDENCE", 0.6))
+
+# Small finance lexicon (in the spirit of Loughran-McDonald). Phrases are
+# matched before single words so "beats estimates" is not counted twice.
+POSITIVE_PHRASES = {
+    "beats estimates": 2.0, "beat estimates": 2.0, "beats expectations": 2.0,
+    "tops estimates": 2.0, "raises guidance": 2.0, "raised guidance": 2.0,
+    "record revenue": 2.0, "price target raised": 1.5, "all-time high": 1.5,
+    "record high": 1.5, "share buyback": 1.0, "dividend increase": 1.5,
+}
+NEGATIVE_PHRASES = {
+    "misses estimates": 2.0, "missed estimates": 2.0, "misses expectations": 2.0,
+    "cuts guidance": 2.0, "lowers guidance": 2.0, "lowered guidance": 2.0,
+    "price target cut": 1.5, "profit warning": 2.0, "52-week low": 1.5,
+    "going concern": 2.0, "class action": 1.5,
+}
+POSITIVE_WORDS = {
+    "beat": 1.0, "beats": 1.0, "jump": 1.0, "jumps": 1.0, "surge": 1.5, "surges": 1.5,
+    "soar": 1.5, "soars": 1.5, "rally": 1.0, "rallies": 1.0, "gain": 0.5, "gains": 0.5,
+    "rise": 0.5, "rises": 0.5, "climb": 0.5, "climbs": 0.5, "upgrade": 1.5, "upgraded": 1.5,
+    "outperform": 1.0, "bullish": 1.0, "strong": 0.5, "growth": 0.5, "profit": 0.5,
+    "record": 0.5, "buy": 0.5, "approval": 1.0, "approved": 1.0, "wins": 1.0, "boost": 1.0,
+}
+NEGATIVE_WORDS = {
+    "miss": 1.0, "misses": 1.0, "fall": 0.5, "falls": 0.5, "drop": 1.0, "drops": 1.0,
+    "plunge": 1.5, "plunges": 1.5, "tumble": 1.5, "tumbles": 1.5, "slump": 1.5, "sink": 1.0,
+    "sinks": 1.0, "decline": 0.5, "declines": 0.5, "downgrade": 1.5, "downgraded": 1.5,
+    "underperform": 1.0, "bearish": 1.0, "weak": 0.5, "loss": 1.0, "losses": 1.0,
+    "lawsuit": 1.0, "probe": 1.0, "investigation": 1.0, "recall": 1.0, "layoffs": 1.0,
+    "bankruptcy": 2.0, "fraud": 2.0, "sell": 0.5, "warning": 1.0, "halted": 1.0,
+}
+NEGATIONS = {
+    "not", "no", "never", "fails", "failed", "without",
+    "didn't", "doesn't", "don't", "isn't", "wasn't", "won't", "hasn't", "can't",
+}
+# A negation flips the sentiment words among the next NEGATION_WINDOW words
+# ("did not really beat"), but never across clause punctuation
+NEGATION_WINDOW = 3
+
+WORD_PATTERN = re.compile(r"[a-z0-9\-']+|[.,;:!?]")
+CLAUSE_PUNCTUATION = {".", ",", ";", ":", "!", "?"}
+
+
+def score_sentiment(text):
+    """
+    Scores text against the finance lexicon.
+
+    Parameters:
+        text (str): Headline and/or snippet.
+
+    Returns:
+        dict: {"label": "positive" | "neutral" | "negative", "score": float, "confidence": float}
+    """
+    text = text.lower()
+    positive = 0.0
+    negative = 0.0
+
+    # Phrases become single tokens so the negation window applies to them as
+    # well ("did not beat estimates"), without their words also counting
+    positive_weights = dict(POSITIVE_WORDS)
+    negative_weights = dict(NEGATIVE_WORDS)
+    for prefix, phrases, weights in (("positive", POSITIVE_PHRASES, positive_weights),
+                                     ("negative", NEGATIVE_PHRASES, negative_weights)):
+        for i, (phrase, weight) in enumerate(phrases.items()):
+            if phrase in text:
+                token = f"{prefix}-phrase-{i}"
+                weights[token] = weight
+                text = text.replace(phrase, f" {token} ")
+
+    negation_left = 0
+    for word in WORD_PATTERN.findall(text.replace("\u2019", "'")):
+        if word in CLAUSE_PUNCTUATION:
+            negation_left = 0
+            continue
+        if word in NEGATIONS:
+            negation_left = NEGATION_WINDOW
+            continue
+        negated = negation_left > 0
+        negation_left = max(0, negation_left - 1)
+        if word in positive_weights:
+            if negated:
+                negative += positive_weights[word]
+            else:
+                positive += positive_weights[word]
+        elif word in negative_weights:
+            if negated:
+                positive += negative_weights[word]
+            else:
+                negative += negative_weights[word]
+
+    total = positive + negative
+    net = positive - negative
+    if total == 0:
+        return {"label": "neutral", "score": 0.0, "confidence": 0.0}
+
+    # Agreement between signals, damped when there is little evidence
+    confidence = (abs(net) / total) * min(1.0, total / 2.0)
+    if net > 0:
+        label = "positive"
+    elif net < 0:
+        label = "negative"
+    else:
+        label = "neutral"
+
+    return {"label": label, "score": round(net, 2), "confidence": round(confidence, 2)}
+
+
+def analyze_sentiment_tiered(articles, confidence_threshold=None, escalate=True):
+    """
+    Classifies article sentiment locally and only sends low-confidence articles
+    to the LLM (analyze_sentiment_google_results). Without an OpenAI key every
+    article keeps its local label.
+
+    Parameters:
+        articles (list): Articles with 'title' and 'snippet'.
+        confidence_threshold (float): Minimum local confidence to skip the LLM.
+                                      Defaults to LOCAL_SENTIMENT_CONFIDENCE.
+        escalate (bool): Set to False to never call the LLM.
+
+    Returns:
+        list: The articles with 'sentiment' and 'sentiment_source' set.
+    """
+    if confidence_threshold is None:
+        confidence_threshold = LOCAL_SENTIMENT_CONFIDENCE
+
+    # Resolved before the cache lookup so labels computed without an OpenAI key
+    # are not served once one is configured (and vice versa)
+    can_escalate = escalate and bool(os.getenv("OPENAI_API_KEY"))
+    return _classify_articles(articles, confidence_threshold, can_escalate)
+
+
+@shared_cached("sentiment")
+def _classify_articles(articles, confidence_threshold, can_escalate):
+    to_escalate = []
+
+    for article in articles:
+        content = f"{article.get('title', '')}. {article.get('snippet', '')}"
+        result = score_sentiment(content)
+        article["sentiment"] = f"{result['label'].capitalize()} (local, confidence {result['confidence']:.2f})"
+        article["sentiment_source"] = "local"
+        if result["confidence"] < confidence_threshold and can_escalate:
+            to_escalate.append(article)
+
+    if to_escalate:
+        # Imported here so the local classifier works without the OpenAI client
+        from src.openai import analyze_sentiment_google_results
+
+        for article in analyze_sentiment_google_results(to_escalate):
+            article["sentiment_source"] = "llm"
+
+    return articles
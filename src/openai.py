@@ -2,6 +2,9 @@ from dotenv import load_dotenv
 import os
 import openai
 
+from src.ai_cache import get_cached_analysis, make_cache_key, store_analysis
+from src.single_flight import coalesce
+
 
 load_dotenv()
 
@@ -54,7 +57,46 @@ def analyze_sentiment_google_results(articles):
 
 
 # Example function to call OpenAI API
-def get_ai_analysis(summary_data):
+def get_ai_analysis(summary_data, on_token=None, use_cache=True):
+    """
+    Streams an AI analysis of the summary data to the terminal as it is generated.
+
+    Parameters:
+        summary_data (str): The formatted analysis summary sent to the model.
+        on_token (callable): Optional callback called with the text received so far
+                             after every chunk (e.g. to update a Streamlit placeholder).
+        use_cache (bool): Serve a cached answer for equivalent inputs if one is still fresh.
+                          Concurrent calls for equivalent inputs then share one request:
+                          the first streams it, the others get the full text when it is done.
+
+    Returns:
+        str: The full AI response, or None on error.
+    """
+    if not use_cache:
+        return _stream_ai_analysis(summary_data, on_token)
+
+    served = []
+
+    def lookup_or_generate():
+        # Runs once per key at a time, so the cache check and the paid request
+        # cannot interleave with another session's
+        served.append(True)
+        cached = get_cached_analysis(summary_data)
+        if cached:
+            print(f"\nAI Analysis (cached at {cached['created_at']:%H:%M:%S}):")
+            print(cached["text"])
+            if on_token:
+                on_token(cached["text"])
+            return cached["text"]
+        return _stream_ai_analysis(summary_data, on_token)
+
+    ai_response = coalesce(("openai.analysis", make_cache_key(summary_data)), lookup_or_generate)
+    if ai_response and on_token and not served:
+        on_token(ai_response)
+    return ai_response
+
+
+def _stream_ai_analysis(summary_data, on_token=None):
     try:
         # Construct the prompt
         messages = [
@@ -108,20 +150,32 @@ def get_ai_analysis(summary_data):
 
 
 
-        # Create the chat completion using the client
-        response = client.chat.completions.create(
+        # Create the chat completion using the client, streaming the reply
+        stream = client.chat.completions.create(
             model="gpt-4",  # Use "gpt-3.5-turbo" or other supported models if "gpt-4" is unavailable
             messages=messages,
             max_tokens=600,
-            temperature=0.7
+            temperature=0.7,
+            stream=True
         )
-        #print(response)
-        # Extract and return the assistant's reply
-        ai_response = response.choices[0].message.content
-
 
         print("\nAI Analysis:")
-        print(ai_response)
+        chunks = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content
+            if not token:
+                continue
+            chunks.append(token)
+            print(token, end="", flush=True)
+            if on_token:
+                on_token("".join(chunks))
+        print()
+
+        # Return the full reply for callers that need it
+        ai_response = "".join(chunks)
+        store_analysis(summary_data, ai_response)
         return ai_response
 
     except Exception as e:
@@ -1,23 +1,29 @@
-import streamlit as st
 from datetime import datetime, timedelta
-import yfinance as yf
 
-def get_put_call_ratio_60_days(symbol):
+from src.providers import get_chain, get_expirations
+from src.shared_cache import shared_cached
+
+
+@shared_cached("pcr")
+def calculate_put_call_ratio_60_days(symbol):
     """
-    Calculates the aggregated put/call ratio for a given ticker over the next 60 days using yfinance.
+    Calculates the aggregated put/call ratio for a given ticker over the next 60 days.
+    Chains come from the provider router: yfinance first (one request per
+    expiration), failing over to Robinhood or saved snapshots. Does no
+    rendering, so it is safe to call from worker threads; failures come back as
+    {"error": ...} (not cached) for the caller to display.
 
     Parameters:
         symbol (str): The stock ticker symbol (e.g., "AAPL").
 
     Returns:
-        float: The aggregated put/call ratio over the next 60 days, or None if it cannot be calculated.
+        dict: {"put_call_ratio": float, "total_call_volume": float,
+               "total_put_volume": float, "skipped_expirations": list of str},
+              or {"error": str}.
     """
     try:
-        # Fetch the ticker object
-        ticker = yf.Ticker(symbol)
-
         # Get all expiration dates
-        expiration_dates = ticker.options
+        expiration_dates = get_expirations(symbol, prefer="yfinance")
 
         # Filter expiration dates to include only those within the next 60 days
         today = datetime.now()
@@ -27,45 +33,62 @@ def get_put_call_ratio_60_days(symbol):
         ]
 
         if not filtered_expiration_dates:
-            st.write("No expiration dates within the next 60 days.")
-            return None
+            return {"error": "No expiration dates within the next 60 days."}
 
         # Initialize totals
         total_call_volume = 0
         total_put_volume = 0
+        skipped_expirations = []
 
         # Loop through filtered expiration dates and calculate volumes
         for expiration_date in filtered_expiration_dates:
             try:
                 # Fetch the options chain for each expiration date
-                options_chain = ticker.option_chain(expiration_date)
+                chain = get_chain(symbol, expiration_date, prefer="yfinance")
 
                 # Sum the volume for calls and puts
-                calls = options_chain.calls
-                puts = options_chain.puts
-                total_call_volume += calls['volume'].fillna(0).sum()
-                total_put_volume += puts['volume'].fillna(0).sum()
+                for option in chain:
+                    volume = float(option.get('volume') or 0)
+                    if option.get('type') == 'call':
+                        total_call_volume += volume
+                    else:
+                        total_put_volume += volume
 
             except Exception as e:
-                st.write(f"Error fetching options chain for {expiration_date}: {e}")
+                print(f"Error fetching options chain for {expiration_date}: {e}")
+                skipped_expirations.append(expiration_date)
                 continue
 
-        # Debug / status messages
-        st.write(f"Total Call Volume (60 days): {total_call_volume}")
-        st.write(f"Total Put Volume (60 days): {total_put_volume}")
-
         # Calculate the Put/Call Ratio
         if total_call_volume == 0:
-            st.write("Call volume is zero. Cannot calculate Put/Call Ratio.")
-            return None
+            return {"error": "Call volume is zero. Cannot calculate Put/Call Ratio."}
 
-        put_call_ratio = total_put_volume / total_call_volume
-        st.write(f"Aggregated Put/Call Ratio for {symbol} over the next 60 days: {put_call_ratio:.2f}")
-        return put_call_ratio
+        return {
+            "put_call_ratio": float(total_put_volume / total_call_volume),
+            "total_call_volume": total_call_volume,
+            "total_put_volume": total_put_volume,
+            "skipped_expirations": skipped_expirations,
+        }
 
     except Exception as e:
-        st.write(f"Error calculating aggregated put/call ratio for {symbol}: {e}")
+        return {"error": f"Error calculating aggregated put/call ratio for {symbol}: {e}"}
+
+
+def get_put_call_ratio_60_days(symbol):
+    """
+    Calculates the aggregated put/call ratio for a given ticker over the next 60 days.
+
+    Parameters:
+        symbol (str): The stock ticker symbol (e.g., "AAPL").
+
+    Returns:
+        float: The aggregated put/call ratio over the next 60 days, or None if it cannot be calculated.
+    """
+    result = calculate_put_call_ratio_60_days(symbol)
+    if "error" in result:
+        print(result["error"])
         return None
+    return result["put_call_ratio"]
 
 '''
 from datetime import datetime, timedelta
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+import robin_stocks.robinhood as r
+
+from src.fetch_greeks import fetch_option_market_data_batch
+from src.provider_gateway import call_provider
+
+GREEKS = ["delta", "gamma", "theta", "vega"]
+MARKET_FIELDS = ["mark"] + GREEKS
+
+
+def load_option_positions():
+    """
+    Loads the open option positions of the logged-in Robinhood account.
+
+    Returns:
+        pandas.DataFrame: One row per position indexed by instrument URL, with
+        'symbol', 'quantity' and 'exposure' (signed number of underlying shares
+        per unit of the option price, i.e. quantity * multiplier * +1/-1).
+    """
+    try:
+        positions = call_provider("robinhood", r.options.get_open_option_positions) or []
+    except Exception as e:
+        print(f"Error loading option positions: {e}")
+        positions = []
+
+    rows = []
+    for position in positions:
+        if not position or not position.get("option"):
+            continue
+        quantity = float(position.get("quantity") or 0)
+        if quantity == 0:
+            continue
+        sign = -1.0 if position.get("type") == "short" else 1.0
+        multiplier = float(position.get("trade_value_multiplier") or 100)
+        rows.append({
+            "instrument": position["option"],
+            "symbol": position.get("chain_symbol"),
+            "quantity": quantity * sign,
+            "exposure": quantity * sign * multiplier,
+        })
+
+    return pd.DataFrame(rows, columns=["instrument", "symbol", "quantity", "exposure"]).set_index("instrument")
+
+
+def fetch_position_market_data(instruments):
+    """
+    Fetches marks and Greeks for many option instruments in batched requests.
+
+    Returns:
+        pandas.DataFrame: Indexed by instrument URL with MARKET_FIELDS as float columns.
+    """
+    market_data = fetch_option_market_data_batch(list(instruments))
+    frame = pd.DataFrame.from_dict(
+        {
+            url: {
+                "mark": entry.get("adjusted_mark_price"),
+                "delta": entry.get("delta"),
+                "gamma": entry.get("gamma"),
+                "theta": entry.get("theta"),
+                "vega": entry.get("vega"),
+            }
+            for url, entry in market_data.items()
+        },
+        orient="index",
+        columns=MARKET_FIELDS,
+    )
+    return frame.apply(pd.to_numeric, errors="coerce").reindex(list(instruments))
+
+
+def position_greeks(positions, market):
+    """
+    Net Greeks per position: each Greek times the signed share exposure.
+    Missing market data counts as zero.
+    """
+    exposure = positions["exposure"].to_numpy()[:, None]
+    values = market.reindex(positions.index)[GREEKS].fillna(0.0).to_numpy()
+    return pd.DataFrame(values * exposure, index=positions.index, columns=GREEKS)
+
+
+def new_portfolio_state():
+    """
+    Returns an empty state for refresh_portfolio().
+    """
+    return {"positions": None, "market": None, "position_greeks": None, "by_underlying": None, "total": None}
+
+
+def refresh_portfolio(state, reload_positions=False):
+    """
+    Refreshes the portfolio Greeks. Positions are loaded on the first call (or
+    when reload_positions is True). Market data for all positions is fetched in
+    one batched pass, and only positions whose mark or Greeks changed are
+    recomputed; the per-underlying totals are adjusted by their difference.
+
+    Parameters:
+        state (dict): State from new_portfolio_state() or a previous call (updated in place).
+        reload_positions (bool): Re-pull the open positions from Robinhood.
+
+    Returns:
+        int: Number of positions whose values changed on this refresh.
+    """
+    if state["positions"] is None or reload_positions:
+        state["positions"] = load_option_positions()
+        state["market"] = None
+
+    positions = state["positions"]
+    if positions.empty:
+        state["position_greeks"] = pd.DataFrame(columns=GREEKS)
+        state["by_underlying"] = pd.DataFrame(columns=GREEKS)
+        state["total"] = pd.Series(0.0, index=GREEKS)
+        return 0
+
+    market = fetch_position_market_data(positions.index)
+    previous = state["market"]
+
+    if previous is None or not previous.index.equals(market.index):
+        state["market"] = market
+        state["position_greeks"] = position_greeks(positions, market)
+        state["by_underlying"] = state["position_greeks"].groupby(positions["symbol"]).sum()
+        state["total"] = state["position_greeks"].sum()
+        return len(positions)
+
+    # Only rows whose quote changed are recomputed
+    old_values = previous.to_numpy()
+    new_values = market.to_numpy()
+    unchanged = (old_values == new_values) | (np.isnan(old_values) & np.isnan(new_values))
+    changed = ~unchanged.all(axis=1)
+    if not changed.any():
+        return 0
+
+    changed_index = market.index[changed]
+    new_rows = position_greeks(positions.loc[changed_index], market.loc[changed_index])
+    delta_rows = new_rows - state["position_greeks"].loc[changed_index]
+
+    state["position_greeks"].loc[changed_index] = new_rows
+    adjustment = delta_rows.groupby(positions.loc[changed_index, "symbol"]).sum()
+    state["by_underlying"] = state["by_underlying"].add(adjustment, fill_value=0.0)
+    state["total"] = state["total"] + delta_rows.sum()
+    state["market"] = market
+    return int(changed.sum())
+
+
+def format_portfolio_greeks(state):
+    """
+    Formats net Greeks by underlying and in total as printable lines.
+    """
+    by_underlying = state.get("by_underlying")
+    if by_underlying is None or by_underlying.empty:
+        return ["No open option positions."]
+
+    lines = [f"{'Symbol':<8}{'Delta':>12}{'Gamma':>12}{'Theta':>12}{'Vega':>12}"]
+    for symbol, row in by_underlying.sort_index().iterrows():
+        lines.append(f"{symbol:<8}" + "".join(f"{row[g]:>12.2f}" for g in GREEKS))
+    total = state["total"]
+    lines.append(f"{'Total':<8}" + "".join(f"{total[g]:>12.2f}" for g in GREEKS))
+    return lines
+
+
+if __name__ == "__main__":
+    from src.robinhood_login import login_to_robinhood
+
+    if login_to_robinhood():
+        portfolio = new_portfolio_state()
+        refresh_portfolio(portfolio)
+        for line in format_portfolio_greeks(portfolio):
+            print(line)
@@ -0,0 +1,183 @@
+import argparse
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from src.bar_store import update_bar_store
+from src.expiration_index import get_all_expirations
+from src.fetch_greeks import fetch_option_chain
+from src.get_vix import get_vix_value
+from src.historical_prices import fetch_historical_closing_prices
+from src.pcr import get_put_call_ratio_60_days
+from src.robinhood_login import login_to_robinhood
+
+# Configurable through environment variables (.env)
+PREFETCH_WATCHLIST = [s.strip().upper() for s in os.getenv("PREFETCH_WATCHLIST", "SPY,QQQ,AAPL").split(",") if s.strip()]
+PREFETCH_INTERVAL_SECONDS = float(os.getenv("PREFETCH_INTERVAL_SECONDS", 300))
+PREFETCH_MAX_WORKERS = int(os.getenv("PREFETCH_MAX_WORKERS", 4))
+PREFETCH_PREOPEN_MINUTES = int(os.getenv("PREFETCH_PREOPEN_MINUTES", 30))
+PREFETCH_EXPIRATIONS = int(os.getenv("PREFETCH_EXPIRATIONS", 3))
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+# Lower runs first. Expirations come first since the chain tasks need them.
+TASK_PRIORITIES = {
+    "expirations": 0,
+    "vix": 1,
+    "historicals": 2,
+    "chains": 3,
+    "pcr": 4,
+    "bars": 5,
+}
+
+
+def _prefetch_chains(symbol, count):
+    # Refreshes the call and put entries every variant of fetch_option_chain is
+    # built from (ranking, screener, vol surface, recorder, term structure)
+    warmed = []
+    for expiration_date in get_all_expirations(symbol)[:count]:
+        if fetch_option_chain(symbol, expiration_date, refresh=True):
+            warmed.append(expiration_date)
+    return warmed
+
+
+def build_tasks(watchlist, expirations_per_symbol=None):
+    """
+    Builds the prefetch tasks for a watchlist. Symbols earlier in the
+    watchlist win ties, so list the hottest tickers first.
+
+    Returns:
+        list: (priority, name, func, args) tuples.
+    """
+    count = PREFETCH_EXPIRATIONS if expirations_per_symbol is None else expirations_per_symbol
+    tasks = [((TASK_PRIORITIES["vix"], -1), "VIX", get_vix_value, ())]
+    for rank, symbol in enumerate(watchlist):
+        tasks.extend([
+            ((TASK_PRIORITIES["expirations"], rank), f"{symbol} expirations", get_all_expirations, (symbol,)),
+            ((TASK_PRIORITIES["historicals"], rank), f"{symbol} historicals", fetch_historical_closing_prices, (symbol, "3month")),
+            ((TASK_PRIORITIES["chains"], rank), f"{symbol} chains", _prefetch_chains, (symbol, count)),
+            ((TASK_PRIORITIES["pcr"], rank), f"{symbol} put/call ratio", get_put_call_ratio_60_days, (symbol,)),
+            # Appends the week of 5-minute bars Robinhood serves to the on-disk bar store
+            ((TASK_PRIORITIES["bars"], rank), f"{symbol} bars", update_bar_store, (symbol,)),
+        ])
+    return tasks
+
+
+def run_prefetch(tasks, max_workers=None):
+    """
+    Runs the tasks in priority order with at most max_workers running at once.
+    The results land in the shared cache; only timings and failures are returned.
+    A task that returns None or an empty result counts as failed.
+
+    Returns:
+        dict: {"completed": int, "failed": [names], "seconds": float}
+    """
+    workers = max(1, min(max_workers or PREFETCH_MAX_WORKERS, len(tasks) or 1))
+    counter = itertools.count()
+    queue = [(priority, next(counter), name, func, args) for priority, name, func, args in tasks]
+    heapq.heapify(queue)
+    lock = threading.Lock()
+    failed = []
+    started = time.monotonic()
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                _, _, name, func, args = heapq.heappop(queue)
+            try:
+                result = func(*args)
+                if result is None or result == [] or result == {}:
+                    with lock:
+                        failed.append(name)
+            except Exception as e:
+                print(f"Prefetch of {name} failed: {e}")
+                with lock:
+                    failed.append(name)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "completed": len(tasks) - len(failed),
+        "failed": failed,
+        "seconds": round(time.monotonic() - started, 2),
+    }
+
+
+def next_run_time(now, interval=None, preopen_minutes=None):
+    """
+    Returns when the next prefetch should start: every interval seconds from
+    preopen_minutes before the open until the close, otherwise at the next
+    pre-open (weekdays only; exchange holidays are not skipped).
+
+    Parameters:
+        now (datetime): Timezone-aware current time.
+
+    Returns:
+        datetime: Next run time in the market timezone.
+    """
+    interval = PREFETCH_INTERVAL_SECONDS if interval is None else interval
+    preopen_minutes = PREFETCH_PREOPEN_MINUTES if preopen_minutes is None else preopen_minutes
+    now = now.astimezone(MARKET_TIMEZONE)
+
+    day = now
+    while True:
+        open_time = day.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+        window_start = open_time - timedelta(minutes=preopen_minutes)
+        window_end = day.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+        if day.weekday() < 5:
+            if now < window_start:
+                return window_start
+            if now < window_end:
+                return now + timedelta(seconds=interval)
+        day = (day + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        now = max(now, day)
+
+
+def run_scheduler(watchlist=None, interval=None, max_workers=None, once=False):
+    """
+    Prefetches the watchlist now, then on the market schedule until interrupted.
+    """
+    watchlist = watchlist or PREFETCH_WATCHLIST
+    tasks = build_tasks(watchlist)
+    while True:
+        result = run_prefetch(tasks, max_workers)
+        print(
+            f"[{datetime.now(MARKET_TIMEZONE):%Y-%m-%d %H:%M:%S}] Prefetched {result['completed']}/{len(tasks)} "
+            f"tasks for {', '.join(watchlist)} in {result['seconds']}s"
+            + (f" (failed: {', '.join(result['failed'])})" if result["failed"] else "")
+        )
+        if once:
+            return result
+
+        next_run = next_run_time(datetime.now(MARKET_TIMEZONE), interval)
+        print(f"Next prefetch at {next_run:%Y-%m-%d %H:%M %Z}.")
+        time.sleep(max(0.0, (next_run - datetime.now(MARKET_TIMEZONE)).total_seconds()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the shared cache for a watchlist before and during market hours.")
+    parser.add_argument("--symbols", help="Comma-separated watchlist (defaults to PREFETCH_WATCHLIST).")
+    parser.add_argument("--interval", type=float, help="Seconds between runs during market hours.")
+    parser.add_argument("--workers", type=int, help="Maximum concurrent fetches.")
+    parser.add_argument("--once", action="store_true", help="Prefetch once and exit.")
+    args = parser.parse_args()
+
+    if not login_to_robinhood():
+        print("Robinhood login failed; only yfinance data will be prefetched.")
+    symbols = [s.strip().upper() for s in args.symbols.split(",")] if args.symbols else None
+    try:
+        run_scheduler(symbols, args.interval, args.workers, args.once)
+    except KeyboardInterrupt:
+        print("Prefetch scheduler stopped.")
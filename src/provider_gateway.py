@@ -0,0 +1,211 @@
+import random
+import threading
+import time
+
+# Requests per second / burst size per provider. Tune these if a provider
+# starts returning 429s under batch load.
+PROVIDER_LIMITS = {
+    "robinhood": {"rate": 5.0, "burst": 10},
+    "yfinance": {"rate": 2.0, "burst": 5},
+    "google": {"rate": 1.0, "burst": 2},
+    "openai": {"rate": 3.0, "burst": 5},
+}
+DEFAULT_LIMIT = {"rate": 2.0, "burst": 5}
+
+# Retry and circuit breaker settings
+MAX_RETRIES = 3
+BASE_DELAY = 0.5        # seconds, doubled on each retry
+MAX_DELAY = 8.0         # cap for a single backoff sleep
+FAILURE_THRESHOLD = 5   # consecutive failures before the circuit opens
+RESET_TIMEOUT = 30.0    # seconds the circuit stays open before a trial call
+
+# Errors caused by bad input or bad parsing are not worth retrying.
+NON_TRANSIENT_ERRORS = (ValueError, KeyError, TypeError, AttributeError, IndexError)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit is open and calls are rejected."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Each call to acquire() takes one token and
+    blocks until one is available.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after FAILURE_THRESHOLD consecutive failures and rejects calls
+    until RESET_TIMEOUT has passed. Then exactly one caller is let through
+    as a trial (half-open); everyone else is still rejected until the trial
+    ends. Success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.trial_in_flight and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: allow one trial call through
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """
+        Ends a trial call that neither succeeded nor failed (e.g. a bad request),
+        so the next caller gets the trial instead.
+        """
+        with self.lock:
+            self.trial_in_flight = False
+
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None and (
+                self.trial_in_flight or time.monotonic() - self.opened_at < self.reset_timeout
+            )
+
+
+_buckets = {}
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def _get_bucket(provider):
+    with _registry_lock:
+        if provider not in _buckets:
+            limit = PROVIDER_LIMITS.get(provider, DEFAULT_LIMIT)
+            _buckets[provider] = TokenBucket(limit["rate"], limit["burst"])
+        return _buckets[provider]
+
+
+def get_circuit_breaker(provider):
+    """
+    Returns the shared circuit breaker for a provider.
+    """
+    with _registry_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker()
+        return _breakers[provider]
+
+
+def _is_transient(error):
+    if isinstance(error, NON_TRANSIENT_ERRORS):
+        return False
+    # requests.HTTPError carries the response; only retry throttling and server errors
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return True
+
+
+def _is_swallowed_error(provider, result):
+    # robin_stocks' request_get catches HTTPError (429s and 5xx included), prints
+    # it and returns None or [None] instead, so the error has to be read off the result
+    if provider != "robinhood":
+        return False
+    if result is None:
+        return True
+    return isinstance(result, list) and len(result) > 0 and all(item is None for item in result)
+
+
+def backoff_delay(attempt):
+    """
+    Full-jitter exponential backoff: a random delay between 0 and
+    min(MAX_DELAY, BASE_DELAY * 2 ** attempt).
+    """
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * (2 ** attempt)))
+
+
+def call_provider(provider, func, *args, retries=MAX_RETRIES, **kwargs):
+    """
+    Calls a provider function through the shared rate limiter, retry policy
+    and circuit breaker.
+
+    Parameters:
+        provider (str): Provider name, e.g. "robinhood" or "yfinance".
+        func (callable): The function that performs the request.
+        *args, **kwargs: Passed through to func.
+        retries (int): Number of retries on transient errors.
+
+    Returns:
+        The return value of func. For Robinhood, a None/[None] result (an HTTP
+        error swallowed by robin_stocks) is retried like a transient error and
+        returned as-is once retries are exhausted.
+
+    Raises:
+        CircuitOpenError: If the provider's circuit is open.
+        Exception: The last error raised by func once retries are exhausted,
+                   or immediately for non-transient errors.
+    """
+    breaker = get_circuit_breaker(provider)
+    bucket = _get_bucket(provider)
+
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"{provider} is unavailable (circuit open), failing fast.")
+
+        bucket.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if not _is_transient(e):
+                breaker.release_trial()
+                raise
+            breaker.record_failure()
+            if attempt == retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if _is_swallowed_error(provider, result):
+            breaker.record_failure()
+            if attempt == retries:
+                return result
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        breaker.record_success()
+        return result
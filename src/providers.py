@@ -0,0 +1,405 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import numpy as np
+import robin_stocks.robinhood as r
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+
+from src import arrow_store
+from src.expiration_index import get_all_expirations
+from src.historical_prices import fetch_historical_bars
+from src.provider_gateway import call_provider
+from src.single_flight import coalesce, coalesced_call
+
+# Configurable through environment variables (.env)
+PROVIDER_ORDER = [p.strip() for p in os.getenv("PROVIDER_ORDER", "robinhood,yfinance,replay").split(",") if p.strip()]
+PROVIDER_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", 10))
+
+# Weight of the newest sample in the latency moving average
+LATENCY_SMOOTHING = 0.3
+# Consecutive failures before a provider is skipped, and for how long
+FAILURES_BEFORE_COOLDOWN = 3
+COOLDOWN_SECONDS = 30.0
+ROUTER_MAX_WORKERS = 16
+# Timed-out calls still running per provider before it is skipped, so calls
+# that hang cannot take over the router's pool
+MAX_ABANDONED_CALLS = 3
+
+YF_SPANS = {"day": "1d", "week": "5d", "month": "1mo", "3month": "3mo", "year": "1y", "5year": "5y"}
+YF_INTERVALS = {"5minute": "5m", "hour": "1h", "day": "1d", "week": "1wk"}
+
+
+class ProviderError(Exception):
+    """Raised when no provider could serve a request."""
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default (connect, read) timeout to every request."""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def install_http_timeout(session, timeout=None):
+    """
+    Makes every request of a requests.Session time out (robin_stocks sends its
+    requests without a timeout, so a stalled connection would hang forever).
+    """
+    adapter = TimeoutHTTPAdapter(PROVIDER_TIMEOUT_SECONDS if timeout is None else timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface every provider implements. Results use the Robinhood field
+    names the rest of the code already parses:
+
+        get_quote(symbol) -> float last price
+        get_expirations(symbol) -> sorted 'YYYY-MM-DD' strings
+        get_chain(symbol, expiration_date, option_type=None) -> option dicts with
+            'expiration_date', 'type', 'strike_price', 'bid_price', 'ask_price',
+            'adjusted_mark_price', 'implied_volatility', 'volume', 'open_interest'
+            (plus Greeks when the provider has them)
+        get_historicals(symbol, interval, span) -> bars with 'begins_at',
+            'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+    """
+
+    name = "base"
+    # Only used once every live provider has failed
+    fallback_only = False
+
+    @abstractmethod
+    def get_quote(self, symbol):
+        """See the class docstring."""
+
+    @abstractmethod
+    def get_expirations(self, symbol):
+        """See the class docstring."""
+
+    @abstractmethod
+    def get_chain(self, symbol, expiration_date, option_type=None):
+        """See the class docstring."""
+
+    @abstractmethod
+    def get_historicals(self, symbol, interval="day", span="year"):
+        """See the class docstring."""
+
+
+class RobinhoodProvider(MarketDataProvider):
+    name = "robinhood"
+
+    def get_quote(self, symbol):
+        quote = coalesced_call("robinhood", r.stocks.get_stock_quote_by_symbol, symbol)
+        return float(quote["last_trade_price"])
+
+    def get_expirations(self, symbol):
+        return get_all_expirations(symbol)
+
+    def get_chain(self, symbol, expiration_date, option_type=None):
+        # Imported here: fetch_greeks -> fetch_price -> providers would be circular
+        from src.fetch_greeks import fetch_option_chain
+
+        return fetch_option_chain(symbol, expiration_date, option_type)
+
+    def get_historicals(self, symbol, interval="day", span="year"):
+        return fetch_historical_bars(symbol, interval=interval, span=span)
+
+
+def _number(value):
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else float(value)
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    def get_quote(self, symbol):
+        ticker = yf.Ticker(symbol)
+        return float(coalesce(
+            ("yfinance.last_price", symbol), call_provider, "yfinance", lambda: ticker.fast_info["last_price"]
+        ))
+
+    def get_expirations(self, symbol):
+        ticker = yf.Ticker(symbol)
+        return sorted(coalesce(("yfinance.options", symbol), call_provider, "yfinance", lambda: ticker.options))
+
+    def get_chain(self, symbol, expiration_date, option_type=None):
+        ticker = yf.Ticker(symbol)
+        # Concurrent requests for the same chain share one download
+        chain = coalesce(
+            ("yfinance.option_chain", ticker.ticker, expiration_date),
+            call_provider, "yfinance", ticker.option_chain, expiration_date
+        )
+        rows = []
+        for contract_type, frame in (("call", chain.calls), ("put", chain.puts)):
+            if option_type and option_type != contract_type:
+                continue
+            for item in frame.to_dict(orient="records"):
+                bid, ask = _number(item.get("bid")), _number(item.get("ask"))
+                rows.append({
+                    "expiration_date": expiration_date,
+                    "type": contract_type,
+                    "strike_price": _number(item.get("strike")),
+                    "bid_price": bid,
+                    "ask_price": ask,
+                    "adjusted_mark_price": (bid + ask) / 2 if bid is not None and ask is not None else None,
+                    "last_trade_price": _number(item.get("lastPrice")),
+                    "implied_volatility": _number(item.get("impliedVolatility")),
+                    "volume": _number(item.get("volume")),
+                    "open_interest": _number(item.get("openInterest")),
+                })
+        return sorted(rows, key=lambda row: row["strike_price"] or 0.0)
+
+    def get_historicals(self, symbol, interval="day", span="year"):
+        if interval not in YF_INTERVALS or span not in YF_SPANS:
+            raise ValueError(f"yfinance has no {interval} bars for span {span}.")
+        ticker = yf.Ticker(symbol)
+        history = call_provider("yfinance", ticker.history, period=YF_SPANS[span], interval=YF_INTERVALS[interval])
+        return [
+            {
+                "begins_at": timestamp.tz_convert("UTC").isoformat() if timestamp.tzinfo else timestamp.isoformat(),
+                "open_price": row["Open"],
+                "high_price": row["High"],
+                "low_price": row["Low"],
+                "close_price": row["Close"],
+                "volume": row["Volume"],
+            }
+            for timestamp, row in history.iterrows()
+        ]
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serves the latest Arrow snapshots saved by src.arrow_store. The data may
+    be stale, so it is only used when every live provider has failed.
+    """
+
+    name = "replay"
+    fallback_only = True
+
+    def _latest_chain(self, symbol):
+        path = arrow_store.latest_chain_snapshot(symbol)
+        return arrow_store.load_chain_snapshot(path) if path else None
+
+    def get_quote(self, symbol):
+        for span in YF_SPANS:
+            bars = arrow_store.load_historicals(symbol, span)
+            if bars is not None and not bars.empty:
+                return float(bars["close"].iloc[-1])
+        return None
+
+    def get_expirations(self, symbol):
+        frame = self._latest_chain(symbol)
+        return sorted(frame["expiration_date"].unique()) if frame is not None else []
+
+    def get_chain(self, symbol, expiration_date, option_type=None):
+        frame = self._latest_chain(symbol)
+        if frame is None:
+            return []
+        frame = frame[frame["expiration_date"] == expiration_date]
+        if option_type:
+            frame = frame[frame["type"] == option_type]
+        renamed = {column: field for field, column in arrow_store.CHAIN_NUMERIC_FIELDS.items()}
+        frame = frame.rename(columns=renamed).sort_values("strike_price")
+        return [
+            {key: (None if isinstance(value, float) and np.isnan(value) else value) for key, value in row.items()}
+            for row in frame.to_dict(orient="records")
+        ]
+
+    def get_historicals(self, symbol, interval="day", span="year"):
+        bars = arrow_store.load_historicals(symbol, span)
+        if bars is None:
+            return []
+        renamed = {column: field for field, column in arrow_store.BAR_FIELDS.items()}
+        bars = bars.rename(columns=renamed)
+        return [
+            dict(row, begins_at=timestamp.isoformat())
+            for timestamp, row in zip(bars.index, bars.to_dict(orient="records"))
+        ]
+
+
+PROVIDER_CLASSES = {
+    "robinhood": RobinhoodProvider,
+    "yfinance": YFinanceProvider,
+    "replay": ReplayProvider,
+}
+
+
+class ProviderRouter:
+    """
+    Sends each request to the healthy provider with the lowest moving-average
+    latency for that method, and fails over to the next one on errors, empty
+    results or when a call exceeds the timeout (the slow call is abandoned).
+    Providers failing FAILURES_BEFORE_COOLDOWN times in a row are skipped for
+    COOLDOWN_SECONDS, and so are providers with MAX_ABANDONED_CALLS timed-out
+    calls still running.
+    """
+
+    def __init__(self, providers, timeout=None):
+        self.providers = list(providers)
+        self.timeout = PROVIDER_TIMEOUT_SECONDS if timeout is None else timeout
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.abandoned = {}
+        self.executor = ThreadPoolExecutor(max_workers=ROUTER_MAX_WORKERS, thread_name_prefix="provider")
+
+    def _stat(self, provider, method):
+        return self.stats.setdefault(
+            (provider.name, method), {"latency": None, "failures": 0, "down_until": 0.0, "calls": 0}
+        )
+
+    def ranked(self, method, prefer=None):
+        """Providers in the order they would be tried for a method."""
+        now = time.monotonic()
+        with self.lock:
+            def sort_key(item):
+                index, provider = item
+                stat = self._stat(provider, method)
+                # Untimed providers never jump ahead of a measured one (a measured
+                # primary that is merely slow should not lose its place to a guess);
+                # among themselves they keep PROVIDER_ORDER
+                return (
+                    provider.fallback_only,
+                    stat["down_until"] > now or self.abandoned.get(provider.name, 0) >= MAX_ABANDONED_CALLS,
+                    provider.name != prefer,
+                    stat["latency"] is None,
+                    stat["latency"] or 0.0,
+                    index,
+                )
+            return [provider for _, provider in sorted(enumerate(self.providers), key=sort_key)]
+
+    def _abandon(self, provider, future):
+        # The call keeps its pool thread until the HTTP timeout ends it; count it until then
+        with self.lock:
+            self.abandoned[provider.name] = self.abandoned.get(provider.name, 0) + 1
+
+        def release(_):
+            with self.lock:
+                self.abandoned[provider.name] -= 1
+
+        future.add_done_callback(release)
+
+    def _record(self, provider, method, seconds, failed):
+        with self.lock:
+            stat = self._stat(provider, method)
+            stat["calls"] += 1
+            if stat["latency"] is None:
+                stat["latency"] = seconds
+            else:
+                stat["latency"] += LATENCY_SMOOTHING * (seconds - stat["latency"])
+            if failed:
+                stat["failures"] += 1
+                if stat["failures"] >= FAILURES_BEFORE_COOLDOWN:
+                    stat["down_until"] = time.monotonic() + COOLDOWN_SECONDS
+            else:
+                stat["failures"] = 0
+                stat["down_until"] = 0.0
+
+    def call(self, method, *args, prefer=None):
+        """
+        Calls method on the best provider, failing over until one returns data.
+
+        Parameters:
+            method (str): 'get_quote', 'get_expirations', 'get_chain' or 'get_historicals'.
+            prefer (str): Provider to try first while it is healthy.
+
+        Returns:
+            The first non-empty result.
+
+        Raises:
+            ProviderError: If every provider failed or had no data.
+        """
+        errors = []
+        for provider in self.ranked(method, prefer):
+            with self.lock:
+                saturated = self.abandoned.get(provider.name, 0) >= MAX_ABANDONED_CALLS
+            if saturated:
+                errors.append(f"{provider.name}: {MAX_ABANDONED_CALLS} timed-out calls still running")
+                continue
+            started = time.monotonic()
+            future = self.executor.submit(getattr(provider, method), *args)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FuturesTimeoutError:
+                if not future.cancel():
+                    self._abandon(provider, future)
+                self._record(provider, method, self.timeout, failed=True)
+                errors.append(f"{provider.name}: timed out after {self.timeout:.0f}s")
+                continue
+            except Exception as e:
+                # Errors count as a full timeout so failing providers sink in the ranking
+                self._record(provider, method, self.timeout, failed=True)
+                errors.append(f"{provider.name}: {e}")
+                continue
+
+            # No data is not an outage (e.g. a symbol without options), so the
+            # provider is not penalized, but the next one still gets a chance
+            self._record(provider, method, time.monotonic() - started, failed=False)
+            if result is None or (hasattr(result, "__len__") and len(result) == 0):
+                errors.append(f"{provider.name}: no data")
+                continue
+            return result
+
+        raise ProviderError(f"No provider could serve {method}{args}: " + "; ".join(errors))
+
+    def status(self):
+        """
+        Returns:
+            dict: (provider, method) -> latency, consecutive failures, calls and whether it is cooling down.
+        """
+        now = time.monotonic()
+        with self.lock:
+            return {
+                key: {
+                    "latency": None if stat["latency"] is None else round(stat["latency"], 3),
+                    "failures": stat["failures"],
+                    "calls": stat["calls"],
+                    "cooling_down": stat["down_until"] > now,
+                    "abandoned": self.abandoned.get(key[0], 0),
+                }
+                for key, stat in self.stats.items()
+            }
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Returns the process-wide router built from PROVIDER_ORDER."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            # Bound Robinhood requests so a call abandoned by the router ends
+            # (and frees its thread) instead of hanging on a stalled connection
+            install_http_timeout(r.helper.SESSION)
+            _router = ProviderRouter(PROVIDER_CLASSES[name]() for name in PROVIDER_ORDER if name in PROVIDER_CLASSES)
+        return _router
+
+
+def get_quote(symbol, prefer=None):
+    return get_router().call("get_quote", symbol, prefer=prefer)
+
+
+def get_expirations(symbol, prefer=None):
+    return get_router().call("get_expirations", symbol, prefer=prefer)
+
+
+def get_chain(symbol, expiration_date, option_type=None, prefer=None):
+    return get_router().call("get_chain", symbol, expiration_date, option_type, prefer=prefer)
+
+
+def get_historicals(symbol, interval="day", span="year", prefer=None):
+    return get_router().call("get_historicals", symbol, interval, span, prefer=prefer)
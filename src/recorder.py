@@ -0,0 +1,242 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from src.expiration_index import expirations_in_dte_range
+from src.fetch_price import fetch_current_price
+from src.get_vix import get_vix_value
+from src.pcr import get_put_call_ratio_60_days
+from src.prefetch import MARKET_TIMEZONE, PREFETCH_WATCHLIST, next_run_time
+from src.providers import get_chain
+from src.snapshots import SNAPSHOT_DIR
+from src.term_structure import atm_iv_from_chain
+
+# Configurable through environment variables (.env)
+RECORDER_DB = os.getenv("RECORDER_DB", os.path.join(SNAPSHOT_DIR, "metrics.sqlite3"))
+RECORDER_INTERVAL_SECONDS = float(os.getenv("RECORDER_INTERVAL_SECONDS", 60))
+RECORDER_WATCHLIST = [
+    s.strip().upper() for s in os.getenv("RECORDER_WATCHLIST", ",".join(PREFETCH_WATCHLIST)).split(",") if s.strip()
+]
+# Expiration used for ATM IV and open interest: the first one at least this many days out
+RECORDER_MIN_DTE = int(os.getenv("RECORDER_MIN_DTE", 7))
+
+# Bucket width per resolution, and how long rows are kept before being rolled
+# up into the next resolution (daily rows are kept forever: one per metric per day)
+RESOLUTION_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+RETENTION_SECONDS = {"minute": 2 * 86400, "hour": 90 * 86400}
+NEXT_RESOLUTION = {"minute": "hour", "hour": "day"}
+
+# Symbol under which market-wide metrics (VIX) are stored
+MARKET_SYMBOL = "MARKET"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    symbol TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    value REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (symbol, metric, resolution, bucket)
+) WITHOUT ROWID;
+"""
+
+# Merges a new aggregate into an existing bucket (count-weighted mean)
+UPSERT = """
+INSERT INTO metrics (symbol, metric, resolution, bucket, value, min, max, count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (symbol, metric, resolution, bucket) DO UPDATE SET
+    value = (metrics.value * metrics.count + excluded.value * excluded.count) / (metrics.count + excluded.count),
+    min = MIN(metrics.min, excluded.min),
+    max = MAX(metrics.max, excluded.max),
+    count = metrics.count + excluded.count
+"""
+
+_local = threading.local()
+
+
+def _connect():
+    connection = getattr(_local, "connection", None)
+    if connection is None or getattr(_local, "path", None) != RECORDER_DB:
+        directory = os.path.dirname(RECORDER_DB)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(RECORDER_DB, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        _local.connection = connection
+        _local.path = RECORDER_DB
+    return connection
+
+
+def record_metrics(symbol, metrics, timestamp=None):
+    """
+    Records metric values for a symbol into the minute bucket of timestamp.
+
+    Parameters:
+        symbol (str): Stock ticker symbol (or MARKET_SYMBOL).
+        metrics (dict): metric name -> value; None values are skipped.
+        timestamp (float): Epoch seconds (defaults to now).
+
+    Returns:
+        int: Number of values recorded.
+    """
+    timestamp = time.time() if timestamp is None else timestamp
+    bucket = int(timestamp // 60 * 60)
+    rows = [
+        (symbol.upper(), metric, "minute", bucket, float(value), float(value), float(value), 1)
+        for metric, value in metrics.items() if value is not None
+    ]
+    connection = _connect()
+    with connection:
+        connection.executemany(UPSERT, rows)
+    return len(rows)
+
+
+def compact(now=None):
+    """
+    Rolls minute rows older than their retention up into hourly buckets and
+    hourly rows into daily buckets (UTC), deleting the rolled-up rows. Only
+    whole buckets are rolled up, so re-running is safe.
+
+    Returns:
+        dict: resolution -> number of rows rolled up.
+    """
+    now = time.time() if now is None else now
+    connection = _connect()
+    rolled = {}
+    with connection:
+        for resolution, target in NEXT_RESOLUTION.items():
+            width = RESOLUTION_SECONDS[target]
+            cutoff = int((now - RETENTION_SECONDS[resolution]) // width * width)
+            connection.execute(
+                "INSERT INTO metrics (symbol, metric, resolution, bucket, value, min, max, count) "
+                "SELECT symbol, metric, ?, bucket / ? * ?, SUM(value * count) / SUM(count), MIN(min), MAX(max), SUM(count) "
+                "FROM metrics WHERE resolution = ? AND bucket < ? "
+                "GROUP BY symbol, metric, bucket / ? "
+                "ON CONFLICT (symbol, metric, resolution, bucket) DO UPDATE SET "
+                "value = (metrics.value * metrics.count + excluded.value * excluded.count) / (metrics.count + excluded.count), "
+                "min = MIN(metrics.min, excluded.min), max = MAX(metrics.max, excluded.max), "
+                "count = metrics.count + excluded.count",
+                (target, width, width, resolution, cutoff, width),
+            )
+            rolled[resolution] = connection.execute(
+                "DELETE FROM metrics WHERE resolution = ? AND bucket < ?", (resolution, cutoff)
+            ).rowcount
+    return rolled
+
+
+def query_metrics(symbol, metric, start=None, end=None, resolution=None):
+    """
+    Returns the time series of one metric. Without a resolution every level is
+    returned, which gives a seamless series: daily points for old data, hourly
+    for the last RETENTION_SECONDS["hour"] and minutes for the most recent days.
+
+    Parameters:
+        symbol (str): Stock ticker symbol (MARKET_SYMBOL for VIX).
+        metric (str): e.g. 'pcr', 'atm_iv', 'call_oi', 'put_oi', 'vix'.
+        start, end: Anything pd.Timestamp accepts (naive values are taken as UTC), or None.
+        resolution (str): 'minute', 'hour' or 'day' to read only one level.
+
+    Returns:
+        pandas.DataFrame: Indexed by UTC timestamp with value, min, max, count and resolution.
+    """
+    def epoch(value):
+        timestamp = pd.Timestamp(value)
+        return int((timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp).timestamp())
+
+    query = "SELECT bucket, value, min, max, count, resolution FROM metrics WHERE symbol = ? AND metric = ?"
+    params = [symbol.upper(), metric]
+    if resolution:
+        query += " AND resolution = ?"
+        params.append(resolution)
+    if start is not None:
+        query += " AND bucket >= ?"
+        params.append(epoch(start))
+    if end is not None:
+        query += " AND bucket < ?"
+        params.append(epoch(end))
+
+    frame = pd.read_sql_query(query + " ORDER BY bucket", _connect(), params=params)
+    frame.index = pd.to_datetime(frame.pop("bucket"), unit="s", utc=True)
+    frame.index.name = "timestamp"
+    return frame
+
+
+def collect_chain_metrics(symbol):
+    """
+    Computes the recorded metrics for one symbol: 60-day put/call ratio, plus ATM
+    IV and call/put open interest of the first expiration RECORDER_MIN_DTE+ days out.
+
+    Returns:
+        dict: metric name -> value (None when unavailable).
+    """
+    metrics = {"pcr": get_put_call_ratio_60_days(symbol), "atm_iv": None, "call_oi": None, "put_oi": None}
+    expirations = expirations_in_dte_range(symbol, RECORDER_MIN_DTE)
+    spot = fetch_current_price(symbol)
+    if not expirations or spot is None:
+        return metrics
+
+    chain = get_chain(symbol, expirations[0])
+    metrics["atm_iv"] = atm_iv_from_chain(chain, spot)
+    for option_type in ("call", "put"):
+        metrics[f"{option_type}_oi"] = sum(
+            float(option.get("open_interest") or 0) for option in chain if option.get("type") == option_type
+        )
+    return metrics
+
+
+def record_once(watchlist=None):
+    """
+    Collects and records metrics for every symbol of the watchlist and the VIX,
+    then compacts old rows.
+
+    Returns:
+        int: Number of values recorded.
+    """
+    now = time.time()
+    recorded = record_metrics(MARKET_SYMBOL, {"vix": get_vix_value()}, now)
+    for symbol in watchlist or RECORDER_WATCHLIST:
+        try:
+            recorded += record_metrics(symbol, collect_chain_metrics(symbol), now)
+        except Exception as e:
+            print(f"Error recording chain metrics for {symbol}: {e}")
+    compact(now)
+    return recorded
+
+
+def run_recorder(watchlist=None, interval=None):
+    """
+    Records every interval seconds during market hours until interrupted.
+    """
+    interval = RECORDER_INTERVAL_SECONDS if interval is None else interval
+    while True:
+        recorded = record_once(watchlist)
+        print(f"[{datetime.now(MARKET_TIMEZONE):%Y-%m-%d %H:%M:%S}] Recorded {recorded} values.")
+        next_run = next_run_time(datetime.now(MARKET_TIMEZONE), interval, preopen_minutes=0)
+        time.sleep(max(0.0, (next_run - datetime.now(MARKET_TIMEZONE)).total_seconds()))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.robinhood_login import login_to_robinhood
+
+    parser = argparse.ArgumentParser(description="Record per-symbol chain metrics into a compacting time-series store.")
+    parser.add_argument("--symbols", help="Comma-separated watchlist (defaults to RECORDER_WATCHLIST).")
+    parser.add_argument("--interval", type=float, help="Seconds between recordings during market hours.")
+    args = parser.parse_args()
+
+    if not login_to_robinhood():
+        print("Robinhood login failed; metrics will come from the fallback providers.")
+    symbols = [s.strip().upper() for s in args.symbols.split(",")] if args.symbols else None
+    try:
+        run_recorder(symbols, args.interval)
+    except KeyboardInterrupt:
+        print("Recorder stopped.")
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.chain_ranking import chain_to_frame
+from src.expiration_index import get_all_expirations
+from src.fetch_greeks import fetch_option_chain
+from src.fetch_price import fetch_current_price
+from src.liquidity import add_liquidity_metrics, liquidity_mask
+from src.term_structure import TERM_STRUCTURE_MAX_WORKERS
+
+SCREEN_COLUMNS = [
+    "expiration_date", "type", "strike", "bid", "ask", "spread_pct", "open_interest",
+    "volume", "theta_decay_pct", "extrinsic", "iv", "delta",
+]
+
+
+def fetch_chain_range(symbol, start_date, end_date, option_type=None, max_workers=None):
+    """
+    Fetches every strike of every expiration between start_date and end_date
+    (inclusive, 'YYYY-MM-DD') concurrently and returns one numeric DataFrame.
+    """
+    expirations = [d for d in get_all_expirations(symbol) if start_date <= d <= end_date]
+    if not expirations:
+        return pd.DataFrame()
+
+    workers = max(1, min(max_workers or TERM_STRUCTURE_MAX_WORKERS, len(expirations)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chains = list(executor.map(lambda expiration: fetch_option_chain(symbol, expiration, option_type), expirations))
+
+    rows = [row for chain in chains for row in chain]
+    return chain_to_frame(rows) if rows else pd.DataFrame()
+
+
+def screen_chain(frame, spot, thresholds=None):
+    """
+    Filters an already-fetched chain on bid/ask spread %, open interest,
+    volume, theta decay % and extrinsic value using vectorized masks.
+
+    Parameters:
+        frame (pandas.DataFrame): Output of chain_to_frame() / fetch_chain_range().
+        spot (float): Current underlying price.
+        thresholds (dict): Overrides for LIQUIDITY_THRESHOLDS (max_spread_pct,
+            min_open_interest, min_volume, max_theta_decay_pct, min_extrinsic).
+
+    Returns:
+        pandas.DataFrame: Tradable candidates with SCREEN_COLUMNS, sorted by expiration and strike.
+    """
+    if frame.empty:
+        return pd.DataFrame(columns=SCREEN_COLUMNS)
+
+    metrics = add_liquidity_metrics(frame, spot)
+    candidates = metrics[liquidity_mask(metrics, thresholds)]
+    return candidates.sort_values(["expiration_date", "type", "strike"])[SCREEN_COLUMNS].reset_index(drop=True)
+
+
+def screen_symbol(symbol, start_date, end_date, option_type=None, thresholds=None):
+    """
+    Returns the tradable contracts for a symbol across all expirations in a date range.
+
+    Returns:
+        pandas.DataFrame: The screened candidates, or None on error.
+    """
+    try:
+        spot = fetch_current_price(symbol)
+        if spot is None:
+            return None
+        return screen_chain(fetch_chain_range(symbol, start_date, end_date, option_type), spot, thresholds)
+    except Exception as e:
+        print(f"Error screening option chain for {symbol}: {e}")
+        return None
@@ -0,0 +1,222 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.single_flight import coalesce
+
+# Configurable through environment variables (.env). Every process pointing at
+# the same file shares one warm copy of the data.
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "1") not in ("0", "false", "no")
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", os.path.join(".cache", "shared_cache.sqlite3"))
+SHARED_CACHE_MAX_BYTES = int(os.getenv("SHARED_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# Writes between two eviction passes
+EVICT_EVERY = 200
+# Minimum seconds between two last-access updates of the same entry
+TOUCH_INTERVAL = 5.0
+
+# Default TTL in seconds per namespace
+SHARED_CACHE_TTLS = {
+    "quote": float(os.getenv("SHARED_CACHE_QUOTE_TTL", 5)),
+    # Chains outlive one prefetch interval (plus a minute for the run itself) so
+    # pages keep hitting the entries the scheduler refreshes
+    "chain": float(os.getenv("SHARED_CACHE_CHAIN_TTL", float(os.getenv("PREFETCH_INTERVAL_SECONDS", 300)) + 60)),
+    "historicals": float(os.getenv("SHARED_CACHE_HISTORICALS_TTL", 900)),
+    "sentiment": float(os.getenv("SHARED_CACHE_SENTIMENT_TTL", 3600)),
+    "expirations": float(os.getenv("SHARED_CACHE_EXPIRATIONS_TTL", 6 * 3600)),
+    "vix": float(os.getenv("SHARED_CACHE_VIX_TTL", 300)),
+    "pcr": float(os.getenv("SHARED_CACHE_PCR_TTL", 900)),
+}
+DEFAULT_TTL = 300.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at);
+CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at);
+"""
+
+_local = threading.local()
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def _connect():
+    # SQLite connections cannot be shared between threads, so each thread keeps its own
+    connection = getattr(_local, "connection", None)
+    if connection is None or getattr(_local, "path", None) != SHARED_CACHE_PATH:
+        directory = os.path.dirname(SHARED_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(SHARED_CACHE_PATH, timeout=10, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        _local.connection = connection
+        _local.path = SHARED_CACHE_PATH
+    return connection
+
+
+def _entry_key(namespace, key):
+    return f"{namespace}:{key}"
+
+
+def cache_get(namespace, key):
+    """
+    Returns the cached value for (namespace, key), or None when missing or expired.
+    """
+    try:
+        connection = _connect()
+        now = time.time()
+        row = connection.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (_entry_key(namespace, key),)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        if now - row[2] >= TOUCH_INTERVAL:
+            connection.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, _entry_key(namespace, key))
+            )
+        return json.loads(row[0])
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Shared cache read failed for {namespace}: {e}")
+        return None
+
+
+def cache_set(namespace, key, value, ttl=None):
+    """
+    Stores a JSON-serializable value with a TTL (seconds, defaults to the namespace TTL).
+    """
+    global _writes
+    ttl = SHARED_CACHE_TTLS.get(namespace, DEFAULT_TTL) if ttl is None else ttl
+    try:
+        payload = json.dumps(value)
+        now = time.time()
+        _connect().execute(
+            "INSERT OR REPLACE INTO cache (key, namespace, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (_entry_key(namespace, key), namespace, payload, len(payload), now + ttl, now),
+        )
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        print(f"Shared cache write failed for {namespace}: {e}")
+        return
+
+    with _writes_lock:
+        _writes += 1
+        due = _writes % EVICT_EVERY == 0
+    if due:
+        evict()
+
+
+def evict(max_bytes=None):
+    """
+    Drops expired entries, then the least recently used ones until the
+    stored values fit in max_bytes (defaults to SHARED_CACHE_MAX_BYTES).
+
+    Returns:
+        int: Number of entries removed.
+    """
+    max_bytes = SHARED_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        connection = _connect()
+        expired = connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+        evicted = connection.execute(
+            "DELETE FROM cache WHERE key IN ("
+            " SELECT key FROM ("
+            "  SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running FROM cache"
+            " ) WHERE running > ?)",
+            (max_bytes,),
+        ).rowcount
+        return expired + evicted
+    except sqlite3.Error as e:
+        print(f"Shared cache eviction failed: {e}")
+        return 0
+
+
+def clear_shared_cache(namespace=None):
+    """Removes every entry, or only those of one namespace."""
+    connection = _connect()
+    if namespace is None:
+        connection.execute("DELETE FROM cache")
+    else:
+        connection.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+
+def cache_stats():
+    """
+    Returns:
+        dict: namespace -> {"entries": int, "bytes": int} for unexpired entries.
+    """
+    rows = _connect().execute(
+        "SELECT namespace, COUNT(*), SUM(size) FROM cache WHERE expires_at > ? GROUP BY namespace", (time.time(),)
+    ).fetchall()
+    return {namespace: {"entries": count, "bytes": size} for namespace, count, size in rows}
+
+
+def _is_error(result):
+    return isinstance(result, dict) and "error" in result
+
+
+def shared_cached(namespace, ttl=None):
+    """
+    Decorator caching a function's JSON-serializable result in the shared
+    cache, keyed by a hash of its arguments. Misses are coalesced so only one
+    thread of this process fetches a given key. None, empty and {"error": ...}
+    results are not cached so failures are retried on the next call.
+
+    The wrapper also gets .uncached (the plain function), .peek(...) (the cached
+    value or None, never fetching) and .refresh(...) (fetch and store, ignoring
+    any cached value; used by the prefetch scheduler).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def make_cache_key(args, kwargs):
+            # Bind to the signature so f("AAPL", "3month") and f("AAPL", span="3month")
+            # share an entry (the prefetch scheduler relies on this)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = repr(sorted(bound.arguments.items()))
+            return f"{func.__module__}.{func.__qualname__}:{hashlib.sha256(arguments.encode('utf-8')).hexdigest()}"
+
+        def load(key, args, kwargs):
+            result = func(*args, **kwargs)
+            if result is not None and result != [] and result != {} and not _is_error(result):
+                cache_set(namespace, key, result, ttl)
+            return result
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not SHARED_CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            key = make_cache_key(args, kwargs)
+            cached = cache_get(namespace, key)
+            if cached is not None:
+                return cached
+            return coalesce(("shared_cache", namespace, key), load, key, args, kwargs)
+
+        def peek(*args, **kwargs):
+            return cache_get(namespace, make_cache_key(args, kwargs)) if SHARED_CACHE_ENABLED else None
+
+        def refresh(*args, **kwargs):
+            if not SHARED_CACHE_ENABLED:
+                return func(*args, **kwargs)
+            key = make_cache_key(args, kwargs)
+            return coalesce(("shared_cache", namespace, key), load, key, args, kwargs)
+
+        wrapper.uncached = func
+        wrapper.peek = peek
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
@@ -0,0 +1,97 @@
+import copy
+import threading
+
+from src.provider_gateway import call_provider
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the
+    function, later callers block until it finishes and receive a copy of its
+    result (or its exception). Nothing is cached once the call has finished.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _InFlight()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+                waiters = call.waiters
+            # Callers may mutate what they get back (e.g. merging market data
+            # into option dicts), so followers copy a snapshot taken before
+            # the leader's caller sees the result
+            if waiters and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.done.set()
+
+    def stats(self):
+        with self.lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self.calls)}
+
+
+_flight = SingleFlight()
+
+
+def make_key(func, args, kwargs):
+    """Builds a key from the function identity and a repr of its arguments (lists/dicts allowed)."""
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    return name, repr(args), repr(sorted(kwargs.items()))
+
+
+def coalesce(key, func, *args, **kwargs):
+    """Runs func(*args, **kwargs) unless a call with the same key is already in flight."""
+    return _flight.do(key, func, *args, **kwargs)
+
+
+def coalesced_call(provider, func, *args, **kwargs):
+    """
+    call_provider() with single-flight: concurrent identical upstream requests
+    (same provider, function and arguments) are sent once.
+
+    Only use this with module-level functions; bound methods and lambdas are
+    keyed by identity and would never coalesce (use coalesce() with an
+    explicit key instead).
+    """
+    key = (provider,) + make_key(func, args, kwargs)
+    return _flight.do(key, call_provider, provider, func, *args, **kwargs)
+
+
+def single_flight_stats():
+    """Returns counts of executed and coalesced calls since startup."""
+    return _flight.stats()
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_VERSION = 1
+
+# Sections stored in every snapshot and compared by diff_snapshots()
+SNAPSHOT_SECTIONS = [
+    "selected_options",
+    "daily_change",
+    "put_call_ratio",
+    "vix_value",
+    "articles",
+    "profit_loss",
+    "ai_analysis",
+]
+
+SECTION_TITLES = {
+    "selected_options": "Selected Options",
+    "daily_change": "Daily Change (90 Days)",
+    "put_call_ratio": "Put/Call Ratio",
+    "vix_value": "VIX Value",
+    "articles": "News Sentiment",
+    "profit_loss": "Profit/Loss",
+    "ai_analysis": "AI Analysis",
+}
+
+# Option fields worth keeping from the (large) Robinhood option dicts
+OPTION_FIELDS = [
+    "strike_price", "expiration_date", "type", "delta", "gamma", "theta", "vega", "rho",
+    "implied_volatility", "ask_price", "bid_price", "adjusted_mark_price",
+    "open_interest", "volume",
+]
+
+
+def compact_options(selected_options):
+    """
+    Keeps only the fields of the selected options that are worth persisting.
+    """
+    return [
+        {field: option[field] for field in OPTION_FIELDS if field in option}
+        for option in selected_options or []
+    ]
+
+
+def compact_articles(articles):
+    return [
+        {"title": a.get("title"), "sentiment": a.get("sentiment"), "link": a.get("link")}
+        for a in articles or []
+    ]
+
+
+def _section_hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _snapshot_dir(symbol, option_type, expiration_date):
+    return os.path.join(SNAPSHOT_DIR, symbol.upper(), f"{option_type}_{expiration_date}")
+
+
+def save_snapshot(record):
+    """
+    Saves a completed analysis as a versioned snapshot.
+
+    Parameters:
+        record (dict): Analysis record with 'symbol', 'option_type', 'expiration_date'
+                       and the SNAPSHOT_SECTIONS.
+
+    Returns:
+        str: Path of the saved snapshot, or None on error.
+    """
+    try:
+        created_at = datetime.now()
+        sections = {name: record.get(name) for name in SNAPSHOT_SECTIONS}
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "symbol": record["symbol"],
+            "option_type": record["option_type"],
+            "expiration_date": record["expiration_date"],
+            "created_at": created_at.isoformat(timespec="seconds"),
+            "sections": sections,
+            "section_hashes": {name: _section_hash(value) for name, value in sections.items()},
+        }
+
+        directory = _snapshot_dir(record["symbol"], record["option_type"], record["expiration_date"])
+        os.makedirs(directory, exist_ok=True)
+        # Microsecond names keep saves within the same second apart (and sort
+        # after older second-resolution names); "x" never overwrites a snapshot
+        while True:
+            path = os.path.join(directory, f"{created_at:%Y%m%dT%H%M%S%f}.json")
+            try:
+                with open(path, "x") as f:
+                    json.dump(snapshot, f, indent=2, default=str)
+                return path
+            except FileExistsError:
+                created_at += timedelta(microseconds=1)
+    except Exception as e:
+        print(f"Error saving snapshot: {e}")
+        return None
+
+
+def list_snapshots(symbol, option_type, expiration_date):
+    """
+    Returns the snapshot paths for a symbol/type/expiry, oldest first.
+    """
+    directory = _snapshot_dir(symbol, option_type, expiration_date)
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".json")]
+
+
+def load_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading snapshot {path}: {e}")
+        return None
+
+
+def load_latest_snapshot(symbol, option_type, expiration_date):
+    """
+    Loads the most recent snapshot for a symbol/type/expiry, or None if there is none.
+    """
+    paths = list_snapshots(symbol, option_type, expiration_date)
+    return load_snapshot(paths[-1]) if paths else None
+
+
+def snapshot_to_record(snapshot):
+    """
+    Turns a stored snapshot back into an analysis record.
+    """
+    record = {
+        "symbol": snapshot["symbol"],
+        "option_type": snapshot["option_type"],
+        "expiration_date": snapshot["expiration_date"],
+    }
+    record.update(snapshot["sections"])
+    return record
+
+
+def _diff_values(old, new):
+    change = {"old": old, "new": new}
+    try:
+        change["change"] = round(float(new) - float(old), 6)
+    except (TypeError, ValueError):
+        pass
+    return change
+
+
+def _diff_dicts(old, new):
+    old = old or {}
+    new = new or {}
+    return {
+        key: _diff_values(old.get(key), new.get(key))
+        for key in sorted(set(old) | set(new))
+        if old.get(key) != new.get(key)
+    }
+
+
+def _diff_keyed_lists(old, new, key):
+    old_items = {item.get(key): item for item in old or []}
+    new_items = {item.get(key): item for item in new or []}
+    changes = {}
+    for item_key in sorted(set(old_items) | set(new_items), key=str):
+        if item_key not in old_items:
+            changes[item_key] = "added"
+        elif item_key not in new_items:
+            changes[item_key] = "removed"
+        else:
+            item_changes = _diff_dicts(old_items[item_key], new_items[item_key])
+            if item_changes:
+                changes[item_key] = item_changes
+    return changes
+
+
+def diff_snapshots(old, new):
+    """
+    Compares two snapshots section by section. Sections whose stored hashes
+    match are skipped without being compared field by field.
+
+    Returns:
+        dict: Section name -> changes. Unchanged sections are omitted.
+    """
+    old_hashes = old.get("section_hashes", {})
+    new_hashes = new.get("section_hashes", {})
+    diff = {}
+
+    for name in SNAPSHOT_SECTIONS:
+        if name in old_hashes and old_hashes.get(name) == new_hashes.get(name):
+            continue
+
+        old_value = old["sections"].get(name)
+        new_value = new["sections"].get(name)
+        if name == "selected_options":
+            changes = _diff_keyed_lists(old_value, new_value, "strike_price")
+        elif name == "articles":
+            changes = _diff_keyed_lists(old_value, new_value, "link")
+        elif isinstance(old_value, dict) or isinstance(new_value, dict):
+            changes = _diff_dicts(old_value, new_value)
+        elif name == "ai_analysis":
+            changes = {"changed": old_value != new_value}
+        else:
+            changes = _diff_values(old_value, new_value) if old_value != new_value else {}
+
+        if changes:
+            diff[name] = changes
+
+    return diff
+
+
+def format_snapshot_diff(diff):
+    """
+    Formats the result of diff_snapshots() as printable lines.
+    """
+    if not diff:
+        return ["No changes since the last snapshot."]
+
+    lines = []
+    for section, changes in diff.items():
+        title = SECTION_TITLES.get(section, section)
+        if section == "ai_analysis":
+            lines.append(f"{title}: new AI analysis text")
+        elif "old" in changes and "new" in changes:
+            delta = f" ({changes['change']:+})" if "change" in changes else ""
+            lines.append(f"{title}: {changes['old']} -> {changes['new']}{delta}")
+        else:
+            lines.append(f"{title}:")
+            for key, change in changes.items():
+                if isinstance(change, str):
+                    lines.append(f"  {key}: {change}")
+                elif "old" in change and "new" in change:
+                    delta = f" ({change['change']:+})" if "change" in change else ""
+                    lines.append(f"  {key}: {change['old']} -> {change['new']}{delta}")
+                else:
+                    for field, field_change in change.items():
+                        delta = f" ({field_change['change']:+})" if "change" in field_change else ""
+                        lines.append(f"  {key} {field}: {field_change['old']} -> {field_change['new']}{delta}")
+    return lines
+
+
+def format_snapshot(snapshot):
+    """
+    Formats a stored snapshot as printable lines so it can be shown without recomputing.
+    """
+    record = snapshot_to_record(snapshot)
+    lines = [
+        f"Snapshot for {record['symbol']} {record['option_type']} {record['expiration_date']} "
+        f"(saved {snapshot['created_at']})",
+        "",
+        "Selected Options and Greeks:",
+    ]
+    for option in record.get("selected_options") or []:
+        lines.append(
+            f"  Strike {option.get('strike_price', 'N/A')}: Delta {option.get('delta', 'N/A')}, "
+            f"Gamma {option.get('gamma', 'N/A')}, Theta {option.get('theta', 'N/A')}, "
+            f"Vega {option.get('vega', 'N/A')}"
+        )
+
+    analysis = record.get("daily_change")
+    if analysis and "error" not in analysis:
+        lines.append("")
+        lines.append("Daily Percentage Change Analysis (Last 90 Days):")
+        lines.append(f"  Trading Days Analyzed: {analysis['trading_days_analyzed']}")
+        lines.append(f"  Positive Days: {analysis['positive_days']} (avg {analysis['average_positive_change']}%)")
+        lines.append(f"  Negative Days: {analysis['negative_days']} (avg {analysis['average_negative_change']}%)")
+
+    lines.append("")
+    lines.append(f"Put/Call Ratio: {record.get('put_call_ratio', 'N/A')}")
+    lines.append(f"VIX Value: {record.get('vix_value', 'N/A')}")
+
+    articles = record.get("articles") or []
+    if articles:
+        lines.append("")
+        lines.append("News Sentiment Analysis:")
+        for article in articles:
+            lines.append(f"  {article['title']} - {article['sentiment']}")
+
+    if record.get("ai_analysis"):
+        lines.append("")
+        lines.append("AI Analysis:")
+        lines.append(record["ai_analysis"])
+    return lines
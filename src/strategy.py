@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from src.black_scholes import bs_price
+
+CONTRACT_SIZE = 100
+DEFAULT_IV = 0.3
+
+
+def make_leg(option_type, strike, quantity, days_to_expiration, premium=None, iv=None):
+    """
+    Builds one strategy leg.
+
+    Parameters:
+        option_type (str): 'call' or 'put'.
+        strike (float): Strike price.
+        quantity (int): Number of contracts, positive for long and negative for short.
+        days_to_expiration (int): Calendar days until the leg expires.
+        premium (float): Price per share paid/received. Priced with Black-Scholes when None.
+        iv (float): Implied volatility used for pricing before expiration.
+
+    Returns:
+        dict: The leg.
+    """
+    return {
+        "option_type": option_type,
+        "strike": float(strike),
+        "quantity": quantity,
+        "days_to_expiration": days_to_expiration,
+        "premium": premium,
+        "iv": iv,
+    }
+
+
+def vertical_spread(option_type, long_strike, short_strike, days_to_expiration, iv=None, quantity=1):
+    return {
+        "name": f"{option_type.capitalize()} vertical {long_strike}/{short_strike}",
+        "legs": [
+            make_leg(option_type, long_strike, quantity, days_to_expiration, iv=iv),
+            make_leg(option_type, short_strike, -quantity, days_to_expiration, iv=iv),
+        ],
+    }
+
+
+def straddle(strike, days_to_expiration, iv=None, quantity=1):
+    return {
+        "name": f"{'Long' if quantity > 0 else 'Short'} straddle {strike}",
+        "legs": [
+            make_leg("call", strike, quantity, days_to_expiration, iv=iv),
+            make_leg("put", strike, quantity, days_to_expiration, iv=iv),
+        ],
+    }
+
+
+def strangle(put_strike, call_strike, days_to_expiration, iv=None, quantity=1):
+    return {
+        "name": f"{'Long' if quantity > 0 else 'Short'} strangle {put_strike}/{call_strike}",
+        "legs": [
+            make_leg("put", put_strike, quantity, days_to_expiration, iv=iv),
+            make_leg("call", call_strike, quantity, days_to_expiration, iv=iv),
+        ],
+    }
+
+
+def iron_condor(put_long, put_short, call_short, call_long, days_to_expiration, iv=None, quantity=1):
+    return {
+        "name": f"Iron condor {put_long}/{put_short}/{call_short}/{call_long}",
+        "legs": [
+            make_leg("put", put_long, quantity, days_to_expiration, iv=iv),
+            make_leg("put", put_short, -quantity, days_to_expiration, iv=iv),
+            make_leg("call", call_short, -quantity, days_to_expiration, iv=iv),
+            make_leg("call", call_long, quantity, days_to_expiration, iv=iv),
+        ],
+    }
+
+
+def calendar_spread(option_type, strike, near_days, far_days, iv=None, quantity=1):
+    return {
+        "name": f"{option_type.capitalize()} calendar {strike} ({near_days}/{far_days}d)",
+        "legs": [
+            make_leg(option_type, strike, -quantity, near_days, iv=iv),
+            make_leg(option_type, strike, quantity, far_days, iv=iv),
+        ],
+    }
+
+
+def _flatten_legs(strategies, spot, default_iv):
+    legs = [(i, leg) for i, strategy in enumerate(strategies) for leg in strategy["legs"]]
+    owner = np.array([i for i, _ in legs])
+    option_type = np.array([leg["option_type"] for _, leg in legs])
+    strike = np.array([leg["strike"] for _, leg in legs], dtype=float)
+    quantity = np.array([leg["quantity"] for _, leg in legs], dtype=float)
+    days = np.array([leg["days_to_expiration"] for _, leg in legs], dtype=float)
+    iv = np.array([leg["iv"] if leg.get("iv") else default_iv for _, leg in legs], dtype=float)
+
+    premium = np.array([np.nan if leg.get("premium") is None else leg["premium"] for _, leg in legs], dtype=float)
+    missing = np.isnan(premium)
+    if missing.any():
+        premium[missing] = bs_price(spot, strike[missing], days[missing] / 365.0, iv[missing], option_type[missing])
+
+    return owner, option_type, strike, quantity, days, iv, premium
+
+
+def _strategy_pnl(prices, horizon, owner, option_type, strike, quantity, days, iv, premium, membership):
+    # Value every leg at every price once the strategy's horizon has passed
+    remaining = np.maximum(days - horizon[owner], 0.0) / 365.0
+    values = bs_price(
+        prices[None, :], strike[:, None], remaining[:, None], iv[:, None], option_type[:, None]
+    )
+    leg_pnl = quantity[:, None] * CONTRACT_SIZE * (values - premium[:, None])
+    return membership @ leg_pnl
+
+
+def _breakevens(grid, pnl_row):
+    signs = np.sign(pnl_row)
+    crossings = np.nonzero(signs[:-1] * signs[1:] < 0)[0]
+    points = grid[crossings] - pnl_row[crossings] * (grid[crossings + 1] - grid[crossings]) / (
+        pnl_row[crossings + 1] - pnl_row[crossings]
+    )
+    # Grid points that land exactly on a breakeven
+    exact = grid[np.nonzero(signs == 0)[0]]
+    return sorted(round(float(p), 2) for p in np.concatenate((points, exact)))
+
+
+def evaluate_strategies(strategies, spot, grid_points=501, grid_width=0.5, days_forward=None, default_iv=DEFAULT_IV):
+    """
+    Evaluates many multi-leg strategies at once over a dense price grid.
+
+    The "expiration" curve is taken at each strategy's first expiration (for
+    calendars the longer leg keeps its time value); the "before expiration"
+    curve is taken days_forward days from now (default: half way to the first
+    expiration). Both are computed for all legs and strategies as array operations.
+
+    Parameters:
+        strategies (list): Strategies as {"name": str, "legs": [make_leg(...), ...]}.
+        spot (float): Current underlying price.
+        grid_points (int): Number of prices in the grid.
+        grid_width (float): Grid spans spot * (1 - grid_width) to spot * (1 + grid_width).
+        days_forward (int): Days ahead for the before-expiration curve.
+        default_iv (float): IV for legs without one.
+
+    Returns:
+        dict: {
+            "grid": price grid,
+            "pnl_at_expiration": array (strategies x grid),
+            "pnl_before_expiration": array (strategies x grid),
+            "summary": DataFrame with net_premium, max_profit, max_loss and breakevens per strategy,
+        }
+    """
+    owner, option_type, strike, quantity, days, iv, premium = _flatten_legs(strategies, spot, default_iv)
+    count = len(strategies)
+
+    membership = np.zeros((count, len(owner)))
+    membership[owner, np.arange(len(owner))] = 1.0
+
+    first_expiration = np.full(count, np.inf)
+    np.minimum.at(first_expiration, owner, days)
+    if days_forward is None:
+        before = np.floor(first_expiration / 2)
+    else:
+        before = np.minimum(np.full(count, float(days_forward)), first_expiration)
+
+    grid = np.linspace(spot * (1 - grid_width), spot * (1 + grid_width), grid_points)
+    # Include a zero price so the downside extreme is part of max profit/loss
+    extended = np.concatenate(([1e-9], grid))
+
+    leg_args = (owner, option_type, strike, quantity, days, iv, premium, membership)
+    at_expiration = _strategy_pnl(extended, first_expiration, *leg_args)
+    before_expiration = _strategy_pnl(grid, before, *leg_args)
+
+    net_premium = membership @ (quantity * premium * CONTRACT_SIZE)
+    inner = at_expiration[:, 1:]
+    max_profit = at_expiration.max(axis=1)
+    max_loss = at_expiration.min(axis=1)
+    # Far above the strikes every call behaves like stock and puts are worthless,
+    # so the payoff keeps rising (or falling) with the net number of calls
+    net_calls = membership @ np.where(option_type == "call", quantity, 0.0)
+    unbounded_profit = net_calls > 0
+    unbounded_loss = net_calls < 0
+
+    summary = pd.DataFrame({
+        "name": [s.get("name", f"Strategy {i + 1}") for i, s in enumerate(strategies)],
+        "net_premium": np.round(net_premium, 2),
+        "max_profit": np.where(unbounded_profit, np.inf, np.round(max_profit, 2)),
+        "max_loss": np.where(unbounded_loss, -np.inf, np.round(max_loss, 2)),
+        "breakevens": [_breakevens(grid, row) for row in inner],
+    })
+
+    return {
+        "grid": grid,
+        "pnl_at_expiration": inner,
+        "pnl_before_expiration": before_expiration,
+        "summary": summary,
+    }
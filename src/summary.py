@@ -0,0 +1,92 @@
+
+def build_summary_data(record):
+    """
+    Builds the text summary sent to get_ai_analysis from an analysis record.
+
+    Parameters:
+        record (dict): Analysis results with the keys 'symbol', 'option_type',
+            'expiration_date', 'selected_options', 'daily_change', 'put_call_ratio',
+            'vix_value', 'articles' and optionally 'profit_loss' and 'correlation'
+            (see correlation.correlation_summary).
+
+    Returns:
+        str: The formatted summary.
+    """
+    summary_data = f"""
+Stock Symbol: {record['symbol']}
+Option Type: {record['option_type']}
+Expiration Date: {record['expiration_date']}
+
+Selected Options and Greeks:
+"""
+
+    # Include Greeks for each selected option
+    for option in record.get("selected_options") or []:
+        summary_data += f"""
+Strike Price: {option.get('strike_price', 'N/A')}
+  Delta: {option.get('delta', 'N/A')}
+  Gamma: {option.get('gamma', 'N/A')}
+  Theta: {option.get('theta', 'N/A')}
+  Vega: {option.get('vega', 'N/A')}
+"""
+
+    # Add historical analysis
+    analysis = record.get("daily_change")
+    if analysis and "error" not in analysis:
+        summary_data += f"""
+Historical Price Analysis (Last 90 Days):
+  Trading Days Analyzed: {analysis['trading_days_analyzed']}
+  Positive Days: {analysis['positive_days']}
+  Average Positive Change: {analysis['average_positive_change']}%
+  Negative Days: {analysis['negative_days']}
+  Average Negative Change: {analysis['average_negative_change']}%
+"""
+
+    # Add sentiment indicators
+    put_call_ratio = record.get("put_call_ratio")
+    vix_value = record.get("vix_value")
+    summary_data += f"""
+Sentiment Indicators:
+  Put/Call Ratio: {put_call_ratio if put_call_ratio is not None else 'N/A'}
+  VIX Value: {vix_value if vix_value is not None else 'N/A'}
+"""
+
+    # Add correlation with the benchmark and the watchlist
+    correlation = record.get("correlation")
+    if correlation:
+        relative_strength = ", ".join(f"{label} {value}%" for label, value in correlation["relative_strength"].items())
+        summary_data += f"""
+Correlation vs {correlation['benchmark']} (Last {correlation['window']} Trading Days):
+  Beta: {correlation['beta']}
+  Correlation: {correlation['correlation']}
+  Relative Strength: {relative_strength or 'N/A'}
+  Most Correlated: {", ".join(f"{s} ({c})" for s, c in correlation['most_correlated'].items()) or 'N/A'}
+  Least Correlated: {", ".join(f"{s} ({c})" for s, c in correlation['least_correlated'].items()) or 'N/A'}
+"""
+
+    # Include news sentiment analysis
+    articles = record.get("articles")
+    if articles:
+        news_summary = "\nNews Sentiment Analysis:\n"
+        for article in articles:
+            news_summary += f"Title: {article['title']}\n"
+            news_summary += f"Sentiment: {article['sentiment']}\n"
+            news_summary += f"URL: {article['link']}\n\n"
+        summary_data += news_summary
+    else:
+        summary_data += "\nNews Sentiment Analysis:\nNo recent news articles found.\n"
+
+    # Include profit or loss estimation
+    profit_loss_result = record.get("profit_loss")
+    if profit_loss_result:
+        summary_data += f"""
+Option Profit or Loss Analysis:
+  Ask Price (Contract Cost): ${profit_loss_result['ask_price']}
+  Percentage Change: {profit_loss_result['percent_change']}%
+  Stock Price Change: ${profit_loss_result['stock_price_change']}
+  Option Price Change per Share: ${profit_loss_result['option_price_change_per_share']}
+  Option Price Change per Contract: ${profit_loss_result['option_price_change_per_contract']}
+  Profit or Loss for the Contract: ${profit_loss_result['profit_or_loss']}
+"""
+
+    return summary_data
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from src.expiration_index import get_all_expirations
+from src.fetch_greeks import fetch_option_chain
+from src.fetch_price import fetch_current_price
+from src.providers import get_chain
+
+TERM_STRUCTURE_MAX_WORKERS = int(os.getenv("TERM_STRUCTURE_MAX_WORKERS", 6))
+ATM_STRIKES_EACH_SIDE = 2
+
+
+def atm_iv_from_chain(chain_rows, spot):
+    """
+    Interpolates the at-the-money implied volatility from near-ATM strikes.
+    Call and put IVs at the same strike are averaged.
+
+    Parameters:
+        chain_rows (list): Dicts with 'strike_price' and 'implied_volatility'.
+        spot (float): Current underlying price.
+
+    Returns:
+        float: ATM implied volatility (annualized, e.g. 0.32), or None.
+    """
+    iv_by_strike = {}
+    for row in chain_rows:
+        try:
+            strike = float(row["strike_price"])
+            iv = float(row["implied_volatility"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if iv > 0:
+            iv_by_strike.setdefault(strike, []).append(iv)
+
+    if not iv_by_strike:
+        return None
+
+    strikes = sorted(iv_by_strike)
+    ivs = [sum(iv_by_strike[s]) / len(iv_by_strike[s]) for s in strikes]
+    below = [i for i, s in enumerate(strikes) if s <= spot]
+    above = [i for i, s in enumerate(strikes) if s > spot]
+    if not below:
+        return ivs[0]
+    if not above:
+        return ivs[-1]
+
+    lo, hi = below[-1], above[0]
+    weight = (spot - strikes[lo]) / (strikes[hi] - strikes[lo])
+    return ivs[lo] + weight * (ivs[hi] - ivs[lo])
+
+
+def _robinhood_atm_rows(symbol, expiration_date, spot):
+    return fetch_option_chain(
+        symbol, expiration_date, near_price=spot, strikes_each_side=ATM_STRIKES_EACH_SIDE
+    )
+
+
+def _fetch_atm_iv(symbol, expiration_date, spot):
+    try:
+        rows = _robinhood_atm_rows(symbol, expiration_date, spot)
+        iv = atm_iv_from_chain(rows, spot)
+        if iv is not None:
+            return iv
+    except Exception as e:
+        print(f"Robinhood chain for {symbol} {expiration_date} failed, trying the other providers: {e}")
+
+    try:
+        # Full chain from the provider router (yfinance, then saved snapshots)
+        return atm_iv_from_chain(get_chain(symbol, expiration_date, prefer="yfinance"), spot)
+    except Exception as e:
+        print(f"Error fetching ATM IV for {symbol} {expiration_date}: {e}")
+        return None
+
+
+def _fit_slope(xs, ys):
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def get_iv_term_structure(symbol, expirations=None, max_workers=None):
+    """
+    Builds the ATM implied volatility term structure for a symbol by fetching
+    the near-ATM contracts of every expiration concurrently.
+
+    Parameters:
+        symbol (str): The stock ticker symbol.
+        expirations (list): Expirations to include (defaults to all listed ones).
+        max_workers (int): Maximum concurrent fetches (defaults to TERM_STRUCTURE_MAX_WORKERS).
+
+    Returns:
+        dict: {
+            "symbol", "spot",
+            "curve": [{"expiration_date", "dte", "atm_iv"}, ...] sorted by DTE,
+            "slope_per_30d": change in ATM IV per 30 days of expiration,
+            "inverted": True if the front expiration's IV is above the back's,
+        } or None if no point could be computed.
+    """
+    spot = fetch_current_price(symbol)
+    if spot is None:
+        return None
+
+    expirations = expirations or get_all_expirations(symbol)
+    if not expirations:
+        print(f"No expirations found for {symbol}.")
+        return None
+
+    workers = max(1, min(max_workers or TERM_STRUCTURE_MAX_WORKERS, len(expirations)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        ivs = list(executor.map(lambda expiration: _fetch_atm_iv(symbol, expiration, spot), expirations))
+
+    today = date.today()
+    curve = []
+    for expiration, iv in zip(expirations, ivs):
+        if iv is None:
+            continue
+        dte = (datetime.strptime(expiration, "%Y-%m-%d").date() - today).days
+        curve.append({"expiration_date": expiration, "dte": dte, "atm_iv": round(iv, 4)})
+    curve.sort(key=lambda point: point["dte"])
+
+    if not curve:
+        return None
+
+    slope = _fit_slope([p["dte"] for p in curve], [p["atm_iv"] for p in curve]) if len(curve) > 1 else 0.0
+    return {
+        "symbol": symbol,
+        "spot": spot,
+        "curve": curve,
+        "slope_per_30d": round(slope * 30, 4),
+        "inverted": len(curve) > 1 and curve[0]["atm_iv"] > curve[-1]["atm_iv"],
+    }
@@ -0,0 +1,197 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+
+from src.black_scholes import MIN_TIME, bs_greeks, bs_price
+from src.expiration_index import expirations_in_dte_range
+from src.fetch_greeks import fetch_option_chain
+from src.fetch_price import fetch_current_price
+from src.term_structure import TERM_STRUCTURE_MAX_WORKERS
+
+SURFACE_MAX_DTE = int(os.getenv("SURFACE_MAX_DTE", 180))
+MIN_TOTAL_VARIANCE = 1e-6
+
+# (symbol, max DTE, trading day) -> fitted surface
+_surface_cache = {}
+_lock = threading.Lock()
+
+
+def _years_to(expiration, today):
+    if isinstance(expiration, str):
+        expiration = datetime.strptime(expiration, "%Y-%m-%d").date()
+    return max((expiration - today).days / 365.0, MIN_TIME)
+
+
+def fit_vol_surface(chain_rows, spot, today=None):
+    """
+    Fits a volatility surface from full-chain implied volatilities. Each
+    expiration gets a quadratic smile in total variance w(k) = a + b*k + c*k^2
+    over log-moneyness k = ln(K / spot); expirations are joined by linear
+    interpolation in total variance.
+
+    Parameters:
+        chain_rows (list): Dicts with 'strike_price', 'expiration_date' and 'implied_volatility'.
+        spot (float): Underlying price the surface is fitted against.
+        today (date): Valuation date (defaults to today).
+
+    Returns:
+        dict: Fitted parameters {"spot", "today", "expirations", "times",
+              "coefficients", "k_min", "k_max"}, or None if nothing could be fitted.
+    """
+    today = today or date.today()
+    by_expiration = {}
+    for row in chain_rows:
+        try:
+            strike = float(row["strike_price"])
+            iv = float(row["implied_volatility"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if iv > 0 and strike > 0:
+            by_expiration.setdefault(row["expiration_date"], []).append((strike, iv))
+
+    expirations, times, coefficients, k_min, k_max = [], [], [], [], []
+    for expiration in sorted(by_expiration):
+        points = np.array(by_expiration[expiration])
+        time = _years_to(expiration, today)
+        k = np.log(points[:, 0] / spot)
+        w = points[:, 1] ** 2 * time
+
+        if len(np.unique(k)) >= 3:
+            c, b, a = np.polyfit(k, w, 2)
+        else:
+            a, b, c = float(np.mean(w)), 0.0, 0.0
+
+        expirations.append(expiration)
+        times.append(time)
+        coefficients.append((a, b, c))
+        k_min.append(k.min())
+        k_max.append(k.max())
+
+    if not expirations:
+        return None
+
+    return {
+        "spot": float(spot),
+        "today": today,
+        "expirations": expirations,
+        "times": np.array(times),
+        "coefficients": np.array(coefficients),
+        "k_min": np.array(k_min),
+        "k_max": np.array(k_max),
+    }
+
+
+def _slice_variance(surface, index, k):
+    k = np.clip(k, surface["k_min"][index], surface["k_max"][index])
+    coefficients = surface["coefficients"]
+    a, b, c = coefficients[index, 0], coefficients[index, 1], coefficients[index, 2]
+    return np.maximum(a + b * k + c * k * k, MIN_TOTAL_VARIANCE)
+
+
+def surface_iv(surface, strike, expiration):
+    """
+    Reads implied volatility off a fitted surface at any strike and expiration.
+
+    Parameters:
+        surface (dict): Output of fit_vol_surface() / get_vol_surface().
+        strike (float or array): Strike price(s).
+        expiration (str, date, float or array): Expiration date, or time to
+            expiration in years.
+
+    Returns:
+        numpy.ndarray: Implied volatilities.
+    """
+    if isinstance(expiration, (str, date)):
+        time = _years_to(expiration, surface["today"])
+    else:
+        time = np.maximum(np.asarray(expiration, dtype=float), MIN_TIME)
+
+    k = np.log(np.asarray(strike, dtype=float) / surface["spot"])
+    k, time = np.broadcast_arrays(k, time)
+    times = surface["times"]
+
+    upper = np.clip(np.searchsorted(times, time), 0, len(times) - 1)
+    lower = np.clip(upper - 1, 0, len(times) - 1)
+    w_lower = _slice_variance(surface, lower, k)
+    w_upper = _slice_variance(surface, upper, k)
+
+    span = times[upper] - times[lower]
+    weight = np.where(span > 0, (time - times[lower]) / np.where(span > 0, span, 1.0), 0.0)
+    total_variance = w_lower + np.clip(weight, 0.0, 1.0) * (w_upper - w_lower)
+
+    # Outside the fitted expirations keep the edge slice's volatility flat
+    edge_time = np.where(time < times[0], times[0], np.where(time > times[-1], times[-1], time))
+    total_variance = np.where(
+        (time < times[0]) | (time > times[-1]),
+        np.where(time < times[0], w_lower, w_upper) * time / edge_time,
+        total_variance,
+    )
+    return np.sqrt(total_variance / time)
+
+
+def price_from_surface(surface, strike, expiration, option_type="call", spot=None):
+    """
+    Prices options off the surface (Black-Scholes with the surface IV).
+    """
+    spot = surface["spot"] if spot is None else spot
+    time = _years_to(expiration, surface["today"]) if isinstance(expiration, (str, date)) else expiration
+    return bs_price(spot, strike, time, surface_iv(surface, strike, time), option_type)
+
+
+def greeks_from_surface(surface, strike, expiration, option_type="call", spot=None):
+    """
+    Returns Black-Scholes Greeks using the surface IV (same units as bs_greeks).
+    """
+    spot = surface["spot"] if spot is None else spot
+    time = _years_to(expiration, surface["today"]) if isinstance(expiration, (str, date)) else expiration
+    return bs_greeks(spot, strike, time, surface_iv(surface, strike, time), option_type)
+
+
+def get_vol_surface(symbol, max_dte=None, refresh=False, max_workers=None):
+    """
+    Fetches the full chain for every expiration up to max_dte days out,
+    fits the surface and caches the fitted parameters per max_dte for the trading day.
+
+    Parameters:
+        symbol (str): The stock ticker symbol.
+        max_dte (int): Furthest expiration to include (defaults to SURFACE_MAX_DTE).
+        refresh (bool): Refit even if a surface is cached for today.
+        max_workers (int): Concurrent chain fetches (defaults to TERM_STRUCTURE_MAX_WORKERS).
+
+    Returns:
+        dict: The fitted surface, or None on error.
+    """
+    max_dte = SURFACE_MAX_DTE if max_dte is None else int(max_dte)
+    # Every argument that shapes the fit is part of the key (max_workers and
+    # refresh only change how it is fetched)
+    key = (symbol.upper(), max_dte, date.today())
+    with _lock:
+        if key in _surface_cache and not refresh:
+            return _surface_cache[key]
+
+    try:
+        spot = fetch_current_price(symbol)
+        if spot is None:
+            return None
+
+        expirations = expirations_in_dte_range(symbol, 0, max_dte)
+        if not expirations:
+            print(f"No expirations found for {symbol}.")
+            return None
+
+        workers = max(1, min(max_workers or TERM_STRUCTURE_MAX_WORKERS, len(expirations)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chains = list(executor.map(lambda expiration: fetch_option_chain(symbol, expiration), expirations))
+
+        surface = fit_vol_surface([row for chain in chains for row in chain], spot)
+    except Exception as e:
+        print(f"Error building volatility surface for {symbol}: {e}")
+        return None
+
+    if surface:
+        with _lock:
+            _surface_cache[key] = surface
+    return surface
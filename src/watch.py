@@ -0,0 +1,188 @@
+import os
+import time
+
+import robin_stocks.robinhood as r
+
+from src.calculate_profit import calculate_option_profit_or_loss
+from src.fetch_greeks import evaluate_option_values
+from src.fetch_price import fetch_current_price
+from src.provider_gateway import call_provider
+
+WATCH_INTERVAL_SECONDS = float(os.getenv("WATCH_INTERVAL_SECONDS", 15))
+DEFAULT_PERCENT_CHANGES = [1, 10, 20]
+
+
+def poll_option_marks(selected_options):
+    """
+    Fetches the latest mark, ask, delta and theta for each selected option.
+
+    Parameters:
+        selected_options (list): Option dicts as returned by fetch_and_evaluate_greeks
+                                 (must include 'id').
+
+    Returns:
+        dict: option id -> {"premium", "ask_price", "delta", "theta"}. Options whose
+              market data could not be fetched are left out.
+    """
+    marks = {}
+    for option in selected_options:
+        try:
+            market_data = call_provider("robinhood", r.options.get_option_market_data_by_id, option["id"])
+            entry = market_data[0] if isinstance(market_data, list) and market_data else {}
+            if not entry:
+                continue
+            marks[option["id"]] = {
+                "premium": float(entry.get("adjusted_mark_price", 0)),
+                "ask_price": float(entry.get("ask_price", 0)),
+                "delta": float(entry.get("delta") or 0),
+                "theta": float(entry.get("theta") or 0),
+            }
+        except Exception as e:
+            print(f"Error fetching market data for option {option.get('id')}: {e}")
+    return marks
+
+
+def new_watch_state():
+    """
+    Returns an empty state for update_watch_state().
+    """
+    return {"current_price": None, "marks": {}, "values": {}, "scenarios": {}}
+
+
+def update_watch_state(state, selected_options, option_type, current_price, marks,
+                       percent_changes=DEFAULT_PERCENT_CHANGES):
+    """
+    Recomputes only what depends on inputs that changed since the last tick.
+    A new underlying price recomputes every option; a new mark only recomputes
+    that option.
+
+    Parameters:
+        state (dict): State from new_watch_state() or a previous call (updated in place).
+        selected_options (list): The watched option dicts.
+        option_type (str): 'call' or 'put'.
+        current_price (float): Latest underlying price (None keeps the previous one).
+        marks (dict): Output of poll_option_marks().
+        percent_changes (list): P/L scenarios to compute.
+
+    Returns:
+        list: Ids of the options that were recomputed on this tick.
+    """
+    price_changed = current_price is not None and current_price != state["current_price"]
+    if price_changed:
+        state["current_price"] = current_price
+
+    updated = []
+    for option in selected_options:
+        option_id = option["id"]
+        mark = marks.get(option_id)
+        mark_changed = mark is not None and mark != state["marks"].get(option_id)
+        if mark_changed:
+            state["marks"][option_id] = mark
+        mark = state["marks"].get(option_id)
+
+        if not (price_changed or mark_changed) or mark is None or state["current_price"] is None:
+            continue
+
+        strike_price = float(option["strike_price"])
+        state["values"][option_id] = evaluate_option_values(
+            option_type, state["current_price"], strike_price, mark["premium"], mark["theta"]
+        )
+
+        contract = {"ask_price": mark["ask_price"], "delta": mark["delta"], "current_price": state["current_price"]}
+        state["scenarios"][option_id] = [
+            result for result in (calculate_option_profit_or_loss(contract, pct) for pct in percent_changes)
+            if result
+        ]
+        updated.append(option_id)
+
+    return updated
+
+
+def watch_tick(symbol, selected_options, option_type, state, percent_changes=DEFAULT_PERCENT_CHANGES):
+    """
+    Runs one poll: fetches the underlying quote and option marks and updates state.
+    Lets callers that cannot block (e.g. a Streamlit script run) poll one tick at a time.
+
+    Parameters:
+        selected_options (list): Option dicts with an 'id'.
+        state (dict): State from new_watch_state() (updated in place).
+
+    Returns:
+        list: Ids of the options that were recomputed.
+    """
+    current_price = fetch_current_price(symbol)
+    marks = poll_option_marks(selected_options)
+    return update_watch_state(state, selected_options, option_type, current_price, marks, percent_changes)
+
+
+def format_watch_update(symbol, state, selected_options, updated):
+    """
+    Formats the current watch state as printable lines. Options recomputed on
+    this tick are marked with '*'.
+    """
+    lines = [f"{time.strftime('%H:%M:%S')}  {symbol}: {state['current_price']}"]
+    for option in selected_options:
+        option_id = option["id"]
+        values = state["values"].get(option_id)
+        mark = state["marks"].get(option_id)
+        if not values or not mark:
+            lines.append(f"  Strike {option['strike_price']}: waiting for market data")
+            continue
+
+        flag = "*" if option_id in updated else " "
+        lines.append(
+            f"{flag} Strike {float(option['strike_price']):.2f}: Premium {mark['premium']:.2f}, "
+            f"Intrinsic {values['intrinsic_value']:.2f}, Extrinsic {values['extrinsic_value']:.2f}, "
+            f"Theta Decay {values['theta_decay_percentage']:.2f}%"
+        )
+        for result in state["scenarios"].get(option_id, []):
+            lines.append(f"      {result['percent_change']:+}%: P/L ${result['profit_or_loss']}")
+    return lines
+
+
+def print_watch_update(lines):
+    print()
+    for line in lines:
+        print(line)
+
+
+def watch_options(symbol, selected_options, option_type, interval=None,
+                  percent_changes=DEFAULT_PERCENT_CHANGES, render=print_watch_update, max_ticks=None):
+    """
+    Polls the underlying quote and option marks on an interval and pushes
+    incremental updates to render (the terminal by default, or e.g. a
+    Streamlit placeholder). Stops after max_ticks or on Ctrl+C.
+
+    Parameters:
+        symbol (str): The stock ticker symbol.
+        selected_options (list): Option dicts from fetch_and_evaluate_greeks.
+        option_type (str): 'call' or 'put'.
+        interval (float): Seconds between polls. Defaults to WATCH_INTERVAL_SECONDS.
+        percent_changes (list): P/L scenarios to compute.
+        render (callable): Called with the formatted lines whenever something changed.
+        max_ticks (int): Number of polls before returning, or None to run until interrupted.
+
+    Returns:
+        dict: The final watch state.
+    """
+    interval = WATCH_INTERVAL_SECONDS if interval is None else interval
+    options = [option for option in selected_options or [] if option.get("id")]
+    state = new_watch_state()
+    if not options:
+        print("No options to watch.")
+        return state
+
+    ticks = 0
+    try:
+        while max_ticks is None or ticks < max_ticks:
+            updated = watch_tick(symbol, options, option_type, state, percent_changes)
+            if updated or ticks == 0:
+                render(format_watch_update(symbol, state, options, updated))
+
+            ticks += 1
+            if max_ticks is None or ticks < max_ticks:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+    return state
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import shared_cache
+from src.local_sentiment import analyze_sentiment_tiered, score_sentiment
+
+
+class NegationTest(unittest.TestCase):
+    def test_negated_positive_phrase_is_negative(self):
+        result = score_sentiment("Acme did not beat estimates")
+        self.assertEqual(result["label"], "negative")
+
+    def test_negation_reaches_a_phrase_within_the_window(self):
+        self.assertEqual(score_sentiment("Acme fails to beat estimates, shares fall")["label"], "negative")
+
+    def test_negated_negative_phrase_is_positive(self):
+        self.assertEqual(score_sentiment("Acme never cuts guidance")["label"], "positive")
+
+    def test_plain_phrase_keeps_its_polarity(self):
+        result = score_sentiment("Acme beats estimates")
+        self.assertEqual(result["label"], "positive")
+        self.assertEqual(result["score"], 2.0)
+
+    def test_negation_window_spans_adverbs(self):
+        self.assertEqual(score_sentiment("Company did not really beat")["label"], "negative")
+
+    def test_negation_stops_at_clause_punctuation(self):
+        self.assertEqual(score_sentiment("Not a bad quarter, shares surge")["label"], "positive")
+
+
+class TieredCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(shared_cache, "SHARED_CACHE_PATH", os.path.join(directory.name, "cache.sqlite3"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_local_labels_are_not_served_once_a_key_is_configured(self):
+        articles = [{"title": "Acme holds its annual meeting", "snippet": ""}]
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": ""}):
+            self.assertEqual(analyze_sentiment_tiered([dict(a) for a in articles])[0]["sentiment_source"], "local")
+
+        def escalated(to_escalate):
+            for article in to_escalate:
+                article["sentiment"] = "Neutral"
+            return to_escalate
+
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}), \
+                mock.patch("src.openai.analyze_sentiment_google_results", side_effect=escalated) as llm:
+            result = analyze_sentiment_tiered([dict(a) for a in articles])
+        self.assertEqual(llm.call_count, 1)
+        self.assertEqual(result[0]["sentiment_source"], "llm")
+
+
+if __name__ == "__main__":
+    unittest.main()
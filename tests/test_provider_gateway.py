@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+import requests
+import robin_stocks.robinhood.helper as helper
+
+from src import provider_gateway
+from src.provider_gateway import CircuitBreaker, CircuitOpenError, call_provider
+
+
+def _throttled_response(*args, **kwargs):
+    response = requests.Response()
+    response.status_code = 429
+    response.url = "https://api.robinhood.com/quotes/"
+    return response
+
+
+class SwallowedHTTPErrorTest(unittest.TestCase):
+    def setUp(self):
+        provider_gateway._breakers.clear()
+        provider_gateway._buckets.clear()
+        patcher = mock.patch.object(provider_gateway.time, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(provider_gateway._breakers.clear)
+
+    def test_swallowed_429_is_retried_and_opens_the_breaker(self):
+        with mock.patch.object(helper.SESSION, "get", side_effect=_throttled_response) as get:
+            result = call_provider("robinhood", helper.request_get, "https://api.robinhood.com/quotes/", "results")
+            self.assertEqual(result, [None])
+            self.assertEqual(get.call_count, provider_gateway.MAX_RETRIES + 1)
+
+            # The fifth consecutive failure opens the circuit partway through the next call
+            with self.assertRaises(CircuitOpenError):
+                call_provider("robinhood", helper.request_get, "https://api.robinhood.com/quotes/", "results")
+            self.assertEqual(get.call_count, provider_gateway.FAILURE_THRESHOLD)
+            self.assertTrue(provider_gateway.get_circuit_breaker("robinhood").is_open())
+
+    def test_real_results_are_not_retried(self):
+        func = mock.Mock(return_value=[{"symbol": "AAPL"}])
+        self.assertEqual(call_provider("robinhood", func), [{"symbol": "AAPL"}])
+        self.assertEqual(func.call_count, 1)
+
+    def test_none_from_other_providers_is_returned(self):
+        func = mock.Mock(return_value=None)
+        self.assertIsNone(call_provider("yfinance", func))
+        self.assertEqual(func.call_count, 1)
+
+
+class HalfOpenTest(unittest.TestCase):
+    def _expired_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        breaker.record_failure()
+        breaker.opened_at -= 31.0
+        return breaker
+
+    def test_only_one_trial_call_is_allowed(self):
+        breaker = self._expired_breaker()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        self.assertTrue(breaker.is_open())
+
+    def test_trial_success_closes_and_failure_reopens(self):
+        breaker = self._expired_breaker()
+        breaker.allow()
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.is_open())
+
+        breaker = self._expired_breaker()
+        breaker.allow()
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+    def test_released_trial_goes_to_the_next_caller(self):
+        breaker = self._expired_breaker()
+        breaker.allow()
+        breaker.release_trial()
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,11 @@ import openai
 import re
 from datetime import datetime, timedelta
 import requests
-from options import fetch_and_evaluate_greeks, get_put_call_ratio_60_days, get_vix_value, fetch_historical_closing_prices, analyze_daily_percentage_changes_90_days, fetch_google_news, analyze_sentiment_google_results, fetch_and_evaluate_greeks
+from src.downsample import CHART_MAX_POINTS, bars_to_series, downsample_frame
+from src.check_expiration import get_expiration_date_for_month as list_expirations_for_month
+from src.historical_prices import fetch_historical_bars
+from src.recorder import query_metrics
+from options import fetch_and_evaluate_greeks, get_put_call_ratio_60_days, get_vix_value, fetch_historical_closing_prices, analyze_daily_percentage_changes_90_days, fetch_google_news, analyze_sentiment_tiered, fetch_and_evaluate_greeks
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,6 +25,18 @@ PASSWORD = os.getenv("ROBINHOOD_PASSWORD")
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 api_key = os.getenv("GOOGLE_API_KEY")
 
+# Bar interval charted for each span (Robinhood serves 5/10-minute bars only for
+# day/week, and weekly bars keep the full 'all' history to a few thousand points)
+CHART_SPAN_INTERVALS = {
+    "day": "5minute",
+    "week": "10minute",
+    "month": "hour",
+    "3month": "hour",
+    "year": "day",
+    "5year": "day",
+    "all": "week",
+}
+
 # Streamlit UI setup
 st.title("Options Analysis Dashboard")
 st.sidebar.header("User Inputs")
@@ -29,6 +45,7 @@ st.sidebar.header("User Inputs")
 symbol = st.sidebar.text_input("Enter the stock ticker symbol:", value="AAPL")
 option_type = st.sidebar.selectbox("Option Type", options=["call", "put"])
 expiration_month = st.sidebar.text_input("Enter expiration month (YYYY-MM):", value="2025-01")
+chart_span = st.sidebar.selectbox("Chart span", options=list(CHART_SPAN_INTERVALS), index=3)
 
 # Robinhood login
 def login_to_robinhood():
@@ -43,9 +60,9 @@ def login_to_robinhood():
 # Function to fetch expiration dates and present them to the user
 def get_expiration_date_for_month(symbol, month):
     try:
-        chains = r.options.get_chains(symbol)
-        expiration_dates = chains.get('expiration_dates', [])
-        month_dates = [date for date in expiration_dates if date.startswith(month)]
+        # Same provider-router path as src/check_expiration.py (day-cached
+        # Robinhood metadata first, failing over to yfinance or snapshots)
+        month_dates = list_expirations_for_month(symbol, month)
         if not month_dates:
             st.warning(f"No expiration dates found for {symbol} in {month}.")
             return None
@@ -55,6 +72,12 @@ def get_expiration_date_for_month(symbol, month):
         st.error(f"Error fetching expiration dates for {symbol}: {e}")
         return None
 
+# Historical series for the chart, reduced to max_points with LTTB and cached per symbol/span
+@st.cache_data(ttl=900, show_spinner=False)
+def load_chart_series(symbol, span, max_points):
+    series = bars_to_series(fetch_historical_bars(symbol, interval=CHART_SPAN_INTERVALS[span], span=span))
+    return downsample_frame(series, "date", "close_price", max_points), len(series)
+
 # Display options data
 def display_options_data(options_data):
     if options_data:
@@ -79,12 +102,11 @@ if login_to_robinhood():
         st.header("Options Data")
         display_options_data(options_data)
 
-        # Fetch historical data
+        # Fetch historical data (the 90-day analysis below always uses the 3-month span)
         historical_data = fetch_historical_closing_prices(symbol, span="3month")
-        if historical_data:
-            df_historical = pd.DataFrame(historical_data)
-            df_historical['date'] = pd.to_datetime(df_historical['date'])
 
+        df_historical, total_points = load_chart_series(symbol, chart_span, CHART_MAX_POINTS)
+        if not df_historical.empty:
             st.header("Historical Closing Prices")
             # Create an Altair chart to control the size
             chart = alt.Chart(df_historical).mark_line().encode(
@@ -95,6 +117,8 @@ if login_to_robinhood():
                 height=300  # Set desired height
             )
             st.altair_chart(chart)
+            if len(df_historical) < total_points:
+                st.caption(f"Showing {len(df_historical)} of {total_points} points (LTTB downsampled).")
 
         # Perform analysis on historical data
         if historical_data:
@@ -117,12 +141,22 @@ if login_to_robinhood():
         if vix_value:
             st.write(f"VIX Value: {vix_value:.2f}")
 
+        # Trends recorded by the chain-metrics recorder (python -m src.recorder)
+        trend_start = datetime.utcnow() - timedelta(days=30)
+        trends = pd.DataFrame({
+            metric: query_metrics(symbol, metric, start=trend_start)["value"]
+            for metric in ("pcr", "atm_iv")
+        })
+        if not trends.empty:
+            st.header("Recorded Trends (30 Days)")
+            st.line_chart(trends)
+
         # News sentiment analysis
         cx = os.getenv("GOOGLE_CX")
         articles = fetch_google_news(symbol, api_key, cx)
         if articles:
             st.header("News Sentiment Analysis")
-            analyzed_articles = analyze_sentiment_google_results(articles)
+            analyzed_articles = analyze_sentiment_tiered(articles)
             for article in analyzed_articles:
                 st.write(f"Title: {article['title']}")
                 st.write(f"Sentiment: {article['sentiment']}")